@@ -0,0 +1,56 @@
+from typing import List
+
+from fastapi import Header
+
+from app.api.admin.models import ProfileReport, ProfileSummary
+from app.api.admin.services import AdminService
+from app.api.base_components import BaseController, Endpoint, Response
+
+
+class AdminController(BaseController):
+    def __init__(self, service: AdminService, api_version: str):
+        self.service = service
+        self.api_version = api_version
+
+        endpoints = [
+            Endpoint(
+                rule="/profiles",
+                func=self.list_profiles,
+                methods=["GET"],
+                response_type=List[ProfileSummary],
+            ),
+            Endpoint(
+                rule="/profiles/{request_id}",
+                func=self.get_profile,
+                methods=["GET"],
+                response_type=ProfileReport,
+            ),
+            Endpoint(
+                rule="/startup",
+                func=self.get_startup_report,
+                methods=["GET"],
+                response_type=dict,
+            ),
+        ]
+
+        super().__init__(
+            title="Admin",
+            prefix=f"/{self.api_version}/admin",
+            endpoints=endpoints,
+        )
+
+    async def list_profiles(
+        self, x_profile_token: str | None = Header(None)
+    ) -> Response:
+        """Lists stored request profiles, newest first."""
+        return self.service.list_profiles(x_profile_token)
+
+    async def get_profile(
+        self, request_id: str, x_profile_token: str | None = Header(None)
+    ) -> Response:
+        """Returns the profile captured for one request."""
+        return self.service.get_profile(request_id, x_profile_token)
+
+    async def get_startup_report(self) -> Response:
+        """Returns startup and lazy import timings for this process."""
+        return self.service.get_startup_report()
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel
+
+
+class ProfileSummary(BaseModel):
+    request_id: str
+    method: str
+    path: str
+    mode: str
+    status_code: int
+    duration_ms: float
+    created_at: datetime
+
+
+class ProfileReport(ProfileSummary):
+    # Hottest functions on the event loop thread, and in the extraction
+    # sandbox when the request sent work there
+    functions: List[dict]
+    sandbox_functions: List[dict]
+    text: str
@@ -0,0 +1,67 @@
+from typing import Callable
+
+from app.api.admin.models import ProfileReport, ProfileSummary
+from app.api.base_components import Response
+from app.utils.profiler import RequestProfiler
+
+
+class AdminService:
+    def __init__(
+        self,
+        profiler: RequestProfiler | None = None,
+        startup_report: Callable[[], dict] | None = None,
+    ):
+        self._profiler = profiler
+        self._startup_report = startup_report
+
+    def _check_profiler(self, token: str | None) -> Response | None:
+        if self._profiler is None:
+            return Response(
+                status_code=404,
+                message="Request profiling is disabled",
+                error_code=3001,
+            )
+        if not self._profiler.authorized(token):
+            return Response(
+                status_code=403,
+                message="Invalid profiling token",
+                error_code=3002,
+            )
+        return None
+
+    def list_profiles(self, token: str | None) -> Response:
+        error = self._check_profiler(token)
+        if error is not None:
+            return error
+
+        return Response(
+            message="Profiles retrieved successfully",
+            body=[
+                ProfileSummary(**report.summary())
+                for report in self._profiler.store.list()
+            ],
+        )
+
+    def get_profile(self, request_id: str, token: str | None) -> Response:
+        error = self._check_profiler(token)
+        if error is not None:
+            return error
+
+        report = self._profiler.store.get(request_id)
+        if report is None:
+            return Response(
+                status_code=404,
+                message="Profile not found",
+                error_code=3003,
+            )
+
+        return Response(
+            message="Profile retrieved successfully",
+            body=ProfileReport(**vars(report)),
+        )
+
+    def get_startup_report(self) -> Response:
+        return Response(
+            message="Startup report retrieved successfully",
+            body=self._startup_report() if self._startup_report else {},
+        )
@@ -1,3 +1,8 @@
+import json
+import re
+import socket
+import time
+import uuid
 from dataclasses import dataclass
 from typing import Callable, List, Union
 
@@ -5,8 +10,19 @@ import uvicorn
 from fastapi import APIRouter, FastAPI
 from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel, Field, create_model
+from pydantic_core import to_json
+from starlette.routing import Match, Router
+from uvicorn.supervisors import Multiprocess
+
+from app.utils.admission import AdmissionController, AdmissionRejected
+from app.utils.metrics import (
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS_IN_FLIGHT,
+    MetricsRegistry,
+)
+from app.utils.profiler import RequestProfile, RequestProfiler
 
 
 @dataclass
@@ -16,6 +32,8 @@ class Endpoint:
     methods: List[str]
     response_type: Union[BaseModel, None] = None
     possible_error_codes: Union[List[int], None] = None
+    # Documents request bodies the endpoint reads itself instead of declaring
+    openapi_extra: Union[dict, None] = None
 
 
 class BaseResponse(BaseModel):
@@ -25,16 +43,28 @@ class BaseResponse(BaseModel):
 
 
 class Response(JSONResponse):
+    """
+    The ``message``/``body``/``error_code`` envelope returned by every endpoint.
+
+    With ``fast_encoding`` (the default) bodies are serialized in one pass by
+    pydantic-core instead of ``jsonable_encoder`` followed by the stdlib JSON
+    encoder. Pydantic models come out the same either way. Datetimes inside
+    plain dicts or lists do not: pydantic-core writes UTC as ``Z`` where
+    ``isoformat`` writes ``+00:00``.
+    """
+
+    fast_encoding = True
+
     def __init__(
         self,
         status_code: int = 200,
         message: str = "",
-        body: Union[dict, list, None] = None,
+        body: Union[dict, list, BaseModel, None] = None,
         error_code: int = 0,
     ):
         content = {
             "message": message,
-            "body": jsonable_encoder(body),
+            "body": body,
             "error_code": error_code,
         }
         super().__init__(
@@ -42,6 +72,31 @@ class Response(JSONResponse):
             content=content,
         )
 
+    def render(self, content: dict) -> bytes:
+        if not self.fast_encoding:
+            return super().render(
+                {**content, "body": jsonable_encoder(content["body"])}
+            )
+        return b"".join(
+            (
+                b'{"message":',
+                json.dumps(content["message"], ensure_ascii=False).encode("utf-8"),
+                b',"body":',
+                encode_body(content["body"]),
+                b',"error_code":',
+                str(int(content["error_code"])).encode("ascii"),
+                b"}",
+            )
+        )
+
+
+def encode_body(body) -> bytes:
+    """Serializes a response body to JSON bytes without an intermediate copy."""
+    if isinstance(body, BaseModel):
+        return body.model_dump_json(by_alias=True).encode("utf-8")
+    # Timedeltas as seconds, as jsonable_encoder writes them
+    return to_json(body, by_alias=True, timedelta_mode="float")
+
 
 class BaseController:
     def __init__(self, title: str, prefix: str, endpoints: List[Endpoint]) -> None:
@@ -53,20 +108,169 @@ class BaseController:
 
     def _register_endpoints(self, endpoints: List[Endpoint]) -> None:
         for endpoint in endpoints:
-            response_model = create_model(
-                f"{endpoint.func.__name__.capitalize()}Response",
-                __base__=BaseResponse,
-                body=(endpoint.response_type, Field(None)),
-            )
+            # Endpoints without a response type (e.g. streaming) skip the envelope
+            response_model = None
+            if endpoint.response_type is not None:
+                response_model = create_model(
+                    f"{endpoint.func.__name__.capitalize()}Response",
+                    __base__=BaseResponse,
+                    body=(endpoint.response_type, Field(None)),
+                )
 
             self.router.add_api_route(
                 endpoint.rule,
                 endpoint.func,
                 methods=endpoint.methods,
                 response_model=response_model,
+                openapi_extra=endpoint.openapi_extra,
             )
 
 
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency and in-flight requests.
+
+    Routes are labelled by their template (``/api/v1/resumes/{resume_id}``)
+    rather than the raw path so label cardinality stays bounded. The
+    template is found by matching the request against ``router``'s routes,
+    as the router itself does; requests no route matches are labelled
+    ``unmatched``.
+    """
+
+    def __init__(self, app, router: Router) -> None:
+        self.app = app
+        self.router = router
+
+    def _route_path(self, scope) -> str:
+        partial = None
+        for route in self.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+            if match == Match.PARTIAL and partial is None:
+                # The path matched but not the method
+                partial = route.path
+        return partial or "unmatched"
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"],
+                self._route_path(scope),
+                str(status_code),
+            ).observe(time.perf_counter() - start)
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying an ``AdmissionController`` to the routes it
+    guards. Shed requests get a 429 envelope with a ``Retry-After`` header;
+    admitted ones keep their admission until the response has been sent,
+    including streamed responses.
+    """
+
+    def __init__(self, app, controller: AdmissionController) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send) -> None:
+        rule = None
+        if scope["type"] == "http":
+            rule = self.controller.match(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        authorization = dict(scope["headers"]).get(b"authorization")
+        client = scope.get("client")
+        key, role = self.controller.identify(
+            authorization.decode("latin-1") if authorization is not None else None,
+            client[0] if client else "unknown",
+        )
+        try:
+            async with self.controller.admit(rule, key, role):
+                await self.app(scope, receive, send)
+        except AdmissionRejected as e:
+            response = Response(
+                status_code=429,
+                message=e.message,
+                error_code=e.error_code,
+            )
+            response.headers["Retry-After"] = str(e.retry_after)
+            await response(scope, receive, send)
+
+
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles requests carrying the ``X-Profile`` header
+    or picked by the profiler's sampling rate.
+
+    The report is stored under the request's ``X-Request-ID`` (or a generated
+    one), which is echoed back in the ``X-Profile-Id`` response header.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler) -> None:
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        trigger = headers.get(b"x-profile")
+        if not self.profiler.should_profile(
+            trigger.decode("latin-1") if trigger is not None else None
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1")
+        if not _REQUEST_ID_RE.match(request_id):
+            request_id = uuid.uuid4().hex
+        profile = RequestProfile(
+            request_id=request_id,
+            method=scope["method"],
+            path=scope["path"],
+            mode=self.profiler.mode,
+        )
+
+        async with self.profiler.capture(profile) as capture:
+
+            async def send_wrapper(message) -> None:
+                if message["type"] == "http.response.start":
+                    capture.status_code = message["status"]
+                    if capture.active:
+                        message["headers"] = [
+                            *message.get("headers", []),
+                            (b"x-profile-id", request_id.encode("latin-1")),
+                        ]
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+
 class BaseAPI:
     def __init__(
         self,
@@ -77,6 +281,9 @@ class BaseAPI:
         description: str,
         version: str,
         summary: str,
+        metrics_registry: MetricsRegistry | None = None,
+        profiler: RequestProfiler | None = None,
+        admission: AdmissionController | None = None,
     ) -> None:
         self.ip = ip
         self.port = port
@@ -84,6 +291,27 @@ class BaseAPI:
         self.app = FastAPI(
             title=title, description=description, version=version, summary=summary
         )
+        # Added first so it runs inside the metrics middleware, which then
+        # records shed requests as 429s
+        if admission is not None:
+            self.app.add_middleware(AdmissionMiddleware, controller=admission)
+        if metrics_registry is not None:
+            self._register_metrics(metrics_registry)
+        if profiler is not None:
+            self.app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+    def _register_metrics(self, registry: MetricsRegistry) -> None:
+        """Serves ``/metrics`` in the Prometheus text format."""
+        self.app.add_middleware(MetricsMiddleware, router=self.app.router)
+
+        async def metrics() -> PlainTextResponse:
+            return PlainTextResponse(
+                registry.render(), media_type="text/plain; version=0.0.4"
+            )
+
+        self.app.add_api_route(
+            "/metrics", metrics, methods=["GET"], include_in_schema=False
+        )
 
     def register_controllers(self, controllers: List[BaseController]) -> None:
         for controller in controllers:
@@ -95,7 +323,11 @@ class BaseAPI:
         for exception_type, handler in handlers:
             self.app.add_exception_handler(exception_type, handler)
 
-    async def start(self) -> None:
+    async def start(self, sockets: List[socket.socket] | None = None) -> None:
+        """
+        Serves the API until shutdown, on ``sockets`` when given (as in a
+        worker started by ``run_workers``) or on a newly bound ip and port.
+        """
         if self.debug:
             origins = ["*"]
             self.app.add_middleware(
@@ -113,4 +345,22 @@ class BaseAPI:
             loop="auto",
         )
         server = uvicorn.Server(config)
-        await server.serve()
+        await server.serve(sockets=sockets)
+
+    @staticmethod
+    def run_workers(
+        ip: str,
+        port: int,
+        workers: int,
+        target: Callable[[List[socket.socket]], None],
+    ) -> None:
+        """
+        Binds the listening socket once and runs ``target(sockets=...)`` in
+        ``workers`` spawned processes that accept on it, until the parent is
+        interrupted. ``target`` must be a module-level function: each process
+        builds its own application and passes the sockets on to ``start``.
+        """
+        # The app is built by each worker, so the supervisor's config only
+        # carries the address and worker count
+        config = uvicorn.Config(app=None, host=ip, port=port, workers=workers)
+        Multiprocess(config, target=target, sockets=[config.bind_socket()]).run()
@@ -0,0 +1,299 @@
+"""
+This module provides the bulk ingestion pipeline for multi-file and ZIP
+uploads.
+
+Files are stored, extracted and parsed in overlapping stages connected by
+bounded queues, so text extraction for later files runs while earlier files
+are waiting on the LLM. Results are emitted as NDJSON lines.
+"""
+import asyncio
+import json
+import logging
+import os
+import zipfile
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Tuple
+
+from fastapi import UploadFile
+
+from app.api.resume_scanner.services import ResumeScannerService
+from app.exceptions.exceptions import ResumeProcessingError
+from app.utils.file_extractor import (
+    DOCX_CONTENT_TYPE,
+    PDF_CONTENT_TYPE,
+    TXT_CONTENT_TYPE,
+)
+from app.utils.file_storage import ContentAddressedStorage, StoredFile
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES_BY_EXTENSION = {
+    ".pdf": PDF_CONTENT_TYPE,
+    ".docx": DOCX_CONTENT_TYPE,
+    ".txt": TXT_CONTENT_TYPE,
+}
+
+ZIP_CONTENT_TYPES = {"application/zip", "application/x-zip-compressed"}
+
+# Stored files are registered in batches of this many, one database write each
+REGISTER_BATCH_SIZE = 32
+
+
+@dataclass
+class BulkItem:
+    filename: str
+    content_type: str | None = None
+    resume_id: int | None = None
+    file_path: str | None = None
+    content_hash: str | None = None
+    text: str | None = None
+    error: str | None = None
+
+
+def _is_zip(upload: UploadFile) -> bool:
+    return upload.content_type in ZIP_CONTENT_TYPES or (
+        upload.filename or ""
+    ).lower().endswith(".zip")
+
+
+def _ndjson(payload: dict) -> str:
+    return json.dumps(payload, default=str) + "\n"
+
+
+class BulkIngestionPipeline:
+    """Stores, extracts and parses many resumes as a three-stage pipeline."""
+
+    def __init__(
+        self,
+        service: ResumeScannerService,
+        storage: ContentAddressedStorage,
+        extract_concurrency: int,
+        llm_concurrency: int,
+        batch_size: int,
+    ):
+        self._service = service
+        self._storage = storage
+        self._extract_concurrency = extract_concurrency
+        self._llm_concurrency = llm_concurrency
+        self._batch_size = batch_size
+
+    async def run(self, uploads: List[UploadFile]) -> AsyncIterator[str]:
+        """Processes the uploads and yields NDJSON result and progress lines."""
+        extract_queue: asyncio.Queue = asyncio.Queue(
+            maxsize=self._extract_concurrency * 2
+        )
+        llm_queue: asyncio.Queue = asyncio.Queue(maxsize=self._llm_concurrency * 2)
+        results: asyncio.Queue = asyncio.Queue()
+        ingested = 0
+
+        async def ingest() -> None:
+            nonlocal ingested
+            try:
+                async for item in self._ingest(uploads):
+                    ingested += 1
+                    if item.error:
+                        await results.put(item)
+                    else:
+                        await extract_queue.put(item)
+            finally:
+                for _ in range(self._extract_concurrency):
+                    await extract_queue.put(None)
+
+        async def extract() -> None:
+            while (item := await extract_queue.get()) is not None:
+                try:
+                    item.text = await self._service.extract_text(
+                        item.file_path, item.content_type, item.content_hash
+                    )
+                except ResumeProcessingError as e:
+                    item.error = e.message
+                    await results.put(item)
+                except Exception as e:
+                    logger.exception(f"Bulk extraction of {item.filename} failed")
+                    item.error = f"Error extracting resume: {e}"
+                    await results.put(item)
+                else:
+                    await llm_queue.put(item)
+
+        async def parse() -> None:
+            while (item := await llm_queue.get()) is not None:
+                try:
+                    parsed = await self._service.parse_text(item.resume_id, item.text)
+                    await results.put((item, parsed))
+                except ResumeProcessingError as e:
+                    item.error = e.message
+                    await results.put(item)
+                except Exception as e:
+                    logger.exception(f"Bulk parse of {item.filename} failed")
+                    item.error = f"Error parsing resume: {e}"
+                    await results.put(item)
+
+        async def stage(workers: List[asyncio.Task], next_queue, count: int):
+            await asyncio.gather(*workers, return_exceptions=True)
+            for _ in range(count):
+                await next_queue.put(None)
+
+        ingest_task = asyncio.create_task(ingest())
+        extractors = [
+            asyncio.create_task(extract()) for _ in range(self._extract_concurrency)
+        ]
+        parsers = [asyncio.create_task(parse()) for _ in range(self._llm_concurrency)]
+        extract_done = asyncio.create_task(
+            stage(extractors, llm_queue, self._llm_concurrency)
+        )
+        parse_done = asyncio.create_task(stage(parsers, results, 1))
+        tasks = [ingest_task, *extractors, *parsers, extract_done, parse_done]
+
+        succeeded = failed = batch = 0
+        try:
+            while (entry := await results.get()) is not None:
+                if isinstance(entry, BulkItem):
+                    failed += 1
+                    yield _ndjson(
+                        {
+                            "type": "result",
+                            "filename": entry.filename,
+                            "resume_id": entry.resume_id,
+                            "status": "failed",
+                            "error": entry.error,
+                        }
+                    )
+                else:
+                    item, parsed = entry
+                    succeeded += 1
+                    yield _ndjson(
+                        {
+                            "type": "result",
+                            "filename": item.filename,
+                            "resume_id": item.resume_id,
+                            "status": "succeeded",
+                            "result": parsed.model_dump(by_alias=True),
+                        }
+                    )
+
+                if (succeeded + failed) % self._batch_size == 0:
+                    batch += 1
+                    yield _ndjson(
+                        {
+                            "type": "progress",
+                            "batch": batch,
+                            "ingested": ingested,
+                            "succeeded": succeeded,
+                            "failed": failed,
+                        }
+                    )
+
+            # Surface failures from the ingestion stage itself
+            await ingest_task
+            yield _ndjson(
+                {
+                    "type": "summary",
+                    "total": succeeded + failed,
+                    "succeeded": succeeded,
+                    "failed": failed,
+                }
+            )
+        finally:
+            # Client disconnects close the generator; stop the stages with it
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _ingest(self, uploads: List[UploadFile]) -> AsyncIterator[BulkItem]:
+        """Stores the files and yields them once registered, or with an error."""
+        pending: List[Tuple[BulkItem, StoredFile]] = []
+        async for item, stored in self._store_all(uploads):
+            if stored is None:
+                yield item
+                continue
+            pending.append((item, stored))
+            if len(pending) >= REGISTER_BATCH_SIZE:
+                for registered in await self._register(pending):
+                    yield registered
+                pending = []
+        for registered in await self._register(pending):
+            yield registered
+
+    async def _store_all(
+        self, uploads: List[UploadFile]
+    ) -> AsyncIterator[Tuple[BulkItem, StoredFile | None]]:
+        for upload in uploads:
+            if not _is_zip(upload):
+                yield await self._store_upload(upload)
+                continue
+
+            try:
+                # ZipFile reads only the central directory; members are then
+                # streamed one at a time.
+                archive = await asyncio.to_thread(zipfile.ZipFile, upload.file)
+            except zipfile.BadZipFile:
+                yield BulkItem(
+                    filename=upload.filename, error="Invalid ZIP archive"
+                ), None
+                continue
+
+            with archive:
+                for info in archive.infolist():
+                    if info.is_dir():
+                        continue
+                    yield await self._store_member(archive, info)
+
+    async def _store_upload(
+        self, upload: UploadFile
+    ) -> Tuple[BulkItem, StoredFile | None]:
+        item = BulkItem(filename=upload.filename, content_type=upload.content_type)
+        try:
+            stored = await self._storage.save_upload(upload)
+        except ResumeProcessingError as e:
+            item.error = e.message
+            return item, None
+        return item, stored
+
+    async def _store_member(
+        self, archive: zipfile.ZipFile, info: zipfile.ZipInfo
+    ) -> Tuple[BulkItem, StoredFile | None]:
+        extension = os.path.splitext(info.filename)[1].lower()
+        item = BulkItem(
+            filename=info.filename,
+            content_type=CONTENT_TYPES_BY_EXTENSION.get(extension),
+        )
+        if item.content_type is None:
+            item.error = "Unsupported file type"
+            return item, None
+
+        def save():
+            with archive.open(info) as member:
+                return self._storage.save_stream(member)
+
+        try:
+            stored = await asyncio.to_thread(save)
+        except ResumeProcessingError as e:
+            item.error = e.message
+            return item, None
+        except (zipfile.BadZipFile, OSError) as e:
+            item.error = f"Failed to read archive member: {e}"
+            return item, None
+        return item, stored
+
+    async def _register(
+        self, pending: List[Tuple[BulkItem, StoredFile]]
+    ) -> List[BulkItem]:
+        if not pending:
+            return []
+        resumes = await self._service.create_resumes(
+            [
+                {
+                    "filename": item.filename,
+                    "content_type": item.content_type,
+                    "file_path": stored.path,
+                    "content_hash": stored.content_hash,
+                    "size": stored.size,
+                }
+                for item, stored in pending
+            ]
+        )
+        for (item, stored), resume in zip(pending, resumes):
+            item.resume_id = resume.id
+            item.file_path = stored.path
+            item.content_hash = stored.content_hash
+        return [item for item, _ in pending]
@@ -1,19 +1,64 @@
 import os
-import shutil
+from typing import Any, AsyncIterator, List, Tuple
 
-from fastapi import File, UploadFile
+from fastapi import File, Query, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
+from starlette.formparsers import MultiPartException
 
-from app.api.base_components import BaseController, Endpoint, Response
-from app.api.resume_scanner.models import ParsedResume, Resume
+from app.api.base_components import BaseController, Endpoint, Response, encode_body
+from app.api.resume_scanner.bulk import BulkIngestionPipeline
+from app.api.resume_scanner.jobs import JobQueueFullError, ParseJobQueue
+from app.api.resume_scanner.models import (
+    ParsedResume,
+    ParseJob,
+    RankRequest,
+    RankResults,
+    Resume,
+    SearchResults,
+)
 from app.api.resume_scanner.services import ResumeScannerService
+from app.exceptions.exceptions import FileTooLargeError
+from app.utils.file_storage import ContentAddressedStorage
+from app.utils.metrics import stage_timer
 
-MEDIA_PATH = "/home/ubuntu/resume-scanner/media"
+# The upload endpoint parses its own body, so its form is declared here
+UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+
+async def _sse(events: AsyncIterator[Tuple[str, Any]]) -> AsyncIterator[bytes]:
+    """Formats ``(event, data)`` pairs as Server-Sent Events."""
+    async for event, data in events:
+        yield b"event: " + event.encode("ascii") + b"\ndata: " + encode_body(data)
+        yield b"\n\n"
 
 
 class ResumeScannerController(BaseController):
-    def __init__(self, service: ResumeScannerService, api_version: str):
+    def __init__(
+        self,
+        service: ResumeScannerService,
+        job_queue: ParseJobQueue,
+        bulk_pipeline: BulkIngestionPipeline,
+        api_version: str,
+        storage: ContentAddressedStorage,
+    ):
         self.service = service
+        self.job_queue = job_queue
+        self.bulk_pipeline = bulk_pipeline
         self.api_version = api_version
+        self.storage = storage
 
         endpoints = [
             Endpoint(
@@ -21,6 +66,12 @@ class ResumeScannerController(BaseController):
                 func=self.upload,
                 methods=["POST"],
                 response_type=Resume,
+                openapi_extra=UPLOAD_REQUEST_BODY,
+            ),
+            Endpoint(
+                rule="/bulk",
+                func=self.bulk_upload,
+                methods=["POST"],
             ),
             Endpoint(
                 rule="/{resume_id}/parse",
@@ -28,6 +79,53 @@ class ResumeScannerController(BaseController):
                 methods=["POST"],
                 response_type=ParsedResume,
             ),
+            Endpoint(
+                rule="/{resume_id}/parse/stream",
+                func=self.parse_stream,
+                methods=["POST"],
+            ),
+            Endpoint(
+                rule="/{resume_id}/jobs",
+                func=self.submit_parse_job,
+                methods=["POST"],
+                response_type=ParseJob,
+            ),
+            Endpoint(
+                rule="/search",
+                func=self.search,
+                methods=["GET"],
+                response_type=SearchResults,
+            ),
+            Endpoint(
+                rule="/rank",
+                func=self.rank,
+                methods=["POST"],
+                response_type=RankResults,
+            ),
+            Endpoint(
+                rule="/fast-path/stats",
+                func=self.get_fast_path_stats,
+                methods=["GET"],
+                response_type=dict,
+            ),
+            Endpoint(
+                rule="/text-store/stats",
+                func=self.get_text_store_stats,
+                methods=["GET"],
+                response_type=dict,
+            ),
+            Endpoint(
+                rule="/jobs/{job_id}",
+                func=self.get_parse_job,
+                methods=["GET"],
+                response_type=ParseJob,
+            ),
+            Endpoint(
+                rule="/{resume_id}/parsed",
+                func=self.get_parsed,
+                methods=["GET"],
+                response_type=ParsedResume,
+            ),
         ]
 
         super().__init__(
@@ -36,17 +134,8 @@ class ResumeScannerController(BaseController):
             endpoints=endpoints,
         )
 
-    async def upload(self, file: UploadFile = File(...)) -> Response:
-        file_path = os.path.join(MEDIA_PATH, file.filename)
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        return self.service.upload_resume(
-            filename=file.filename, content_type=file.content_type, file_path=file_path
-        )
-
-    async def parse(self, resume_id: int) -> Response:
-        resume = self.service._resume_repository._db.get_by_id("resumes", resume_id)
+    async def _resolve_resume_file(self, resume_id: int) -> tuple[dict, str] | Response:
+        resume = await self.service.get_resume(resume_id)
         if not resume:
             return Response(
                 status_code=404,
@@ -54,7 +143,10 @@ class ResumeScannerController(BaseController):
                 error_code=2004,
             )
 
-        file_path = os.path.join(MEDIA_PATH, resume["filename"])
+        # Records created before content-addressed storage only have a filename
+        file_path = resume.get("file_path") or os.path.join(
+            self.storage.root, resume["filename"]
+        )
         if not os.path.exists(file_path):
             return Response(
                 status_code=404,
@@ -62,8 +154,159 @@ class ResumeScannerController(BaseController):
                 error_code=2005,
             )
 
-        return self.service.parse_resume(
+        return resume, file_path
+
+    async def upload(self, request: Request) -> Response:
+        """
+        Stores the ``file`` field of a multipart body. The body is read here
+        rather than declared as a ``File`` parameter so oversized uploads are
+        rejected while they are still being received.
+        """
+        file = None
+        try:
+            with stage_timer("upload_write"):
+                file = await self.storage.receive_upload(request)
+                if file is None:
+                    return Response(
+                        status_code=400,
+                        message="Expected a multipart form with a 'file' field",
+                        error_code=2011,
+                    )
+                stored = await self.storage.save_upload(file)
+        except FileTooLargeError as e:
+            return Response(
+                status_code=e.status_code,
+                message=e.message,
+                error_code=2009,
+            )
+        except MultiPartException as e:
+            return Response(
+                status_code=400,
+                message=f"Invalid multipart body: {e.message}",
+                error_code=2011,
+            )
+        finally:
+            if file is not None:
+                await file.close()
+
+        with stage_timer("upload_db_write"):
+            return await self.service.upload_resume(
+                filename=file.filename,
+                content_type=file.content_type,
+                file_path=stored.path,
+                content_hash=stored.content_hash,
+                size=stored.size,
+            )
+
+    async def bulk_upload(
+        self, files: List[UploadFile] = File(...)
+    ) -> StreamingResponse:
+        """
+        Ingests many files or ZIP archives, streaming one NDJSON line per
+        resume plus progress lines after every batch.
+        """
+        return StreamingResponse(
+            self.bulk_pipeline.run(files), media_type="application/x-ndjson"
+        )
+
+    async def parse(self, resume_id: int) -> Response:
+        resolved = await self._resolve_resume_file(resume_id)
+        if isinstance(resolved, Response):
+            return resolved
+        resume, file_path = resolved
+
+        return await self.service.parse_resume(
             resume_id=resume_id,
             file_path=file_path,
             content_type=resume["content_type"],
+            content_hash=resume.get("content_hash"),
         )
+
+    async def parse_stream(self, resume_id: int) -> StreamingResponse | Response:
+        """
+        Parses a resume, streaming Server-Sent Events: a ``field`` event per
+        field as soon as it is known, then ``done`` with the stored record, or
+        ``error`` with the message and error code.
+        """
+        resolved = await self._resolve_resume_file(resume_id)
+        if isinstance(resolved, Response):
+            return resolved
+        resume, file_path = resolved
+
+        events = self.service.stream_parse_resume(
+            resume_id=resume_id,
+            file_path=file_path,
+            content_type=resume["content_type"],
+            content_hash=resume.get("content_hash"),
+        )
+        return StreamingResponse(
+            _sse(events),
+            media_type="text/event-stream",
+            # Proxies must pass events through as they are written
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    async def submit_parse_job(self, resume_id: int) -> Response:
+        resolved = await self._resolve_resume_file(resume_id)
+        if isinstance(resolved, Response):
+            return resolved
+        resume, file_path = resolved
+
+        try:
+            job = await self.job_queue.submit(
+                resume_id=resume_id,
+                file_path=file_path,
+                content_type=resume["content_type"],
+                content_hash=resume.get("content_hash"),
+            )
+        except JobQueueFullError as e:
+            return Response(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                message=str(e),
+                error_code=2008,
+            )
+
+        return Response(
+            status_code=status.HTTP_202_ACCEPTED,
+            message="Parse job queued",
+            body=job,
+        )
+
+    async def get_parse_job(self, job_id: str) -> Response:
+        job = await self.job_queue.get(job_id)
+        if not job:
+            return Response(
+                status_code=404,
+                message="Parse job not found",
+                error_code=2006,
+            )
+
+        return Response(
+            message="Parse job retrieved successfully",
+            body=job,
+        )
+
+    async def get_parsed(self, resume_id: int) -> Response:
+        return await self.service.get_parsed_resume(resume_id)
+
+    async def search(
+        self,
+        q: str = Query(..., min_length=1, max_length=1000),
+        page: int = Query(1, ge=1),
+        page_size: int = Query(20, ge=1, le=100),
+    ) -> Response:
+        """
+        Searches parsed resumes by skills, job titles, companies, institutions
+        and certifications with AND/OR/NOT, quoted phrases and prefix* terms.
+        """
+        return await self.service.search_resumes(q, page, page_size)
+
+    async def rank(self, request: RankRequest) -> Response:
+        """Ranks every parsed resume against a job description with BM25."""
+        return await self.service.rank_resumes(request.job_description, request.top_k)
+
+    async def get_fast_path_stats(self) -> Response:
+        return self.service.get_fast_path_stats()
+
+    async def get_text_store_stats(self) -> Response:
+        return self.service.get_text_store_stats()
@@ -0,0 +1,173 @@
+"""
+This module provides a background job queue for resume parsing.
+
+Jobs run in the process that accepted them. When several server processes
+share a database, each state change is also appended to its ``parse_jobs``
+table so that a job can be polled through any of them.
+"""
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import List
+
+from app.api.resume_scanner.models import JobStatus, ParseJob
+from app.api.resume_scanner.services import ResumeScannerService
+from app.db.database import BaseDatabase
+from app.exceptions.exceptions import ResumeProcessingError
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobQueueFullError(Exception):
+    """Raised when the parse job queue cannot accept more work."""
+
+
+class ParseJobQueue:
+    """
+    Bounded queue of parse jobs processed by a fixed number of worker tasks.
+
+    Workers are started lazily on first submission so the queue binds to the
+    event loop that serves requests.
+    """
+
+    def __init__(
+        self,
+        service: ResumeScannerService,
+        concurrency: int,
+        max_queue_size: int,
+        max_finished_jobs: int = 10000,
+        shared_db: BaseDatabase | None = None,
+    ):
+        self._service = service
+        self._concurrency = concurrency
+        self._max_queue_size = max_queue_size
+        self._max_finished_jobs = max_finished_jobs
+        self._queue: asyncio.Queue | None = None
+        self._workers: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, ParseJob]" = OrderedDict()
+        self._pending: dict[str, tuple[str, str, str | None]] = {}
+        self._shared_db = shared_db
+        self._publish_lock: asyncio.Lock | None = None
+
+    def _ensure_started(self) -> None:
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+        self._publish_lock = asyncio.Lock()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"parse-job-worker-{i}")
+            for i in range(self._concurrency)
+        ]
+
+    async def submit(
+        self,
+        resume_id: int,
+        file_path: str,
+        content_type: str,
+        content_hash: str | None = None,
+    ) -> ParseJob:
+        """
+        Queues a resume for parsing and returns the job record immediately.
+
+        Raises:
+            JobQueueFullError: If the queue is at capacity
+        """
+        self._ensure_started()
+        job = ParseJob(id=uuid.uuid4().hex, resume_id=resume_id, queued_at=_now())
+        try:
+            self._queue.put_nowait(job.id)
+        except asyncio.QueueFull:
+            raise JobQueueFullError("Parse job queue is full")
+
+        self._pending[job.id] = (file_path, content_type, content_hash)
+        self._jobs[job.id] = job
+        self._evict_finished()
+        await self._publish(job)
+        return job
+
+    async def get(self, job_id: str) -> ParseJob | None:
+        job = self._jobs.get(job_id)
+        if job is None and self._shared_db is not None:
+            # Accepted by another server process
+            records = await asyncio.to_thread(
+                self._shared_db.find_by, "parse_jobs", "job_id", job_id
+            )
+            if records:
+                return ParseJob.model_validate(records[-1]["job"])
+        return job
+
+    async def _publish(self, job: ParseJob) -> None:
+        """Appends the job's current state to the shared database, if any."""
+        if self._shared_db is None:
+            return
+        record = {"job_id": job.id, "job": job.model_dump(mode="json", by_alias=True)}
+        try:
+            # The lock is FIFO, so states are appended in the order they occur
+            async with self._publish_lock:
+                await asyncio.to_thread(self._shared_db.add, "parse_jobs", record)
+        except Exception:
+            logger.exception(f"Failed to publish state of parse job {job.id}")
+
+    @property
+    def depth(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        job = self._jobs.get(job_id)
+        file_path, content_type, content_hash = self._pending.pop(job_id)
+        if job is None:
+            return
+
+        job.status = JobStatus.RUNNING
+        job.started_at = _now()
+        await self._publish(job)
+        try:
+            job.result = await self._service.process_resume(
+                job.resume_id, file_path, content_type, content_hash
+            )
+            job.status = JobStatus.SUCCEEDED
+        except ResumeProcessingError as e:
+            job.status = JobStatus.FAILED
+            job.error = e.message
+        except Exception as e:
+            logger.exception(f"Parse job {job_id} failed")
+            job.status = JobStatus.FAILED
+            job.error = f"Error parsing resume: {e}"
+        finally:
+            job.finished_at = _now()
+            await self._publish(job)
+
+    def _evict_finished(self) -> None:
+        # Oldest records go first; jobs still queued or running are kept
+        excess = len(self._jobs) - self._max_finished_jobs
+        if excess <= 0:
+            return
+        for job_id in list(self._jobs):
+            if excess <= 0:
+                break
+            if self._jobs[job_id].finished_at is not None:
+                del self._jobs[job_id]
+                excess -= 1
+
+    async def shutdown(self) -> None:
+        """Cancels the worker tasks."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
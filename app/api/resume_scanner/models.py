@@ -1,12 +1,16 @@
+from datetime import datetime
+from enum import Enum
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field, computed_field
 
 
 class Resume(BaseModel):
     id: int
     filename: str
     content_type: str
+    content_hash: Optional[str] = None
+    size: Optional[int] = None
 
 
 class ParsedResume(BaseModel):
@@ -15,9 +19,81 @@ class ParsedResume(BaseModel):
     phone: Optional[str] = Field(None, alias="Phone")
     skills: List[str] = Field([], alias="Skills")
     education: List[dict] = Field([], alias="Education")
-    experience: List[dict] = Field([], alias="Work Experience")
+    # Parsed records store this as "work_experience", the LLM field name
+    experience: List[dict] = Field(
+        [],
+        alias="Work Experience",
+        validation_alias=AliasChoices(
+            "Work Experience", "work_experience", "experience"
+        ),
+    )
     certifications: List[dict] = Field([], alias="Certifications")
     projects: List[dict] = Field([], alias="Projects")
+    # Set when the resume text nearly matches an earlier resume
+    duplicate_of: Optional[int] = None
+    duplicate_similarity: Optional[float] = None
 
     class Config:
         populate_by_name = True
+
+
+class SearchHit(BaseModel):
+    resume_id: int
+    score: int
+    resume: ParsedResume
+
+
+class SearchResults(BaseModel):
+    query: str
+    total: int
+    page: int
+    page_size: int
+    results: List[SearchHit]
+
+
+class RankRequest(BaseModel):
+    job_description: str = Field(..., min_length=1, max_length=20000)
+    top_k: int = Field(20, ge=1, le=100)
+
+
+class RankedResume(BaseModel):
+    resume_id: int
+    score: float
+    resume: ParsedResume
+
+
+class RankResults(BaseModel):
+    candidates: int
+    results: List[RankedResume]
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ParseJob(BaseModel):
+    id: str
+    resume_id: int
+    status: JobStatus = JobStatus.QUEUED
+    queued_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Optional[ParsedResume] = None
+
+    @computed_field
+    @property
+    def queue_seconds(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return (self.started_at - self.queued_at).total_seconds()
+
+    @computed_field
+    @property
+    def processing_seconds(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
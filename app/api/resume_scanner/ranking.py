@@ -0,0 +1,301 @@
+"""
+This module provides a BM25 ranking engine that scores every parsed resume
+against a job description.
+
+Term frequencies live in SciPy sparse matrices (one row per resume, one
+column per term) and document statistics are updated on every insert, so
+ranking is a handful of vectorized operations over the query's columns.
+New resumes are buffered and sealed into immutable segments that are merged
+in a binary-counter pattern, which keeps inserts cheap without letting the
+number of segments grow unbounded.
+
+SciPy is imported when the first segment is sealed, not with this module, so
+processes that never rank do not load it.
+"""
+import re
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Set, Tuple
+
+import numpy as np
+
+from app.utils.registry import timed_import
+
+if TYPE_CHECKING:
+    from scipy import sparse
+
+SPARSE_MODULE = "scipy.sparse"
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or our the to "
+    "we will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cases text and splits it into terms, dropping stop words."""
+    return [
+        token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOP_WORDS
+    ]
+
+
+def _strings(value) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+
+
+def document_text(parsed: dict) -> str:
+    """Returns the skills, experience and project text that gets ranked."""
+    experience = parsed.get("experience") or parsed.get("work_experience")
+    parts = [
+        *_strings(parsed.get("skills")),
+        *_strings(experience),
+        *_strings(parsed.get("projects")),
+    ]
+    return " ".join(parts)
+
+
+class _Segment:
+    """An immutable block of resumes stored as a CSC term-frequency matrix."""
+
+    def __init__(
+        self, matrix: "sparse.csc_matrix", resume_ids: np.ndarray, lengths: np.ndarray
+    ):
+        self.matrix = matrix
+        self.resume_ids = resume_ids
+        self.lengths = lengths
+        self.alive = np.ones(len(resume_ids), dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.resume_ids)
+
+
+class ResumeRankingEngine:
+    """Incrementally maintained BM25 index over parsed resumes."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, seal_every: int = 10000):
+        self.k1 = k1
+        self.b = b
+        self.seal_every = seal_every
+        self._vocabulary: Dict[str, int] = {}
+        self._document_frequency = np.zeros(1024, dtype=np.int64)
+        self._indexed: Set[int] = set()
+        self._total_length = 0
+        self._segments: List[_Segment] = []
+
+        # Resumes added since the last seal as (resume_id, column -> count)
+        self._pending: List[Tuple[int, Dict[int, int]]] = []
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._indexed)
+
+    def add(self, resume_id: int, parsed: dict, previous: dict | None = None):
+        """Indexes a parsed resume, replacing the version of its previous parse."""
+        counts = Counter(tokenize(document_text(parsed)))
+        with self._lock:
+            if previous is not None and resume_id in self._indexed:
+                self._remove(resume_id, previous)
+
+            vocabulary = self._vocabulary
+            terms = {
+                vocabulary.setdefault(token, len(vocabulary)): count
+                for token, count in counts.items()
+            }
+            self._grow_statistics(len(self._vocabulary))
+
+            self._pending.append((resume_id, terms))
+            columns = np.fromiter(terms, dtype=np.int64, count=len(terms))
+            self._document_frequency[columns] += 1
+            self._indexed.add(resume_id)
+            self._total_length += sum(terms.values())
+
+            if len(self._pending) >= self.seal_every:
+                self._seal()
+
+    def rebuild(self, records: Iterable[dict]) -> None:
+        """Indexes stored parse records, oldest first."""
+        latest: Dict[int, dict] = {}
+        for record in records:
+            self.add(record["resume_id"], record, latest.get(record["resume_id"]))
+            latest[record["resume_id"]] = record
+
+    def rank(self, text: str, top_k: int = 20) -> List[Tuple[int, float]]:
+        """Returns up to ``top_k`` ``(resume_id, score)`` pairs, best first."""
+        with self._lock:
+            self._seal()
+            query = Counter(
+                self._vocabulary[token]
+                for token in tokenize(text)
+                if token in self._vocabulary
+            )
+            documents = len(self._indexed)
+            if not query or not documents:
+                return []
+
+            columns = np.fromiter(query, dtype=np.int64, count=len(query))
+            query_weights = np.fromiter(
+                query.values(), dtype=np.float64, count=len(query)
+            )
+            frequency = self._document_frequency[columns]
+            idf = np.log1p((documents - frequency + 0.5) / (frequency + 0.5))
+            weights = query_weights * idf * (self.k1 + 1)
+            average_length = self._total_length / documents or 1.0
+
+            ids, scores = [], []
+            for segment in self._segments:
+                segment_ids, segment_scores = self._score_segment(
+                    segment, columns, weights, average_length, top_k
+                )
+                ids.append(segment_ids)
+                scores.append(segment_scores)
+
+        ids = np.concatenate(ids)
+        scores = np.concatenate(scores)
+        top = _top_k(ids, scores, top_k)
+        ids, scores = ids[top], scores[top]
+        # Best score first, newest resume first among ties
+        order = np.lexsort((-ids, -scores))
+        return [
+            (int(resume_id), float(score))
+            for resume_id, score in zip(ids[order], scores[order])
+        ]
+
+    def _score_segment(
+        self,
+        segment: _Segment,
+        columns: np.ndarray,
+        weights: np.ndarray,
+        average_length: float,
+        top_k: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # Terms added after the segment was sealed have no entries in it
+        in_segment = columns < segment.matrix.shape[1]
+        sub = segment.matrix[:, columns[in_segment]]
+        rows = sub.indices
+        tf = sub.data
+        # BM25 length normalization per resume, then per matching entry
+        row_norm = (
+            self.k1 * (1 - self.b)
+            + (self.k1 * self.b / average_length) * segment.lengths
+        )
+        contributions = tf / (tf + row_norm[rows])
+        contributions *= np.repeat(
+            weights[in_segment].astype(np.float32), np.diff(sub.indptr)
+        )
+        scores = np.bincount(rows, weights=contributions, minlength=len(segment))
+        scores[~segment.alive] = 0
+
+        candidates = np.flatnonzero(scores)
+        ids = segment.resume_ids[candidates]
+        top = _top_k(ids, scores[candidates], top_k)
+        return ids[top], scores[candidates][top]
+
+    def _remove(self, resume_id: int, previous: dict) -> None:
+        for segment in self._segments:
+            segment.alive &= segment.resume_ids != resume_id
+        for row, (pending_id, _) in enumerate(self._pending):
+            if pending_id == resume_id:
+                # Sealed as an empty row, which never scores
+                self._pending[row] = (resume_id, {})
+
+        counts = Counter(tokenize(document_text(previous)))
+        columns = [self._vocabulary[token] for token in counts]
+        self._document_frequency[columns] -= 1
+        self._indexed.discard(resume_id)
+        self._total_length -= sum(counts.values())
+
+    def _grow_statistics(self, size: int) -> None:
+        if size <= len(self._document_frequency):
+            return
+        grown = np.zeros(max(size, len(self._document_frequency) * 2), np.int64)
+        grown[: len(self._document_frequency)] = self._document_frequency
+        self._document_frequency = grown
+
+    def _seal(self) -> None:
+        if not self._pending:
+            return
+        sparse = timed_import(SPARSE_MODULE)
+        sizes = [len(terms) for _, terms in self._pending]
+        rows = np.repeat(np.arange(len(self._pending)), sizes)
+        columns = [column for _, terms in self._pending for column in terms]
+        counts = [count for _, terms in self._pending for count in terms.values()]
+        matrix = sparse.csc_matrix(
+            (np.asarray(counts, dtype=np.float32), (rows, columns)),
+            shape=(len(self._pending), len(self._vocabulary)),
+        )
+        segment = _Segment(
+            matrix,
+            np.fromiter((resume_id for resume_id, _ in self._pending), np.int64),
+            np.fromiter((sum(t.values()) for _, t in self._pending), np.float32),
+        )
+        self._segments.append(segment)
+        self._pending = []
+
+        # Merge equal-sized neighbours so there are O(log n) segments
+        while len(self._segments) > 1 and len(self._segments[-1]) >= len(
+            self._segments[-2]
+        ):
+            newer = self._segments.pop()
+            older = self._segments.pop()
+            self._segments.append(self._merge(older, newer))
+
+    def _merge(self, older: _Segment, newer: _Segment) -> _Segment:
+        sparse = timed_import(SPARSE_MODULE)
+        columns = max(older.matrix.shape[1], newer.matrix.shape[1])
+        parts = []
+        for segment in (older, newer):
+            matrix = segment.matrix
+            if matrix.shape[1] < columns:
+                matrix = sparse.csc_matrix(
+                    (matrix.data, matrix.indices, _pad_indptr(matrix.indptr, columns)),
+                    shape=(matrix.shape[0], columns),
+                )
+            # Dead rows are dropped when segments merge
+            parts.append((matrix[segment.alive], segment))
+
+        return _Segment(
+            sparse.vstack([part for part, _ in parts], format="csc"),
+            np.concatenate([s.resume_ids[s.alive] for _, s in parts]),
+            np.concatenate([s.lengths[s.alive] for _, s in parts]),
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "documents": len(self._indexed),
+                "terms": len(self._vocabulary),
+                "segments": len(self._segments),
+                "pending": len(self._pending),
+                "average_length": (
+                    self._total_length / len(self._indexed) if self._indexed else 0
+                ),
+            }
+
+
+def _top_k(ids: np.ndarray, scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Returns the positions of the ``k`` best scores in no particular order,
+    taking the newest resumes among those tied with the ``k``-th score.
+    """
+    if len(scores) <= k:
+        return np.arange(len(scores))
+    kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+    above = np.flatnonzero(scores > kth)
+    tied = np.flatnonzero(scores == kth)
+    needed = k - len(above)
+    if len(tied) > needed:
+        tied = tied[np.argpartition(-ids[tied], needed - 1)[:needed]]
+    return np.concatenate([above, tied])
+
+
+def _pad_indptr(indptr: np.ndarray, columns: int) -> np.ndarray:
+    padding = np.full(columns + 1 - len(indptr), indptr[-1], dtype=indptr.dtype)
+    return np.concatenate([indptr, padding])
@@ -1,17 +1,191 @@
-from app.api.resume_scanner.models import ParsedResume, Resume
-from app.db.database import Database
+import threading
+
+import numpy as np
+
+from app.api.resume_scanner.models import ParsedResume, RankedResume, Resume, SearchHit
+from app.api.resume_scanner.ranking import ResumeRankingEngine
+from app.api.resume_scanner.search import ResumeSearchIndex
+from app.db.database import BaseDatabase
+from app.utils.minhash import MinHashLSH
 
 
 class ResumeRepository:
-    def __init__(self, db: Database):
+    """
+    Stores resumes and parses, and keeps the in-memory search, ranking and
+    near-duplicate indexes in step with the database.
+
+    The indexes follow the database rather than the calls made on this
+    object: ``sync`` indexes every parse and signature stored since the last
+    sync, so with a database shared between server processes each process
+    also picks up what the others wrote before it serves a query.
+    """
+
+    def __init__(
+        self,
+        db: BaseDatabase,
+        search_index: ResumeSearchIndex | None = None,
+        ranking_engine: ResumeRankingEngine | None = None,
+        duplicate_index: MinHashLSH | None = None,
+    ):
         self._db = db
+        self._search_index = search_index
+        self._ranking_engine = ranking_engine
+        self._duplicate_index = duplicate_index
+        # IDs of the newest records already indexed, and the resumes indexed
+        self._synced_parse_id = 0
+        self._synced_signature_id = 0
+        self._parsed_resume_ids: set[int] = set()
+        self._sync_lock = threading.Lock()
+        self.sync()
+
+    def sync(self) -> None:
+        """Indexes parses and signatures stored since the last sync."""
+        with self._sync_lock:
+            if self._search_index is not None or self._ranking_engine is not None:
+                self._sync_parses()
+            if self._duplicate_index is not None:
+                self._sync_signatures()
 
-    def create_resume(self, filename: str, content_type: str) -> Resume:
-        resume_data = {"filename": filename, "content_type": content_type}
+    def _sync_parses(self) -> None:
+        latest: dict[int, dict] = {}
+        for record in self._db.records_after("parsed_resumes", self._synced_parse_id):
+            resume_id = record["resume_id"]
+            previous = latest.get(resume_id)
+            if previous is None and resume_id in self._parsed_resume_ids:
+                previous = self._previous_parse(resume_id, record["id"])
+            for index in (self._search_index, self._ranking_engine):
+                if index is not None:
+                    index.add(resume_id, record, previous)
+            latest[resume_id] = record
+            self._parsed_resume_ids.add(resume_id)
+            self._synced_parse_id = record["id"]
+
+    def _previous_parse(self, resume_id: int, before_id: int) -> dict | None:
+        records = self._db.find_by("parsed_resumes", "resume_id", resume_id)
+        earlier = [record for record in records if record["id"] < before_id]
+        return earlier[-1] if earlier else None
+
+    def _sync_signatures(self) -> None:
+        records = self._db.records_after("resume_signatures", self._synced_signature_id)
+        for record in records:
+            # Signatures from a different MinHash configuration are skipped
+            if len(record["signature"]) == self._duplicate_index.num_perm:
+                self._duplicate_index.insert(
+                    record["resume_id"],
+                    np.asarray(record["signature"], dtype=np.uint32),
+                )
+            self._synced_signature_id = record["id"]
+
+    def create_resume(
+        self,
+        filename: str,
+        content_type: str,
+        file_path: str,
+        content_hash: str | None = None,
+        size: int | None = None,
+    ) -> Resume:
+        resume_data = {
+            "filename": filename,
+            "content_type": content_type,
+            "file_path": file_path,
+            "content_hash": content_hash,
+            "size": size,
+        }
         created_resume = self._db.add("resumes", resume_data)
         return Resume(**created_resume)
 
+    def create_resumes(self, resumes: list[dict]) -> list[Resume]:
+        """
+        Stores several uploaded resumes in one database write. Each dict holds
+        the keyword arguments of ``create_resume``.
+        """
+        records = [
+            {
+                "filename": resume["filename"],
+                "content_type": resume["content_type"],
+                "file_path": resume["file_path"],
+                "content_hash": resume.get("content_hash"),
+                "size": resume.get("size"),
+            }
+            for resume in resumes
+        ]
+        return [Resume(**record) for record in self._db.add_many("resumes", records)]
+
     def create_parsed_resume(self, resume_id: int, parsed_data: dict) -> ParsedResume:
         parsed_resume_data = {"resume_id": resume_id, **parsed_data}
         created_parsed_resume = self._db.add("parsed_resumes", parsed_resume_data)
+        self.sync()
         return ParsedResume(**created_parsed_resume)
+
+    def save_signature(self, resume_id: int, signature: np.ndarray) -> None:
+        """Stores a resume's MinHash signature and adds it to the LSH index."""
+        self._db.add(
+            "resume_signatures",
+            {"resume_id": resume_id, "signature": signature.tolist()},
+        )
+        self.sync()
+
+    def find_near_duplicates(
+        self, resume_id: int, signature: np.ndarray, threshold: float
+    ) -> list[tuple[int, float]]:
+        """Returns other resumes at or above the similarity threshold."""
+        self.sync()
+        return self._duplicate_index.query(signature, threshold, exclude=resume_id)
+
+    def index_sizes(self) -> dict[str, int]:
+        """Returns the number of resumes held by each configured index."""
+        indexes = {
+            "search": self._search_index,
+            "ranking": self._ranking_engine,
+            "near_duplicate": self._duplicate_index,
+        }
+        return {
+            name: len(index) for name, index in indexes.items() if index is not None
+        }
+
+    def get_resume(self, resume_id: int) -> dict | None:
+        return self._db.get_by_id("resumes", resume_id)
+
+    def get_parsed_resume_by_resume_id(self, resume_id: int) -> ParsedResume | None:
+        records = self._db.find_by("parsed_resumes", "resume_id", resume_id)
+        if not records:
+            return None
+        # Latest parse wins when a resume has been parsed more than once
+        return ParsedResume(**records[-1])
+
+    def search_parsed_resumes(
+        self, query: str, offset: int, limit: int
+    ) -> tuple[int, list[SearchHit]]:
+        """
+        Returns the total match count and one page of hits for a query.
+
+        Raises:
+            QueryError: If the query cannot be parsed
+        """
+        self.sync()
+        page = self._search_index.search(query, offset=offset, limit=limit)
+        hits = [
+            SearchHit(
+                resume_id=resume_id,
+                score=score,
+                resume=self.get_parsed_resume_by_resume_id(resume_id),
+            )
+            for resume_id, score in page.hits
+        ]
+        return page.total, hits
+
+    def rank_parsed_resumes(
+        self, job_description: str, top_k: int
+    ) -> tuple[int, list[RankedResume]]:
+        """Returns the number of ranked resumes and the best ``top_k`` matches."""
+        self.sync()
+        ranked = self._ranking_engine.rank(job_description, top_k=top_k)
+        results = [
+            RankedResume(
+                resume_id=resume_id,
+                score=round(score, 4),
+                resume=self.get_parsed_resume_by_resume_id(resume_id),
+            )
+            for resume_id, score in ranked
+        ]
+        return len(self._ranking_engine), results
@@ -0,0 +1,361 @@
+"""
+This module provides an in-memory inverted index over parsed resumes and a
+small boolean query language for searching it.
+
+Queries combine terms with ``AND`` (also implied by juxtaposition), ``OR``
+and ``NOT`` (or a leading ``-``), group with parentheses, match whole values
+with double quotes (``"machine learning"``) and prefixes with a trailing
+``*`` (``kube*``). A term can be restricted to one field with ``field:term``,
+e.g. ``skills:python`` or ``company:"tech corp"``.
+"""
+import bisect
+import functools
+import heapq
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+import numpy as np
+
+# Query field name -> indexed field
+SEARCH_FIELDS = {
+    "skills": "skills",
+    "skill": "skills",
+    "title": "job_title",
+    "job_title": "job_title",
+    "company": "company",
+    "institution": "institution",
+    "school": "institution",
+    "certification": "certification",
+    "cert": "certification",
+}
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+_QUERY_TOKEN_RE = re.compile(r'\s*(\(|\)|"[^"]*"|[^\s()"]+)')
+_MAX_PREFIX_EXPANSION = 1000
+
+
+class QueryError(ValueError):
+    """Raised for malformed search queries."""
+
+
+def _normalize(value: str) -> str:
+    return " ".join(_WORD_RE.findall(value.lower()))
+
+
+def _field_values(parsed: dict) -> Iterator[Tuple[str, str]]:
+    for skill in parsed.get("skills") or []:
+        yield "skills", skill
+    for job in parsed.get("experience") or parsed.get("work_experience") or []:
+        if isinstance(job, dict):
+            yield "job_title", job.get("job_title")
+            yield "company", job.get("company")
+    for entry in parsed.get("education") or []:
+        if isinstance(entry, dict):
+            yield "institution", entry.get("institution")
+    for entry in parsed.get("certifications") or []:
+        if isinstance(entry, dict):
+            yield "certification", entry.get("name")
+
+
+@functools.lru_cache(maxsize=65536)
+def _value_terms(field: str, value: str) -> Tuple[Tuple[str, str], ...]:
+    normalized = _normalize(value)
+    if not normalized:
+        return ()
+    words = normalized.split()
+    if len(words) == 1:
+        return ((field, normalized),)
+    return ((field, normalized), *((field, word) for word in words))
+
+
+def index_terms(parsed: dict) -> Set[Tuple[str, str]]:
+    """
+    Returns the ``(field, term)`` pairs indexed for a parsed resume: each
+    whole normalized value plus its individual words.
+    """
+    terms = set()
+    for field, value in _field_values(parsed):
+        if isinstance(value, str):
+            # Skills, companies and titles repeat across resumes
+            terms.update(_value_terms(field, value))
+    return terms
+
+
+@dataclass
+class _Term:
+    field: str | None
+    text: str
+    prefix: bool = False
+
+
+@dataclass
+class _Not:
+    operand: object
+
+
+@dataclass
+class _And:
+    operands: List[object]
+
+
+@dataclass
+class _Or:
+    operands: List[object]
+
+
+class _QueryParser:
+    """Recursive-descent parser producing a small query tree."""
+
+    def __init__(self, query: str):
+        self._tokens = _QUERY_TOKEN_RE.findall(query)
+        self._position = 0
+
+    def parse(self):
+        if not self._tokens:
+            raise QueryError("Query is empty")
+        node = self._parse_or()
+        if self._position < len(self._tokens):
+            raise QueryError(f"Unexpected '{self._tokens[self._position]}'")
+        return node
+
+    def _peek(self) -> str | None:
+        if self._position < len(self._tokens):
+            return self._tokens[self._position]
+        return None
+
+    def _next(self) -> str:
+        token = self._peek()
+        if token is None:
+            raise QueryError("Unexpected end of query")
+        self._position += 1
+        return token
+
+    def _parse_or(self):
+        operands = [self._parse_and()]
+        while self._peek() == "OR":
+            self._next()
+            operands.append(self._parse_and())
+        return operands[0] if len(operands) == 1 else _Or(operands)
+
+    def _parse_and(self):
+        operands = [self._parse_not()]
+        while (token := self._peek()) is not None and token not in ("OR", ")"):
+            if token == "AND":
+                self._next()
+            operands.append(self._parse_not())
+        return operands[0] if len(operands) == 1 else _And(operands)
+
+    def _parse_not(self):
+        token = self._peek()
+        if token == "NOT":
+            self._next()
+            return _Not(self._parse_not())
+        if token and token.startswith("-"):
+            if token == "-":
+                self._next()
+            else:
+                self._tokens[self._position] = token[1:]
+            return _Not(self._parse_not())
+        return self._parse_primary()
+
+    def _parse_primary(self):
+        token = self._next()
+        if token == "(":
+            node = self._parse_or()
+            if self._next() != ")":
+                raise QueryError("Missing closing parenthesis")
+            return node
+        if token in (")", "AND", "OR"):
+            raise QueryError(f"Unexpected '{token}'")
+        return self._parse_term(token)
+
+    def _parse_term(self, token: str) -> _Term:
+        field = None
+        name, separator, rest = token.partition(":")
+        if separator and name.lower() in SEARCH_FIELDS:
+            field = SEARCH_FIELDS[name.lower()]
+            token = rest or self._next()
+
+        prefix = token.endswith("*") and not token.startswith('"')
+        text = _normalize(token.strip('"').rstrip("*"))
+        if not text:
+            raise QueryError(f"Empty search term in '{token}'")
+        return _Term(field=field, text=text, prefix=prefix)
+
+
+@dataclass
+class SearchPage:
+    total: int
+    hits: List[Tuple[int, int]]
+
+
+class ResumeSearchIndex:
+    """
+    Inverted index from ``(field, term)`` to resume IDs.
+
+    Each resume is indexed once with its latest parse; re-indexing a resume
+    removes the terms of the previous parse first.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, Set[int]]] = {
+            field: {} for field in set(SEARCH_FIELDS.values())
+        }
+        # Sorted vocabulary per field for prefix lookups
+        self._vocabulary: Dict[str, List[str]] = {field: [] for field in self._postings}
+        self._documents: Set[int] = set()
+        self._max_id = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, resume_id: int, parsed: dict, previous: dict | None = None):
+        """Indexes a parsed resume, replacing the terms of its previous parse."""
+        with self._lock:
+            if previous is not None:
+                for field, term in index_terms(previous):
+                    postings = self._postings[field].get(term)
+                    if postings is not None:
+                        postings.discard(resume_id)
+            for field, term in index_terms(parsed):
+                postings = self._postings[field].get(term)
+                if postings is None:
+                    postings = self._postings[field][term] = set()
+                    bisect.insort(self._vocabulary[field], term)
+                postings.add(resume_id)
+            self._documents.add(resume_id)
+            self._max_id = max(self._max_id, resume_id)
+
+    def rebuild(self, records: Iterable[dict]) -> None:
+        """Indexes stored parse records, oldest first."""
+        latest: Dict[int, dict] = {}
+        for record in records:
+            self.add(record["resume_id"], record, latest.get(record["resume_id"]))
+            latest[record["resume_id"]] = record
+
+    def search(self, query: str, offset: int = 0, limit: int = 20) -> SearchPage:
+        """
+        Evaluates a query and returns one page of ``(resume_id, score)`` hits.
+
+        The score is the number of positive query terms a resume matches;
+        ties go to the most recently created resume.
+
+        Raises:
+            QueryError: If the query cannot be parsed
+        """
+        tree = _QueryParser(query).parse()
+        with self._lock:
+            matches = self._evaluate(tree)
+            total = len(matches)
+            if offset >= total:
+                return SearchPage(total=total, hits=[])
+
+            terms = list(self._positive_terms(tree))
+            needed = offset + limit
+            if len(terms) <= 1 or not self._has_or(tree):
+                # Every match satisfies the same terms, so only recency ranks
+                hits = [
+                    (resume_id, len(terms))
+                    for resume_id in self._most_recent(matches, needed)
+                ]
+            else:
+                hits = self._top_scored(matches, terms, needed)
+        return SearchPage(total=total, hits=hits[offset:])
+
+    def _most_recent(self, matches: Set[int], needed: int) -> List[int]:
+        # Dense result sets are cheaper to probe downwards from the newest ID
+        # than to scan in full
+        if needed * self._max_id < len(matches) ** 2:
+            ids = []
+            for resume_id in range(self._max_id, 0, -1):
+                if resume_id in matches:
+                    ids.append(resume_id)
+                    if len(ids) == needed:
+                        break
+            return ids
+        return heapq.nlargest(needed, matches)
+
+    def _top_scored(
+        self, matches: Set[int], terms: List[_Term], needed: int
+    ) -> List[Tuple[int, int]]:
+        postings = [self._lookup(term) for term in terms]
+        scores = np.bincount(
+            np.concatenate([np.fromiter(p, np.int64, len(p)) for p in postings]),
+            minlength=self._max_id + 1,
+        )
+        ids = np.fromiter(matches, np.int64, len(matches))
+        keys = scores[ids] * (self._max_id + 1) + ids
+        if needed < len(keys):
+            top = np.argpartition(-keys, needed - 1)[:needed]
+            ids, keys = ids[top], keys[top]
+        ids = ids[np.argsort(-keys)]
+        return [(int(resume_id), int(scores[resume_id])) for resume_id in ids]
+
+    def _lookup(self, term: _Term) -> Set[int]:
+        fields = [term.field] if term.field else self._postings
+        if not term.prefix:
+            sets = [
+                self._postings[field][term.text]
+                for field in fields
+                if term.text in self._postings[field]
+            ]
+        else:
+            sets = []
+            for field in fields:
+                vocabulary = self._vocabulary[field]
+                start = bisect.bisect_left(vocabulary, term.text)
+                stop = bisect.bisect_left(vocabulary, term.text + "\uffff")
+                stop = min(stop, start + _MAX_PREFIX_EXPANSION)
+                postings = self._postings[field]
+                sets.extend(postings[word] for word in vocabulary[start:stop])
+
+        if len(sets) == 1:
+            return sets[0]
+        return set().union(*sets)
+
+    def _evaluate(self, node) -> Set[int]:
+        if isinstance(node, _Term):
+            return self._lookup(node)
+        if isinstance(node, _Not):
+            return self._documents - self._evaluate(node.operand)
+        if isinstance(node, _Or):
+            return set().union(*(self._evaluate(child) for child in node.operands))
+
+        positives = [
+            self._evaluate(child)
+            for child in node.operands
+            if not isinstance(child, _Not)
+        ]
+        negatives = [
+            self._evaluate(child.operand)
+            for child in node.operands
+            if isinstance(child, _Not)
+        ]
+        if positives:
+            # Intersect smallest first so the working set only shrinks
+            positives.sort(key=len)
+            result = positives[0]
+            if len(positives) > 1:
+                result = result.intersection(*positives[1:])
+        else:
+            result = self._documents
+        if negatives:
+            result = result.difference(*negatives)
+        return result
+
+    def _positive_terms(self, node) -> Iterator[_Term]:
+        if isinstance(node, _Term):
+            yield node
+        elif isinstance(node, (_And, _Or)):
+            for child in node.operands:
+                yield from self._positive_terms(child)
+
+    def _has_or(self, node) -> bool:
+        if isinstance(node, _Or):
+            return True
+        if isinstance(node, _And):
+            return any(self._has_or(child) for child in node.operands)
+        return False
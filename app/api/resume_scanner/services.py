@@ -1,67 +1,595 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Iterator, Tuple
+
 from app.api.base_components import Response
+from app.api.resume_scanner.models import (
+    ParsedResume,
+    RankResults,
+    Resume,
+    SearchResults,
+)
 from app.api.resume_scanner.repositories import ResumeRepository
+from app.api.resume_scanner.search import QueryError
+from app.exceptions.exceptions import FileTypeError, ParsingError
+from app.utils.executors import WorkerPools
 from app.utils.file_extractor import (
-    extract_text_from_docx,
-    extract_text_from_pdf,
-    extract_text_from_txt,
+    DOCX_CONTENT_TYPE,
+    EXTRACTORS,
+    PDF_CONTENT_TYPE,
+    TXT_CONTENT_TYPE,
+    count_pdf_pages,
+    extract_pdf_pages,
+    extractor_version,
+    join_pages,
 )
-from app.utils.llm_extractor import extract_with_llm
+from app.utils.llm_cache import LLMResultCache
+from app.utils.llm_extractor import (
+    ALL_FIELDS,
+    extract_sections_with_llm,
+    extract_with_llm,
+    stream_with_llm,
+)
+from app.utils.llm_provider import LLMClient, LLMProviderError
+from app.utils.metrics import PARSES_IN_FLIGHT, stage_timer
+from app.utils.minhash import MinHasher
+from app.utils.rule_extractor import RuleBasedExtractor
+from app.utils.text_preprocessor import compact_resume_text
+from app.utils.text_store import ExtractedTextStore
+
+logger = logging.getLogger(__name__)
+
+_EXTRACT_STAGES = {
+    PDF_CONTENT_TYPE: "extract_pdf",
+    DOCX_CONTENT_TYPE: "extract_docx",
+    TXT_CONTENT_TYPE: "extract_txt",
+}
+
+
+@dataclass
+class _ParsePlan:
+    """What is known about a resume before its LLM call."""
+
+    # An earlier near-duplicate's parse, copied for this resume
+    reused: ParsedResume | None = None
+    # The compacted prompt text and its token count
+    text: str = ""
+    tokens: int = 0
+    # Fields the rules answered confidently, and near-duplicate flags
+    answered: dict = field(default_factory=dict)
+    flags: dict = field(default_factory=dict)
+
+    @property
+    def remaining(self) -> list[str]:
+        """The fields left for the LLM."""
+        return [name for name in ALL_FIELDS if name not in self.answered]
+
+    @property
+    def llm_fields(self) -> list[str] | None:
+        # The full prompt (and its cache entries) when the rules answered nothing
+        return self.remaining if self.answered else None
+
+
+def _field_events(fields: dict) -> Iterator[Tuple[str, dict]]:
+    """Yields a "field" event per ``ParsedResume`` field set in ``fields``."""
+    parsed = ParsedResume.model_validate(fields)
+    for name in ParsedResume.model_fields:
+        if name in parsed.model_fields_set:
+            info = ParsedResume.model_fields[name]
+            yield "field", {
+                "field": info.alias or name,
+                "value": getattr(parsed, name),
+            }
 
 
 class ResumeScannerService:
-    def __init__(self, resume_repository: ResumeRepository):
+    def __init__(
+        self,
+        resume_repository: ResumeRepository,
+        worker_pools: WorkerPools,
+        llm_client: LLMClient,
+        llm_cache: LLMResultCache | None = None,
+        pdf_max_pages: int = 50,
+        pdf_pages_per_task: int = 4,
+        slow_page_seconds: float = 1.0,
+        prompt_max_tokens: int = 8000,
+        rule_extractor: RuleBasedExtractor | None = None,
+        fast_path_confidence: float = 0.9,
+        minhasher: MinHasher | None = None,
+        near_duplicate_threshold: float = 0.85,
+        reuse_duplicate_parses: bool = True,
+        text_store: ExtractedTextStore | None = None,
+        sectioned_min_tokens: int | None = None,
+    ):
         self._resume_repository = resume_repository
+        self._worker_pools = worker_pools
+        self._llm_client = llm_client
+        self._llm_cache = llm_cache
+        self._pdf_max_pages = pdf_max_pages
+        self._pdf_pages_per_task = pdf_pages_per_task
+        self._slow_page_seconds = slow_page_seconds
+        self._prompt_max_tokens = prompt_max_tokens
+        self._rule_extractor = rule_extractor
+        self._fast_path_confidence = fast_path_confidence
+        self._fast_path_hits = dict.fromkeys(ALL_FIELDS, 0)
+        self._fast_path_parses = 0
+        self._fast_path_llm_skipped = 0
+        self._minhasher = minhasher
+        self._near_duplicate_threshold = near_duplicate_threshold
+        self._reuse_duplicate_parses = reuse_duplicate_parses
+        self._text_store = text_store
+        self._sectioned_min_tokens = sectioned_min_tokens
 
-    def upload_resume(
-        self, filename: str, content_type: str, file_path: str
+    async def upload_resume(
+        self,
+        filename: str,
+        content_type: str,
+        file_path: str,
+        content_hash: str | None = None,
+        size: int | None = None,
     ) -> Response:
-        resume = self._resume_repository.create_resume(filename, content_type)
+        resume = await self.create_resume(
+            filename, content_type, file_path, content_hash, size
+        )
         return Response(
             message="Resume uploaded successfully",
             body=resume,
         )
 
-    def parse_resume(
-        self, resume_id: int, file_path: str, content_type: str
-    ) -> Response:
-        try:
-            docx_type = (
-                "application/vnd.openxmlformats-officedocument."
-                "wordprocessingml.document"
-            )
-            if content_type == "application/pdf":
-                text = extract_text_from_pdf(file_path)
-            elif content_type == docx_type:
-                text = extract_text_from_docx(file_path)
-            elif content_type == "text/plain":
-                text = extract_text_from_txt(file_path)
-            else:
-                return Response(
-                    status_code=400,
-                    message="Unsupported file type",
-                    error_code=2001,
+    async def create_resume(
+        self,
+        filename: str,
+        content_type: str,
+        file_path: str,
+        content_hash: str | None = None,
+        size: int | None = None,
+    ) -> Resume:
+        return await asyncio.to_thread(
+            self._resume_repository.create_resume,
+            filename,
+            content_type,
+            file_path,
+            content_hash,
+            size,
+        )
+
+    async def create_resumes(self, resumes: list[dict]) -> list[Resume]:
+        """Registers several stored files in one database write."""
+        return await asyncio.to_thread(self._resume_repository.create_resumes, resumes)
+
+    async def extract_text(
+        self, file_path: str, content_type: str, content_hash: str | None = None
+    ) -> str:
+        """
+        Extracts plain text from a stored resume in the process pool.
+
+        With a text store and the file's content hash, text extracted before by
+        the same extractor version is read back instead.
+
+        Raises:
+            FileTypeError: If the content type is not supported
+        """
+        if content_type not in EXTRACTORS:
+            raise FileTypeError()
+        if self._text_store is None or content_hash is None:
+            return await self._extract(file_path, content_type)
+
+        key = ExtractedTextStore.make_key(
+            content_hash, self._extractor_version(content_type)
+        )
+        with stage_timer("extract_store_read"):
+            text = await asyncio.to_thread(self._text_store.get, key)
+        if text is None:
+            text = await self._extract(file_path, content_type)
+            await asyncio.to_thread(self._text_store.put, key, text)
+        return text
+
+    def _extractor_version(self, content_type: str) -> str:
+        version = extractor_version(content_type)
+        if content_type == PDF_CONTENT_TYPE:
+            # Pages past the cap are not extracted
+            version += f":pages={self._pdf_max_pages}"
+        return version
+
+    async def _extract(self, file_path: str, content_type: str) -> str:
+        with stage_timer(_EXTRACT_STAGES.get(content_type, "extract_other")):
+            if content_type == PDF_CONTENT_TYPE:
+                # Page ranges are extracted in parallel rather than in one call
+                return await self._extract_pdf(file_path)
+            return await self._worker_pools.run_cpu(
+                EXTRACTORS.get(content_type), file_path
+            )
+
+    async def _extract_pdf(self, file_path: str) -> str:
+        page_count = await self._worker_pools.run_cpu(count_pdf_pages, file_path)
+        page_count = min(page_count, self._pdf_max_pages)
+
+        # Split the pages into ranges so long documents use several workers
+        step = self._pdf_pages_per_task
+        chunks = await asyncio.gather(
+            *(
+                self._worker_pools.run_cpu(
+                    extract_pdf_pages, file_path, start, min(start + step, page_count)
                 )
+                for start in range(0, page_count, step)
+            )
+        )
+        pages = [page for chunk in chunks for page in chunk]
+
+        for page in pages:
+            if page.seconds >= self._slow_page_seconds:
+                logger.warning(
+                    f"Slow PDF page {page.page_number} in {file_path}: "
+                    f"{page.seconds:.3f}s"
+                )
+        logger.debug(
+            f"Extracted {len(pages)} PDF pages from {file_path}: "
+            + ", ".join(f"{p.page_number}={p.seconds:.3f}s" for p in pages)
+        )
+        return join_pages(pages)
+
+    async def process_resume(
+        self,
+        resume_id: int,
+        file_path: str,
+        content_type: str,
+        content_hash: str | None = None,
+    ) -> ParsedResume:
+        """
+        Extracts, parses and stores a resume.
 
-            parsed_data = extract_with_llm(text)
+        Raises:
+            FileTypeError: If the content type is not supported
+            ParsingError: If the LLM returns no usable data
+        """
+        text = await self.extract_text(file_path, content_type, content_hash)
+        return await self.parse_text(resume_id, text)
 
+    async def parse_text(self, resume_id: int, text: str) -> ParsedResume:
+        """
+        Parses extracted resume text with the LLM and stores the result.
+
+        Raises:
+            ParsingError: If the LLM returns no usable data
+        """
+        plan = await self._plan_parse(resume_id, text)
+        if plan.reused is not None:
+            return plan.reused
+
+        parsed_data = {}
+        if plan.remaining:
+            extract = extract_with_llm
+            if (
+                self._sectioned_min_tokens is not None
+                and plan.tokens >= self._sectioned_min_tokens
+            ):
+                # Long resumes: one concurrent prompt per section
+                extract = extract_sections_with_llm
+            parsed_data = await extract(
+                plan.text,
+                self._llm_client,
+                self._llm_cache,
+                fields=plan.llm_fields,
+            )
             if not parsed_data:
-                return Response(
-                    status_code=500,
-                    message="Failed to parse resume with LLM",
-                    error_code=2002,
-                )
+                raise ParsingError("Failed to parse resume with LLM")
+        return await self._store_parse(resume_id, parsed_data, plan)
+
+    async def stream_parse_text(
+        self, resume_id: int, text: str
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Parses extracted resume text like ``parse_text``, yielding
+        ``("field", {"field": alias, "value": value})`` as soon as each
+        ``ParsedResume`` field is known and finally ``("done", ParsedResume)``
+        once the validated record is stored.
+
+        Fields the rules answer are yielded before the LLM is called; the
+        rest follow as the streamed LLM answer completes them.
+
+        Raises:
+            ParsingError: If the LLM returns no usable data
+        """
+        plan = await self._plan_parse(resume_id, text)
+        if plan.reused is not None:
+            reused = plan.reused.model_dump(
+                exclude={"duplicate_of", "duplicate_similarity"}
+            )
+            for event in _field_events(reused):
+                yield event
+            yield "done", plan.reused
+            return
+
+        for event in _field_events(plan.answered):
+            yield event
+        parsed_data = {}
+        if plan.remaining:
+            try:
+                async for fields in stream_with_llm(
+                    plan.text,
+                    self._llm_client,
+                    self._llm_cache,
+                    fields=plan.llm_fields,
+                ):
+                    # Rule answers are already sent and take precedence
+                    fields = {
+                        name: value
+                        for name, value in fields.items()
+                        if name not in plan.answered
+                    }
+                    parsed_data.update(fields)
+                    for event in _field_events(fields):
+                        yield event
+            except (LLMProviderError, ValueError) as e:
+                logger.warning(f"Streamed parse of resume {resume_id} failed: {e}")
+                raise ParsingError("Failed to parse resume with LLM")
+            if not parsed_data:
+                raise ParsingError("Failed to parse resume with LLM")
+        yield "done", await self._store_parse(resume_id, parsed_data, plan)
+
+    async def _plan_parse(self, resume_id: int, text: str) -> "_ParsePlan":
+        """
+        Runs the steps before the LLM call: near-duplicate detection (which
+        may reuse an earlier parse outright), compaction and the rules.
+        """
+        with stage_timer("near_duplicate"):
+            duplicates = await self._find_near_duplicates(resume_id, text)
+        flags = {}
+        if duplicates:
+            flags = {
+                "duplicate_of": duplicates[0][0],
+                "duplicate_similarity": round(duplicates[0][1], 4),
+            }
+            if self._reuse_duplicate_parses:
+                reused = await self._reuse_parse(resume_id, duplicates)
+                if reused is not None:
+                    return _ParsePlan(reused=reused)
+
+        with stage_timer("compact"):
+            compacted = compact_resume_text(text, self._prompt_max_tokens)
+        logger.info(
+            f"Compacted resume {resume_id} text: {compacted.tokens_before} -> "
+            f"{compacted.tokens_after} tokens"
+        )
+
+        answered = {}
+        if self._rule_extractor is not None:
+            with stage_timer("rules"):
+                rules = self._rule_extractor.extract(text)
+            answered = {
+                name: rules.fields[name]
+                for name in rules.confident_fields(self._fast_path_confidence)
+            }
+            self._record_fast_path(answered)
+
+        return _ParsePlan(
+            text=compacted.text,
+            tokens=compacted.tokens_after,
+            answered=answered,
+            flags=flags,
+        )
+
+    async def _store_parse(
+        self, resume_id: int, parsed_data: dict, plan: "_ParsePlan"
+    ) -> ParsedResume:
+        parsed_data.update(plan.answered)
+        parsed_data.update(plan.flags)
+        with stage_timer("db_write"):
+            return await asyncio.to_thread(
+                self._resume_repository.create_parsed_resume, resume_id, parsed_data
+            )
 
-            parsed_resume = self._resume_repository.create_parsed_resume(
-                resume_id, parsed_data
+    async def _find_near_duplicates(
+        self, resume_id: int, text: str
+    ) -> list[tuple[int, float]]:
+        """Checks the text against the LSH index and then indexes it."""
+        if self._minhasher is None:
+            return []
+        signature = await asyncio.to_thread(self._minhasher.signature, text)
+        if signature is None:
+            return []
+        duplicates = await asyncio.to_thread(
+            self._resume_repository.find_near_duplicates,
+            resume_id,
+            signature,
+            self._near_duplicate_threshold,
+        )
+        await asyncio.to_thread(
+            self._resume_repository.save_signature, resume_id, signature
+        )
+        return duplicates
+
+    async def _reuse_parse(
+        self, resume_id: int, duplicates: list[tuple[int, float]]
+    ) -> ParsedResume | None:
+        """Copies the parse of the most similar resume that has one."""
+        for duplicate_id, similarity in duplicates:
+            existing = await asyncio.to_thread(
+                self._resume_repository.get_parsed_resume_by_resume_id, duplicate_id
+            )
+            if existing is None:
+                continue
+            logger.info(
+                f"Resume {resume_id} is a near-duplicate of {duplicate_id} "
+                f"({similarity:.2f}); reusing its parse"
+            )
+            parsed_data = existing.model_dump(
+                exclude={"duplicate_of", "duplicate_similarity"}
+            )
+            parsed_data.update(
+                duplicate_of=duplicate_id, duplicate_similarity=round(similarity, 4)
+            )
+            return await asyncio.to_thread(
+                self._resume_repository.create_parsed_resume, resume_id, parsed_data
             )
+        return None
+
+    async def parse_resume(
+        self,
+        resume_id: int,
+        file_path: str,
+        content_type: str,
+        content_hash: str | None = None,
+    ) -> Response:
+        try:
+            with PARSES_IN_FLIGHT.track_inprogress():
+                parsed_resume = await self.process_resume(
+                    resume_id, file_path, content_type, content_hash
+                )
             return Response(
                 message="Resume parsed successfully",
                 body=parsed_resume,
             )
 
+        except FileTypeError as e:
+            return Response(
+                status_code=400,
+                message=e.message,
+                error_code=2001,
+            )
+        except ParsingError as e:
+            return Response(
+                status_code=500,
+                message=e.message,
+                error_code=2002,
+            )
         except Exception as e:
             return Response(
                 status_code=500,
                 message=f"Error parsing resume: {e}",
                 error_code=2003,
             )
+
+    async def stream_parse_resume(
+        self,
+        resume_id: int,
+        file_path: str,
+        content_type: str,
+        content_hash: str | None = None,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Extracts and parses a resume, yielding the events of
+        ``stream_parse_text``. Failures end the stream with
+        ``("error", {"message": ..., "error_code": ...})`` using the error
+        codes of ``parse_resume``.
+        """
+        try:
+            with PARSES_IN_FLIGHT.track_inprogress():
+                text = await self.extract_text(file_path, content_type, content_hash)
+                async for event in self.stream_parse_text(resume_id, text):
+                    yield event
+        except FileTypeError as e:
+            yield "error", {"message": e.message, "error_code": 2001}
+        except ParsingError as e:
+            yield "error", {"message": e.message, "error_code": 2002}
+        except Exception as e:
+            logger.exception(f"Streamed parse of resume {resume_id} failed")
+            yield "error", {"message": f"Error parsing resume: {e}", "error_code": 2003}
+
+    def _record_fast_path(self, answered: dict) -> None:
+        self._fast_path_parses += 1
+        for name in answered:
+            self._fast_path_hits[name] += 1
+        if len(answered) == len(ALL_FIELDS):
+            self._fast_path_llm_skipped += 1
+
+    def fast_path_stats(self) -> dict:
+        """Returns how often the rules answered each field."""
+        parses = self._fast_path_parses
+        fields = {
+            name: {
+                "answered": hits,
+                "rate": round(hits / parses, 4) if parses else 0.0,
+            }
+            for name, hits in self._fast_path_hits.items()
+        }
+        return {
+            "parses": parses,
+            "llm_skipped": self._fast_path_llm_skipped,
+            "fields": fields,
+        }
+
+    def get_fast_path_stats(self) -> Response:
+        return Response(
+            message="Fast path statistics retrieved successfully",
+            body=self.fast_path_stats(),
+        )
+
+    def text_store_stats(self) -> dict:
+        """Returns reuse and disk usage of the extracted text store."""
+        if self._text_store is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._text_store.stats()}
+
+    def get_text_store_stats(self) -> Response:
+        return Response(
+            message="Text store statistics retrieved successfully",
+            body=self.text_store_stats(),
+        )
+
+    async def get_resume(self, resume_id: int) -> dict | None:
+        return await asyncio.to_thread(self._resume_repository.get_resume, resume_id)
+
+    async def get_parsed_resume(self, resume_id: int) -> Response:
+        parsed_resume = await asyncio.to_thread(
+            self._resume_repository.get_parsed_resume_by_resume_id, resume_id
+        )
+        if not parsed_resume:
+            return Response(
+                status_code=404,
+                message="Parsed resume not found",
+                error_code=2007,
+            )
+
+        return Response(
+            message="Parsed resume retrieved successfully",
+            body=parsed_resume,
+        )
+
+    async def search_resumes(self, query: str, page: int, page_size: int) -> Response:
+        started = time.perf_counter()
+        try:
+            total, hits = await asyncio.to_thread(
+                self._resume_repository.search_parsed_resumes,
+                query,
+                offset=(page - 1) * page_size,
+                limit=page_size,
+            )
+        except QueryError as e:
+            return Response(
+                status_code=400,
+                message=str(e),
+                error_code=2010,
+            )
+        logger.debug(
+            f"Search {query!r} matched {total} resumes in "
+            f"{(time.perf_counter() - started) * 1000:.2f}ms"
+        )
+
+        return Response(
+            message="Search completed successfully",
+            body=SearchResults(
+                query=query,
+                total=total,
+                page=page,
+                page_size=page_size,
+                results=hits,
+            ),
+        )
+
+    async def rank_resumes(self, job_description: str, top_k: int) -> Response:
+        started = time.perf_counter()
+        candidates, results = await asyncio.to_thread(
+            self._resume_repository.rank_parsed_resumes, job_description, top_k
+        )
+        logger.debug(
+            f"Ranked {candidates} resumes in "
+            f"{(time.perf_counter() - started) * 1000:.2f}ms"
+        )
+
+        return Response(
+            message="Resumes ranked successfully",
+            body=RankResults(candidates=candidates, results=results),
+        )
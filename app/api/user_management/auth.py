@@ -0,0 +1,45 @@
+"""
+This module provides the FastAPI dependency that authenticates requests by
+their bearer token.
+"""
+from fastapi import Depends
+from fastapi.security import OAuth2PasswordBearer
+
+from app.api.user_management.models import TokenData
+from app.exceptions.exceptions import AuthenticationError
+from app.utils.security import InvalidTokenError, TokenManager
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/users/login", auto_error=False)
+
+
+class CurrentUser:
+    """
+    Returns the caller's identity from their access token.
+
+    Only the token's signature and expiry are checked, so authenticating a
+    request costs no database lookup. Routes depend on the module-level
+    ``current_user``, whose token manager is set during startup.
+    """
+
+    def __init__(self, token_manager: TokenManager | None = None):
+        self.token_manager = token_manager
+
+    async def __call__(self, token: str | None = Depends(oauth2_scheme)) -> TokenData:
+        """
+        Raises:
+            AuthenticationError: If the token is missing, invalid or expired
+        """
+        if self.token_manager is None:
+            raise RuntimeError("CurrentUser has no token manager configured")
+        if not token:
+            raise AuthenticationError()
+        try:
+            claims = self.token_manager.verify(token)
+        except InvalidTokenError:
+            raise AuthenticationError("Invalid or expired token")
+        return TokenData(
+            email=claims["sub"], user_id=claims["uid"], role=claims["role"]
+        )
+
+
+current_user = CurrentUser()
@@ -1,16 +1,12 @@
-from fastapi import Depends, status
+from fastapi import Depends
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.api.base_components import BaseController, Endpoint, Response
-from app.api.user_management.models import Token, User, UserCreate
+from app.api.user_management.auth import current_user
+from app.api.user_management.models import Token, TokenData, User, UserCreate
 from app.api.user_management.services import UserManagementService
 
 
-# Dummy security functions for now
-def create_access_token(data: dict):
-    return "fake-token"
-
-
 class UserManagementController(BaseController):
     def __init__(self, service: UserManagementService, api_version: str):
         self.service = service
@@ -29,6 +25,12 @@ class UserManagementController(BaseController):
                 methods=["POST"],
                 response_type=Token,
             ),
+            Endpoint(
+                rule="/me",
+                func=self.me,
+                methods=["GET"],
+                response_type=TokenData,
+            ),
         ]
 
         super().__init__(
@@ -38,19 +40,14 @@ class UserManagementController(BaseController):
         )
 
     async def register(self, user: UserCreate) -> Response:
-        return self.service.create_user(user.dict())
+        return await self.service.create_user(user.model_dump(mode="json"))
 
     async def login(self, form_data: OAuth2PasswordRequestForm = Depends()) -> Response:
-        user = self.service.get_user_by_email(email=form_data.username)
-        if not user or user["password"] != form_data.password:
-            return Response(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                message="Incorrect username or password",
-                error_code=1002,
-            )
-
-        access_token = create_access_token(data={"sub": user["email"]})
+        return await self.service.login(form_data.username, form_data.password)
+
+    async def me(self, user: TokenData = Depends(current_user)) -> Response:
+        """Returns the identity carried by the caller's access token."""
         return Response(
-            message="Login successful",
-            body={"access_token": access_token, "token_type": "bearer"},
+            message="User retrieved successfully",
+            body=user,
         )
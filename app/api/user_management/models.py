@@ -28,7 +28,10 @@ class UserCreate(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    expires_in: int | None = None
 
 
 class TokenData(BaseModel):
     email: str | None = None
+    user_id: int | None = None
+    role: Role | None = None
@@ -1,22 +1,76 @@
+import asyncio
+
 from app.api.base_components import Response
+from app.api.user_management.models import Role, Token, User
+from app.db.database import BaseDatabase, DuplicateKeyError
+from app.utils.security import PasswordHasher, TokenManager
 
-_users_db = {}
+SELF_REGISTRATION_ROLES = {Role.RECRUITER.value, Role.CANDIDATE.value}
 
 
 class UserManagementService:
-    def create_user(self, user: dict) -> Response:
-        if user["email"] in _users_db:
+    def __init__(
+        self,
+        db: BaseDatabase,
+        password_hasher: PasswordHasher,
+        token_manager: TokenManager,
+    ):
+        self._db = db
+        self._password_hasher = password_hasher
+        self._token_manager = token_manager
+
+    async def create_user(self, user: dict) -> Response:
+        # Roles set quotas and permissions; admins cannot appoint themselves
+        if user["role"] not in SELF_REGISTRATION_ROLES:
+            return Response(
+                status_code=403,
+                message=f"Cannot register with the {user['role']} role",
+                error_code=1004,
+            )
+        record = {
+            "email": user["email"],
+            "role": user["role"],
+            "hashed_password": await self._password_hasher.hash(user["password"]),
+        }
+        # The unique index on email settles concurrent registrations, including
+        # ones served by other processes sharing the database
+        try:
+            record = await asyncio.to_thread(self._db.add, "users", record)
+        except DuplicateKeyError:
             return Response(
                 status_code=400,
                 message="Email already registered",
                 error_code=1001,
             )
 
-        _users_db[user["email"]] = user
         return Response(
             message="User registered successfully",
-            body=user,
+            body=User(**record),
+        )
+
+    async def login(self, email: str, password: str) -> Response:
+        user = await asyncio.to_thread(self.get_user_by_email, email)
+        # Unknown emails are still checked (against a dummy hash) so they take
+        # as long to reject as wrong passwords
+        hashed_password = user.get("hashed_password") if user else None
+        verified = await self._password_hasher.verify(password, hashed_password)
+        if not user or not hashed_password or not verified:
+            return Response(
+                status_code=401,
+                message="Incorrect username or password",
+                error_code=1002,
+            )
+
+        access_token, expires_in = self._token_manager.issue(
+            email=user["email"], user_id=user["id"], role=user["role"]
+        )
+        return Response(
+            message="Login successful",
+            body=Token(
+                access_token=access_token, token_type="bearer", expires_in=expires_in
+            ),
         )
 
     def get_user_by_email(self, email: str) -> dict | None:
-        return _users_db.get(email)
+        users = self._db.find_by("users", "email", email)
+        return users[0] if users else None
@@ -0,0 +1,341 @@
+"""
+This module provides the application configuration.
+"""
+import os
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+def _env_str(name: str, default: str) -> str:
+    return os.environ.get(name, default)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    return value.lower() in ("1", "true", "yes") if value else default
+
+
+def _env_optional_str(name: str) -> str | None:
+    return os.environ.get(name) or None
+
+
+def _env_rates(name: str, default: str) -> Dict[str, float]:
+    """
+    Parses ``key=value`` pairs separated by commas, e.g. "admin=60,user=6".
+
+    Raises:
+        ValueError: If a rate is not a non-negative number
+    """
+    value = os.environ.get(name, default)
+    rates = {}
+    for pair in value.split(","):
+        if pair.strip():
+            key, _, rate = pair.partition("=")
+            key, rate = key.strip(), float(rate)
+            # Written to also reject NaN
+            if not rate >= 0:
+                raise ValueError(f"{name}: rate for {key!r} must be >= 0")
+            rates[key] = rate
+    return rates
+
+
+@dataclass
+class AppConfig:
+    """Application configuration, overridable through environment variables."""
+
+    media_path: str = field(
+        default_factory=lambda: _env_str(
+            "MEDIA_PATH", "/home/ubuntu/resume-scanner/media"
+        )
+    )
+
+    # Database persistence; the store is memory-only unless a directory is set
+    db_data_dir: str | None = field(
+        default_factory=lambda: _env_optional_str("DB_DATA_DIR")
+    )
+    db_snapshot_every: int = field(
+        default_factory=lambda: _env_int("DB_SNAPSHOT_EVERY", 1000)
+    )
+
+    # "memory" keeps the store in this process; "sqlite" uses a file that
+    # several server processes can share (DB_SQLITE_PATH, by default
+    # resume_scanner.sqlite3 in the data or media directory)
+    db_backend: str = field(default_factory=lambda: _env_str("DB_BACKEND", "memory"))
+    db_sqlite_path: str | None = field(
+        default_factory=lambda: _env_optional_str("DB_SQLITE_PATH")
+    )
+    db_pool_size: int = field(default_factory=lambda: _env_int("DB_POOL_SIZE", 4))
+
+    # HTTP server; with more than one worker each runs in its own process
+    # and DB_BACKEND must be "sqlite"
+    api_host: str = field(default_factory=lambda: _env_str("API_HOST", "0.0.0.0"))
+    api_port: int = field(default_factory=lambda: _env_int("API_PORT", 8000))
+    api_workers: int = field(default_factory=lambda: _env_int("API_WORKERS", 1))
+
+    # Access tokens are JWTs signed with JWT_SECRET_KEY (an HMAC secret, or a
+    # PEM private key with JWT_PUBLIC_KEY for RS*/ES* algorithms). Without a
+    # secret each process generates its own, so tokens do not survive restarts
+    jwt_secret_key: str | None = field(
+        default_factory=lambda: _env_optional_str("JWT_SECRET_KEY")
+    )
+    jwt_public_key: str | None = field(
+        default_factory=lambda: _env_optional_str("JWT_PUBLIC_KEY")
+    )
+    jwt_algorithm: str = field(
+        default_factory=lambda: _env_str("JWT_ALGORITHM", "HS256")
+    )
+    jwt_expire_minutes: int = field(
+        default_factory=lambda: _env_int("JWT_EXPIRE_MINUTES", 30)
+    )
+    jwt_issuer: str | None = field(
+        default_factory=lambda: _env_optional_str("JWT_ISSUER")
+    )
+    jwt_verify_cache_size: int = field(
+        default_factory=lambda: _env_int("JWT_VERIFY_CACHE_SIZE", 10000)
+    )
+
+    # bcrypt cost, and how many hashes may run at once in the I/O thread pool
+    password_hash_rounds: int = field(
+        default_factory=lambda: _env_int("PASSWORD_HASH_ROUNDS", 12)
+    )
+    password_hash_concurrency: int = field(
+        default_factory=lambda: _env_int("PASSWORD_HASH_CONCURRENCY", 4)
+    )
+
+    # Admission control for parse, parse job and bulk requests. Callers get
+    # ADMISSION_USER_RATES requests per minute by role (by address when not
+    # logged in, as "anonymous"), and each role shares ADMISSION_ROLE_RATES,
+    # so every role's total is bounded.
+    # Synchronous parses also take one of ADMISSION_MAX_IN_FLIGHT slots, with
+    # up to ADMISSION_MAX_QUEUED waiting; the rest get 429 and Retry-After
+    admission_enabled: bool = field(
+        default_factory=lambda: _env_bool("ADMISSION_ENABLED", True)
+    )
+    admission_user_rates: Dict[str, float] = field(
+        default_factory=lambda: _env_rates(
+            "ADMISSION_USER_RATES",
+            "admin=600,recruiter=120,candidate=30,anonymous=30",
+        )
+    )
+    admission_role_rates: Dict[str, float] = field(
+        default_factory=lambda: _env_rates(
+            "ADMISSION_ROLE_RATES",
+            "admin=1200,recruiter=1200,candidate=300,anonymous=300",
+        )
+    )
+    admission_burst_seconds: float = field(
+        default_factory=lambda: _env_float("ADMISSION_BURST_SECONDS", 10.0)
+    )
+    admission_max_in_flight: int = field(
+        default_factory=lambda: _env_int("ADMISSION_MAX_IN_FLIGHT", 16)
+    )
+    admission_max_queued: int = field(
+        default_factory=lambda: _env_int("ADMISSION_MAX_QUEUED", 32)
+    )
+    admission_queue_timeout_seconds: float = field(
+        default_factory=lambda: _env_float("ADMISSION_QUEUE_TIMEOUT_SECONDS", 10.0)
+    )
+
+    # Uploads are rejected once this many bytes have been streamed
+    max_upload_bytes: int = field(
+        default_factory=lambda: _env_int("MAX_UPLOAD_BYTES", 20 * 1024 * 1024)
+    )
+    upload_chunk_size: int = field(
+        default_factory=lambda: _env_int("UPLOAD_CHUNK_SIZE", 1024 * 1024)
+    )
+
+    # Worker pools used to keep blocking work off the event loop
+    extraction_workers: int = field(
+        default_factory=lambda: _env_int("EXTRACTION_WORKERS", 2)
+    )
+    llm_workers: int = field(default_factory=lambda: _env_int("LLM_WORKERS", 8))
+
+    # Limits for extraction child processes; a job over a limit has its
+    # process killed and replaced
+    extraction_timeout_seconds: float = field(
+        default_factory=lambda: _env_float("EXTRACTION_TIMEOUT_SECONDS", 30.0)
+    )
+    extraction_max_rss_mb: int = field(
+        default_factory=lambda: _env_int("EXTRACTION_MAX_RSS_MB", 512)
+    )
+    extraction_max_tasks_per_child: int = field(
+        default_factory=lambda: _env_int("EXTRACTION_MAX_TASKS_PER_CHILD", 100)
+    )
+
+    # PDF extraction: pages beyond the cap are ignored, the rest are split into
+    # ranges of this many pages per worker task
+    pdf_max_pages: int = field(default_factory=lambda: _env_int("PDF_MAX_PAGES", 50))
+    pdf_pages_per_task: int = field(
+        default_factory=lambda: _env_int("PDF_PAGES_PER_TASK", 4)
+    )
+    slow_page_seconds: float = field(
+        default_factory=lambda: _env_float("SLOW_PAGE_SECONDS", 1.0)
+    )
+
+    # Bulk ingestion emits a progress line after this many results
+    bulk_batch_size: int = field(
+        default_factory=lambda: _env_int("BULK_BATCH_SIZE", 100)
+    )
+
+    # Background parse jobs
+    parse_job_workers: int = field(
+        default_factory=lambda: _env_int("PARSE_JOB_WORKERS", 4)
+    )
+    parse_job_queue_size: int = field(
+        default_factory=lambda: _env_int("PARSE_JOB_QUEUE_SIZE", 1000)
+    )
+
+    # LLM provider ("gemini" or the offline "fake") and the limits the shared
+    # client applies to it
+    llm_provider: str = field(
+        default_factory=lambda: _env_str("LLM_PROVIDER", "gemini")
+    )
+    llm_model: str = field(
+        default_factory=lambda: _env_str("LLM_MODEL", "gemini-2.5-flash")
+    )
+    gemini_api_key: str | None = field(
+        default_factory=lambda: _env_optional_str("GEMINI_API_KEY")
+    )
+    llm_max_concurrency: int = field(
+        default_factory=lambda: _env_int("LLM_MAX_CONCURRENCY", 8)
+    )
+    llm_requests_per_minute: float = field(
+        default_factory=lambda: _env_float("LLM_REQUESTS_PER_MINUTE", 600)
+    )
+    llm_tokens_per_minute: float = field(
+        default_factory=lambda: _env_float("LLM_TOKENS_PER_MINUTE", 1_000_000)
+    )
+    llm_max_retries: int = field(default_factory=lambda: _env_int("LLM_MAX_RETRIES", 3))
+    llm_backoff_base_seconds: float = field(
+        default_factory=lambda: _env_float("LLM_BACKOFF_BASE_SECONDS", 0.5)
+    )
+    llm_backoff_max_seconds: float = field(
+        default_factory=lambda: _env_float("LLM_BACKOFF_MAX_SECONDS", 8.0)
+    )
+    fake_llm_latency_seconds: float = field(
+        default_factory=lambda: _env_float("FAKE_LLM_LATENCY_SECONDS", 0.5)
+    )
+    fake_llm_error_rate: float = field(
+        default_factory=lambda: _env_float("FAKE_LLM_ERROR_RATE", 0.0)
+    )
+
+    # Resume text is compacted and trimmed to this many tokens before prompting
+    prompt_max_tokens: int = field(
+        default_factory=lambda: _env_int("PROMPT_MAX_TOKENS", 8000)
+    )
+
+    # Sectioned extraction: resumes of at least this many (compacted) tokens
+    # are extracted with one concurrent prompt per section
+    llm_sectioned_extraction: bool = field(
+        default_factory=lambda: _env_bool("LLM_SECTIONED_EXTRACTION", False)
+    )
+    llm_sectioned_min_tokens: int = field(
+        default_factory=lambda: _env_int("LLM_SECTIONED_MIN_TOKENS", 1500)
+    )
+
+    # Serialize response envelopes with pydantic-core instead of
+    # jsonable_encoder + stdlib json
+    fast_response_encoding: bool = field(
+        default_factory=lambda: _env_bool("FAST_RESPONSE_ENCODING", True)
+    )
+
+    # BM25 parameters for job-description ranking
+    ranking_bm25_k1: float = field(
+        default_factory=lambda: _env_float("RANKING_BM25_K1", 1.2)
+    )
+    ranking_bm25_b: float = field(
+        default_factory=lambda: _env_float("RANKING_BM25_B", 0.75)
+    )
+
+    # Near-duplicate detection over extracted text (MinHash + LSH)
+    near_duplicate_enabled: bool = field(
+        default_factory=lambda: _env_bool("NEAR_DUPLICATE_ENABLED", True)
+    )
+    near_duplicate_threshold: float = field(
+        default_factory=lambda: _env_float("NEAR_DUPLICATE_THRESHOLD", 0.85)
+    )
+    near_duplicate_reuse_parse: bool = field(
+        default_factory=lambda: _env_bool("NEAR_DUPLICATE_REUSE_PARSE", True)
+    )
+    minhash_permutations: int = field(
+        default_factory=lambda: _env_int("MINHASH_PERMUTATIONS", 128)
+    )
+    minhash_bands: int = field(default_factory=lambda: _env_int("MINHASH_BANDS", 16))
+
+    # Rule-based fast path: fields answered with at least this confidence are
+    # not requested from the LLM
+    fast_path_enabled: bool = field(
+        default_factory=lambda: _env_bool("FAST_PATH_ENABLED", True)
+    )
+    fast_path_confidence: float = field(
+        default_factory=lambda: _env_float("FAST_PATH_CONFIDENCE", 0.9)
+    )
+    skills_vocabulary_path: str | None = field(
+        default_factory=lambda: _env_optional_str("SKILLS_VOCABULARY_PATH")
+    )
+
+    # LLM result cache; the disk tier is disabled unless a directory is set
+    llm_cache_max_bytes: int = field(
+        default_factory=lambda: _env_int("LLM_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+    )
+    llm_cache_dir: str | None = field(
+        default_factory=lambda: _env_optional_str("LLM_CACHE_DIR")
+    )
+
+    # Extracted text, stored per file content hash and extractor version so
+    # re-parses skip extraction (EXTRACTED_TEXT_DIR defaults to
+    # <MEDIA_PATH>/extracted_text)
+    extracted_text_enabled: bool = field(
+        default_factory=lambda: _env_bool("EXTRACTED_TEXT_ENABLED", True)
+    )
+    extracted_text_dir: str | None = field(
+        default_factory=lambda: _env_optional_str("EXTRACTED_TEXT_DIR")
+    )
+    extracted_text_max_bytes: int = field(
+        default_factory=lambda: _env_int("EXTRACTED_TEXT_MAX_BYTES", 1024 * 1024 * 1024)
+    )
+
+    # Prometheus metrics and the /metrics route
+    metrics_enabled: bool = field(
+        default_factory=lambda: _env_bool("METRICS_ENABLED", True)
+    )
+
+    # Request profiling; requests are profiled when they send the X-Profile
+    # header (equal to the token, when one is set) or are sampled
+    profiling_enabled: bool = field(
+        default_factory=lambda: _env_bool("PROFILING_ENABLED", False)
+    )
+    profiling_mode: str = field(
+        default_factory=lambda: _env_str("PROFILING_MODE", "cprofile")
+    )
+    profiling_sample_rate: float = field(
+        default_factory=lambda: _env_float("PROFILING_SAMPLE_RATE", 0.0)
+    )
+    profiling_token: str | None = field(
+        default_factory=lambda: _env_optional_str("PROFILING_TOKEN")
+    )
+    profiling_max_reports: int = field(
+        default_factory=lambda: _env_int("PROFILING_MAX_REPORTS", 100)
+    )
+    profiling_dir: str | None = field(
+        default_factory=lambda: _env_optional_str("PROFILING_DIR")
+    )
+
+    # When to import extraction backends and the LLM SDK: "eager" during
+    # startup, "background" right after it, or "none" (on first use)
+    warm_up: str = field(default_factory=lambda: _env_str("WARM_UP", "background"))
+
+    @classmethod
+    def from_env(cls) -> "AppConfig":
+        """Builds the configuration from the current environment."""
+        return cls()
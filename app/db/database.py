@@ -1,32 +1,385 @@
 """
-This module provides a simple in-memory database abstraction.
+This module provides the database interface and a simple in-memory
+implementation of it.
+
+Records are kept in per-table primary-key maps with optional secondary
+indexes. When a data directory is configured, every write is appended to a
+log and the tables are periodically snapshotted, so a restart replays the
+snapshot plus the log tail instead of starting empty.
+
+Periodic snapshots are written in a background thread: the write path only
+copies the tables and starts a new log under the lock, and the log of the
+writes being snapshotted is kept until the snapshot is on disk.
 """
-from typing import Any, Dict, List
+import json
+import logging
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEXES: Dict[str, List[str]] = {
+    "resumes": ["content_hash"],
+    "parsed_resumes": ["resume_id", "email"],
+    "parse_jobs": ["job_id"],
+}
+DEFAULT_UNIQUE_INDEXES: Dict[str, List[str]] = {
+    "users": ["email"],
+}
+
+_SNAPSHOT_FILE = "snapshot.json"
+_LOG_FILE = "wal.jsonl"
+# The log of the writes a snapshot in progress covers
+_ROTATED_LOG_FILE = "wal.jsonl.1"
+
+
+class DuplicateKeyError(Exception):
+    """Raised when a write would duplicate a value under a unique index."""
+
+    def __init__(self, table: str, field: str, value: Any):
+        super().__init__(f"Duplicate {table}.{field}: {value!r}")
+        self.table = table
+        self.field = field
+        self.value = value
+
+
+class BaseDatabase(ABC):
+    """
+    A store of JSON-like records in named tables, keyed by integer IDs that
+    increase in insertion order.
+    """
+
+    def _create_indexes(
+        self,
+        indexes: Dict[str, List[str]] | None,
+        unique_indexes: Dict[str, List[str]] | None,
+    ) -> None:
+        for table, fields in (indexes or DEFAULT_INDEXES).items():
+            for field in fields:
+                self.create_index(table, field)
+        for table, fields in (unique_indexes or DEFAULT_UNIQUE_INDEXES).items():
+            for field in fields:
+                self.create_index(table, field, unique=True)
+
+    @abstractmethod
+    def create_index(self, table: str, field: str, unique: bool = False) -> None:
+        """Declares a secondary index on a field and indexes existing records."""
+
+    @abstractmethod
+    def get_all(self, table: str) -> List[Dict[str, Any]]:
+        """Returns all records from a table, oldest first."""
+
+    @abstractmethod
+    def get_by_id(self, table: str, record_id: int) -> Dict[str, Any] | None:
+        """Returns a record by its ID."""
+
+    @abstractmethod
+    def find_by(self, table: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        """Returns records whose field equals value, oldest first."""
+
+    @abstractmethod
+    def records_after(self, table: str, record_id: int) -> List[Dict[str, Any]]:
+        """Returns records with an ID above ``record_id``, oldest first."""
+
+    @abstractmethod
+    def count(self, table: str) -> int:
+        """Returns the number of records in a table."""
+
+    @abstractmethod
+    def add(self, table: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Adds a new record to a table, setting its ``id``.
+
+        Raises:
+            DuplicateKeyError: If a unique index already holds the value
+        """
+
+    @abstractmethod
+    def add_many(
+        self, table: str, records: Iterable[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Adds several records to a table in one write."""
+
+    @abstractmethod
+    def snapshot(self) -> None:
+        """Makes the writes so far durable in the compact on-disk form."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Releases the underlying resources."""
 
 
-class Database:
-    """A simple in-memory database."""
+class Database(BaseDatabase):
+    """A simple in-memory database with primary-key and secondary indexes."""
 
-    def __init__(self):
-        self._data: Dict[str, List[Dict[str, Any]]] = {
-            "resumes": [],
-            "parsed_resumes": [],
+    def __init__(
+        self,
+        indexes: Dict[str, List[str]] | None = None,
+        data_dir: str | None = None,
+        snapshot_every: int = 1000,
+        unique_indexes: Dict[str, List[str]] | None = None,
+    ):
+        self._data: Dict[str, Dict[int, Dict[str, Any]]] = {
+            "resumes": {},
+            "parsed_resumes": {},
         }
+        self._next_ids: Dict[str, int] = {}
+        # table -> field -> value -> ids in insertion order
+        self._indexes: Dict[str, Dict[str, Dict[Any, List[int]]]] = {}
+        self._unique: Dict[str, List[str]] = {}
+        self._lock = threading.RLock()
+
+        self._data_dir = data_dir
+        self._snapshot_every = snapshot_every
+        self._writes_since_snapshot = 0
+        self._log = None
+        self._snapshot_executor: ThreadPoolExecutor | None = None
+        self._pending_snapshot: Future | None = None
+
+        self._create_indexes(indexes, unique_indexes)
+
+        if self._data_dir:
+            os.makedirs(self._data_dir, exist_ok=True)
+            self._load()
+            self._log = open(
+                os.path.join(self._data_dir, _LOG_FILE), "a", encoding="utf-8"
+            )
+
+    def create_index(self, table: str, field: str, unique: bool = False) -> None:
+        """Declares a secondary index on a field and indexes existing records."""
+        with self._lock:
+            if unique and field not in self._unique.setdefault(table, []):
+                self._unique[table].append(field)
+            table_indexes = self._indexes.setdefault(table, {})
+            if field in table_indexes:
+                return
+            index: Dict[Any, List[int]] = {}
+            for record_id, record in self._data.get(table, {}).items():
+                self._index_value(index, record.get(field), record_id)
+            table_indexes[field] = index
 
     def get_all(self, table: str) -> List[Dict[str, Any]]:
         """Returns all records from a table."""
-        return self._data.get(table, [])
+        with self._lock:
+            return list(self._data.get(table, {}).values())
 
     def get_by_id(self, table: str, record_id: int) -> Dict[str, Any] | None:
         """Returns a record by its ID."""
-        for record in self.get_all(table):
-            if record.get("id") == record_id:
-                return record
-        return None
+        return self._data.get(table, {}).get(record_id)
+
+    def find_by(self, table: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        """
+        Returns records whose field equals value, oldest first.
+
+        Uses the secondary index when one is declared and falls back to a scan
+        otherwise.
+        """
+        with self._lock:
+            rows = self._data.get(table, {})
+            index = self._indexes.get(table, {}).get(field)
+            if index is not None:
+                try:
+                    ids = index.get(value, [])
+                except TypeError:
+                    return []
+                return [rows[record_id] for record_id in ids]
+            return [record for record in rows.values() if record.get(field) == value]
+
+    def records_after(self, table: str, record_id: int) -> List[Dict[str, Any]]:
+        """Returns records with an ID above ``record_id``, oldest first."""
+        with self._lock:
+            rows = self._data.get(table, {})
+            next_id = self._next_ids.get(table, 1)
+            return [
+                rows[new_id]
+                for new_id in range(record_id + 1, next_id)
+                if new_id in rows
+            ]
+
+    def count(self, table: str) -> int:
+        """Returns the number of records in a table."""
+        return len(self._data.get(table, {}))
 
     def add(self, table: str, record: Dict[str, Any]) -> Dict[str, Any]:
-        """Adds a new record to a table."""
-        record_id = len(self.get_all(table)) + 1
-        record["id"] = record_id
-        self._data[table].append(record)
+        """
+        Adds a new record to a table.
+
+        Raises:
+            DuplicateKeyError: If a unique index already holds the value
+        """
+        with self._lock:
+            for field in self._unique.get(table, ()):
+                if self.find_by(table, field, record.get(field)):
+                    raise DuplicateKeyError(table, field, record.get(field))
+            record_id = self._next_ids.get(table, 1)
+            self._next_ids[table] = record_id + 1
+            record["id"] = record_id
+            self._insert(table, record)
+            self._append_log(table, record)
         return record
+
+    def add_many(
+        self, table: str, records: Iterable[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Adds several records to a table."""
+        with self._lock:
+            return [self.add(table, record) for record in records]
+
+    def snapshot(self) -> None:
+        """Writes all tables to disk and discards the write log they cover."""
+        if not self._data_dir:
+            return
+        with self._lock:
+            self._wait_for_snapshot()
+            self._write_snapshot(self._capture())
+
+    def close(self) -> None:
+        """Snapshots the tables and closes the write log."""
+        if self._log is None:
+            return
+        self.snapshot()
+        self._log.close()
+        self._log = None
+        if self._snapshot_executor is not None:
+            self._snapshot_executor.shutdown()
+            self._snapshot_executor = None
+
+    def _capture(self) -> Dict[str, Any]:
+        """
+        Copies the tables and starts a new write log.
+
+        The log so far is moved aside, to be removed once the copy is on
+        disk; until then a restart replays it after the previous snapshot.
+        """
+        with self._lock:
+            state = {
+                "next_ids": dict(self._next_ids),
+                "tables": {
+                    table: [dict(record) for record in rows.values()]
+                    for table, rows in self._data.items()
+                },
+            }
+            if self._log is not None:
+                self._log.close()
+                log_path = os.path.join(self._data_dir, _LOG_FILE)
+                rotated_path = os.path.join(self._data_dir, _ROTATED_LOG_FILE)
+                if os.path.exists(rotated_path):
+                    # An earlier snapshot failed; its log is still needed
+                    with open(log_path, "r", encoding="utf-8") as src, open(
+                        rotated_path, "a", encoding="utf-8"
+                    ) as dst:
+                        dst.write(src.read())
+                    os.remove(log_path)
+                else:
+                    os.replace(log_path, rotated_path)
+                self._log = open(log_path, "a", encoding="utf-8")
+            self._writes_since_snapshot = 0
+        return state
+
+    def _write_snapshot(self, state: Dict[str, Any]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self._data_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self._data_dir, _SNAPSHOT_FILE))
+        rotated_path = os.path.join(self._data_dir, _ROTATED_LOG_FILE)
+        if os.path.exists(rotated_path):
+            os.remove(rotated_path)
+
+    def _start_snapshot(self) -> None:
+        """Snapshots in the background, unless a snapshot is already running."""
+        if self._pending_snapshot is not None and not self._pending_snapshot.done():
+            return
+        if self._snapshot_executor is None:
+            self._snapshot_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="db-snapshot"
+            )
+        future = self._snapshot_executor.submit(self._write_snapshot, self._capture())
+        future.add_done_callback(self._log_snapshot_error)
+        self._pending_snapshot = future
+
+    @staticmethod
+    def _log_snapshot_error(future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Background snapshot failed: {error}")
+
+    def _wait_for_snapshot(self) -> None:
+        if self._pending_snapshot is not None:
+            try:
+                self._pending_snapshot.result()
+            except Exception:
+                # Already logged; the synchronous snapshot retries it
+                pass
+            self._pending_snapshot = None
+
+    def _insert(self, table: str, record: Dict[str, Any]) -> None:
+        record_id = record["id"]
+        self._data.setdefault(table, {})[record_id] = record
+        for field, index in self._indexes.get(table, {}).items():
+            self._index_value(index, record.get(field), record_id)
+
+    @staticmethod
+    def _index_value(index: Dict[Any, List[int]], value: Any, record_id: int):
+        if value is None:
+            return
+        try:
+            index.setdefault(value, []).append(record_id)
+        except TypeError:
+            # Unhashable values (lists, dicts) are not indexable
+            pass
+
+    def _append_log(self, table: str, record: Dict[str, Any]) -> None:
+        if self._log is None:
+            return
+        entry = {"op": "add", "table": table, "record": record}
+        self._log.write(json.dumps(entry, separators=(",", ":"), default=str))
+        self._log.write("\n")
+        self._log.flush()
+
+        self._writes_since_snapshot += 1
+        if self._writes_since_snapshot >= self._snapshot_every:
+            self._start_snapshot()
+
+    def _load(self) -> None:
+        snapshot_path = os.path.join(self._data_dir, _SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self._next_ids = {k: int(v) for k, v in state["next_ids"].items()}
+            for table, records in state["tables"].items():
+                for record in records:
+                    self._insert(table, record)
+
+        replayed = 0
+        for name in (_ROTATED_LOG_FILE, _LOG_FILE):
+            replayed += self._replay(os.path.join(self._data_dir, name))
+        if replayed:
+            logger.info(f"Replayed {replayed} write log entries")
+
+    def _replay(self, log_path: str) -> int:
+        if not os.path.exists(log_path):
+            return 0
+        replayed = 0
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-write
+                    logger.warning("Skipping corrupt write log entry")
+                    continue
+                table, record = entry["table"], entry["record"]
+                if record["id"] in self._data.get(table, {}):
+                    continue
+                self._insert(table, record)
+                self._next_ids[table] = max(
+                    self._next_ids.get(table, 1), record["id"] + 1
+                )
+                replayed += 1
+        return replayed
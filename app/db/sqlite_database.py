@@ -0,0 +1,258 @@
+"""
+This module provides a database backed by a single SQLite file.
+
+Several server processes can open the same file: SQLite's write-ahead log
+lets readers proceed while one writer commits, so every worker sees the same
+resumes, parses and users. Each table stores records as JSON next to an
+integer primary key, and secondary indexes are expression indexes over
+``json_extract``. Connections are pooled, every statement text is built once
+per table so that ``sqlite3``'s per-connection statement cache reuses the
+prepared statement, and ``add_many`` writes a batch in one transaction.
+"""
+import json
+import logging
+import queue
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+from app.db.database import BaseDatabase, DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_SCALARS = (str, int, float, bool)
+
+
+def _check_name(name: str) -> str:
+    """Table and field names are interpolated into SQL, so only identifiers."""
+    if not _NAME.match(name):
+        raise ValueError(f"Invalid table or field name: {name!r}")
+    return name
+
+
+def _encode(record: Dict[str, Any]) -> str:
+    data = {key: value for key, value in record.items() if key != "id"}
+    return json.dumps(data, separators=(",", ":"), default=str)
+
+
+def _decode(record_id: int, data: str) -> Dict[str, Any]:
+    record = json.loads(data)
+    record["id"] = record_id
+    return record
+
+
+class SQLiteDatabase(BaseDatabase):
+    """A SQLite database in WAL mode, shareable between processes."""
+
+    def __init__(
+        self,
+        path: str,
+        indexes: Dict[str, List[str]] | None = None,
+        unique_indexes: Dict[str, List[str]] | None = None,
+        pool_size: int = 4,
+        busy_timeout_seconds: float = 5.0,
+    ):
+        self.path = path
+        self._busy_timeout_seconds = busy_timeout_seconds
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._connections: List[sqlite3.Connection] = []
+        for _ in range(pool_size):
+            connection = self._connect()
+            self._connections.append(connection)
+            self._pool.put(connection)
+
+        self._tables: Set[str] = set()
+        self._unique: Dict[str, List[str]] = {}
+        self._sql: Dict[Tuple[str, ...], str] = {}
+        self._lock = threading.Lock()
+        self._create_indexes(indexes, unique_indexes)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path,
+            timeout=self._busy_timeout_seconds,
+            # Transactions are opened explicitly around batched writes
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL is still safe against corruption; only the last
+        # commits before a power loss can be lost
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self._pool.get()
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
+    def _statement(self, kind: str, table: str, field: str = "") -> str:
+        """Returns the SQL for one operation, built once per table and field."""
+        key = (kind, table, field)
+        sql = self._sql.get(key)
+        if sql is not None:
+            return sql
+        column = f"json_extract(data, '$.{field}')"
+        sql = {
+            "insert": f'INSERT INTO "{table}" (data) VALUES (?)',
+            "get_by_id": f'SELECT id, data FROM "{table}" WHERE id = ?',
+            "get_all": f'SELECT id, data FROM "{table}" ORDER BY id',
+            "find_by": (
+                f'SELECT id, data FROM "{table}" WHERE {column} = ? ORDER BY id'
+            ),
+            "after": f'SELECT id, data FROM "{table}" WHERE id > ? ORDER BY id',
+            "count": f'SELECT COUNT(*) FROM "{table}"',
+        }[kind]
+        self._sql[key] = sql
+        return sql
+
+    def _ensure_table(self, connection: sqlite3.Connection, table: str) -> None:
+        if table in self._tables:
+            return
+        _check_name(table)
+        with self._lock:
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS "{table}" '
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL)"
+            )
+            self._tables.add(table)
+
+    def create_index(self, table: str, field: str, unique: bool = False) -> None:
+        """Declares a secondary index on a field and indexes existing records."""
+        _check_name(field)
+        with self._connection() as connection:
+            self._ensure_table(connection, table)
+            prefix = "ux" if unique else "ix"
+            connection.execute(
+                f'CREATE {"UNIQUE " if unique else ""}INDEX IF NOT EXISTS '
+                f'"{prefix}_{table}_{field}" ON "{table}" '
+                f"(json_extract(data, '$.{field}'))"
+            )
+        if unique:
+            with self._lock:
+                fields = self._unique.setdefault(table, [])
+                if field not in fields:
+                    fields.append(field)
+
+    def _select(self, table: str, sql: str, *params) -> List[Dict[str, Any]]:
+        with self._connection() as connection:
+            self._ensure_table(connection, table)
+            rows = connection.execute(sql, params).fetchall()
+        return [_decode(record_id, data) for record_id, data in rows]
+
+    def get_all(self, table: str) -> List[Dict[str, Any]]:
+        """Returns all records from a table, oldest first."""
+        return self._select(table, self._statement("get_all", table))
+
+    def get_by_id(self, table: str, record_id: int) -> Dict[str, Any] | None:
+        """Returns a record by its ID."""
+        rows = self._select(table, self._statement("get_by_id", table), record_id)
+        return rows[0] if rows else None
+
+    def find_by(self, table: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        """
+        Returns records whose field equals value, oldest first.
+
+        Fields without a declared index are matched by a table scan.
+        """
+        if not isinstance(value, _SCALARS):
+            # None never matches, and lists or dicts are not indexable
+            return []
+        _check_name(field)
+        return self._select(table, self._statement("find_by", table, field), value)
+
+    def records_after(self, table: str, record_id: int) -> List[Dict[str, Any]]:
+        """Returns records with an ID above ``record_id``, oldest first."""
+        return self._select(table, self._statement("after", table), record_id)
+
+    def count(self, table: str) -> int:
+        """Returns the number of records in a table."""
+        with self._connection() as connection:
+            self._ensure_table(connection, table)
+            return connection.execute(self._statement("count", table)).fetchone()[0]
+
+    def add(self, table: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Adds a new record to a table.
+
+        Raises:
+            DuplicateKeyError: If a unique index already holds the value
+        """
+        return self.add_many(table, [record])[0]
+
+    def add_many(
+        self, table: str, records: Iterable[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Adds several records to a table in one transaction, so the batch costs
+        a single commit. Either every record is written or none is.
+
+        Raises:
+            DuplicateKeyError: If a unique index already holds a value
+        """
+        records = list(records)
+        sql = self._statement("insert", table)
+        with self._connection() as connection:
+            self._ensure_table(connection, table)
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                ids = [
+                    connection.execute(sql, (_encode(record),)).lastrowid
+                    for record in records
+                ]
+                connection.execute("COMMIT")
+            except sqlite3.IntegrityError:
+                connection.execute("ROLLBACK")
+                # Looked up on the held connection: taking a second one from
+                # the pool here would deadlock once the pool is exhausted
+                raise self._duplicate_key_error(connection, table, records)
+            except BaseException:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise
+        for record, record_id in zip(records, ids):
+            record["id"] = record_id
+        return records
+
+    def _duplicate_key_error(
+        self,
+        connection: sqlite3.Connection,
+        table: str,
+        records: List[Dict[str, Any]],
+    ) -> DuplicateKeyError:
+        """Finds which unique value made a batch fail."""
+        for field in self._unique.get(table, ()):
+            sql = self._statement("find_by", table, field)
+            seen = set()
+            for record in records:
+                value = record.get(field)
+                if not isinstance(value, _SCALARS):
+                    continue
+                if value in seen or connection.execute(sql, (value,)).fetchone():
+                    return DuplicateKeyError(table, field, value)
+                seen.add(value)
+        return DuplicateKeyError(table, "?", None)
+
+    def snapshot(self) -> None:
+        """Copies the write-ahead log back into the database file."""
+        with self._connection() as connection:
+            connection.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def close(self) -> None:
+        """Checkpoints the write-ahead log and closes every connection."""
+        if not self._connections:
+            return
+        try:
+            self.snapshot()
+        except sqlite3.Error as e:
+            logger.warning(f"WAL checkpoint on close failed: {e}")
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
@@ -1,7 +1,8 @@
-from fastapi import Request
+from fastapi import Request, status
 from fastapi.responses import JSONResponse
 
-from app.exceptions.exceptions import ResumeProcessingError
+from app.api.base_components import Response
+from app.exceptions.exceptions import AuthenticationError, ResumeProcessingError
 
 
 async def resume_processing_exception_handler(
@@ -11,3 +12,13 @@ async def resume_processing_exception_handler(
         status_code=exc.status_code,
         content={"message": exc.message, "error_code": exc.status_code},
     )
+
+
+async def authentication_exception_handler(request: Request, exc: AuthenticationError):
+    response = Response(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        message=exc.message,
+        error_code=1003,
+    )
+    response.headers["WWW-Authenticate"] = "Bearer"
+    return response
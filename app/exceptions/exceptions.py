@@ -24,3 +24,21 @@ class ParsingError(ResumeProcessingError):
 
     def __init__(self, message: str = "Failed to parse resume"):
         super().__init__(message, status_code=500)
+
+
+class FileTooLargeError(ResumeProcessingError):
+    """Exception raised for uploads exceeding the configured size limit."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(
+            f"File exceeds the maximum upload size of {max_bytes} bytes",
+            status_code=413,
+        )
+
+
+class AuthenticationError(Exception):
+    """Exception raised for requests without a valid access token."""
+
+    def __init__(self, message: str = "Not authenticated"):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,263 @@
+"""
+This module provides admission control for the expensive resume routes.
+
+Every request to a guarded route is charged against two token buckets: one
+for the caller (keyed by the user ID in their access token, or by client
+address without one), refilled at the rate configured for their role, and
+one shared by everyone with that role. Synchronous parses additionally take
+one of a fixed number of in-flight slots; when all are taken a bounded number
+of requests wait for one, and any beyond that are shed at once. Rejected
+requests get a 429 with a ``Retry-After`` estimate, so overload turns into
+fast refusals instead of an ever-growing backlog of LLM calls.
+
+Limits are per process; with several workers each enforces its own.
+"""
+import asyncio
+import math
+import re
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Pattern, Tuple
+
+from app.utils.metrics import ADMISSION_REQUESTS
+from app.utils.rate_limiter import TokenBucket
+from app.utils.security import InvalidTokenError, TokenManager
+
+ANONYMOUS_ROLE = "anonymous"
+
+# Error codes of rejected requests
+QUOTA_EXCEEDED = 4001
+OVERLOADED = 4002
+
+# Longest Retry-After sent, also the one for quotas that never refill
+MAX_RETRY_AFTER_SECONDS = 3600
+
+
+@dataclass(frozen=True)
+class AdmissionRule:
+    """A guarded route; ``in_flight`` routes also take an in-flight slot."""
+
+    name: str
+    method: str
+    pattern: Pattern[str]
+    in_flight: bool = False
+
+
+DEFAULT_RULES = [
+    AdmissionRule(
+        "parse",
+        "POST",
+        re.compile(r"^/api/v\d+/resumes/\d+/parse(/stream)?$"),
+        in_flight=True,
+    ),
+    AdmissionRule("parse_job", "POST", re.compile(r"^/api/v\d+/resumes/\d+/jobs$")),
+    AdmissionRule("bulk", "POST", re.compile(r"^/api/v\d+/resumes/bulk$")),
+]
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed; carries its error code and Retry-After."""
+
+    def __init__(self, message: str, error_code: int, retry_after: float):
+        self.message = message
+        self.error_code = error_code
+        # Whole seconds, as the header requires, and never zero
+        self.retry_after = max(1, math.ceil(min(retry_after, MAX_RETRY_AFTER_SECONDS)))
+        super().__init__(message)
+
+
+def _refund(*buckets: TokenBucket | None) -> None:
+    """Returns the quota of a request that was never served."""
+    for bucket in buckets:
+        if bucket is not None:
+            bucket.consume(-1)
+
+
+class AdmissionController:
+    """
+    Per-user and per-role quotas plus an in-flight limit with a bounded wait
+    queue for the routes in ``rules``. Requests shed after being charged, by
+    a queue timeout, have their quota refunded.
+
+    ``user_rates`` and ``role_rates`` are requests per minute by role; roles
+    missing from ``role_rates`` have no shared limit, and callers whose role
+    is missing from ``user_rates`` use the anonymous rate. A rate of zero
+    rejects every request. Buckets hold ``burst_seconds`` worth of requests.
+    """
+
+    def __init__(
+        self,
+        token_manager: TokenManager | None,
+        user_rates: Dict[str, float],
+        role_rates: Dict[str, float],
+        max_in_flight: int,
+        max_queued: int,
+        queue_timeout_seconds: float,
+        burst_seconds: float = 10.0,
+        max_tracked_users: int = 10000,
+        rules: List[AdmissionRule] | None = None,
+    ):
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.max_tracked_users = max_tracked_users
+        self._token_manager = token_manager
+        self._user_rates = user_rates
+        self._burst_seconds = burst_seconds
+        self._role_buckets = {
+            role: self._bucket(rate) for role, rate in role_rates.items()
+        }
+        self._user_buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self.in_flight = 0
+        self.queued = 0
+        # Moving average of how long a request holds a slot, for Retry-After
+        self._hold_seconds = 1.0
+
+    def _bucket(self, per_minute: float) -> TokenBucket:
+        if per_minute <= 0:
+            # An empty bucket that never refills
+            return TokenBucket(0.0, capacity=0.0)
+        rate = per_minute / 60
+        return TokenBucket(rate, capacity=max(1.0, rate * self._burst_seconds))
+
+    def match(self, method: str, path: str) -> AdmissionRule | None:
+        for rule in self.rules:
+            if rule.method == method and rule.pattern.match(path):
+                return rule
+        return None
+
+    def identify(self, authorization: str | None, client: str) -> Tuple[str, str]:
+        """
+        Returns the caller's quota key and role.
+
+        Callers without a valid token are limited by address, as anonymous.
+        Routes that require a token still reject them afterwards.
+        """
+        if authorization and self._token_manager is not None:
+            scheme, _, token = authorization.partition(" ")
+            if scheme.lower() == "bearer" and token:
+                try:
+                    claims = self._token_manager.verify(token)
+                except InvalidTokenError:
+                    pass
+                else:
+                    return f"user:{claims['uid']}", claims["role"]
+        return f"client:{client}", ANONYMOUS_ROLE
+
+    def _user_bucket(self, key: str, role: str) -> TokenBucket | None:
+        bucket = self._user_buckets.get(key)
+        if bucket is None:
+            rate = self._user_rates.get(role, self._user_rates.get(ANONYMOUS_ROLE))
+            if rate is None:
+                return None
+            bucket = self._bucket(rate)
+            self._user_buckets[key] = bucket
+            if len(self._user_buckets) > self.max_tracked_users:
+                # The least recently seen caller starts over with a full bucket
+                self._user_buckets.popitem(last=False)
+        else:
+            self._user_buckets.move_to_end(key)
+        return bucket
+
+    def _reject(
+        self,
+        rule: AdmissionRule,
+        outcome: str,
+        message: str,
+        error_code: int,
+        retry_after: float,
+    ) -> AdmissionRejected:
+        ADMISSION_REQUESTS.labels(rule.name, outcome).inc()
+        return AdmissionRejected(message, error_code, retry_after)
+
+    @asynccontextmanager
+    async def admit(
+        self, rule: AdmissionRule, key: str, role: str
+    ) -> AsyncIterator[None]:
+        """
+        Holds the request's admission for the duration of the block.
+
+        Raises:
+            AdmissionRejected: If a quota is exhausted or the queue is full
+        """
+        if rule.in_flight and self._slots.locked() and self.queued >= self.max_queued:
+            # Checked before charging the quotas, so shed requests cost nothing
+            raise self._reject(
+                rule, "shed_queue_full", "Server is busy", OVERLOADED, self._drain()
+            )
+
+        role_bucket = self._role_buckets.get(role)
+        if role_bucket is not None:
+            wait = role_bucket.try_acquire()
+            if wait > 0:
+                raise self._reject(
+                    rule, "shed_role_quota", "Rate limit exceeded", QUOTA_EXCEEDED, wait
+                )
+        user_bucket = self._user_bucket(key, role)
+        wait = user_bucket.try_acquire() if user_bucket is not None else 0.0
+        if wait > 0:
+            # Refund the shared quota the request did not use
+            _refund(role_bucket)
+            raise self._reject(
+                rule, "shed_user_quota", "Rate limit exceeded", QUOTA_EXCEEDED, wait
+            )
+
+        if not rule.in_flight:
+            ADMISSION_REQUESTS.labels(rule.name, "admitted").inc()
+            yield
+            return
+
+        if not self._slots.locked():
+            # A free slot is taken without suspending, so nothing can change
+            # between the queue check above and here
+            await self._slots.acquire()
+        else:
+            self.queued += 1
+            try:
+                await asyncio.wait_for(
+                    self._slots.acquire(), timeout=self.queue_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                _refund(role_bucket, user_bucket)
+                raise self._reject(
+                    rule,
+                    "shed_queue_timeout",
+                    "Server is busy",
+                    OVERLOADED,
+                    self._drain(),
+                )
+            except asyncio.CancelledError:
+                # The client went away while queued
+                _refund(role_bucket, user_bucket)
+                raise
+            finally:
+                self.queued -= 1
+
+        ADMISSION_REQUESTS.labels(rule.name, "admitted").inc()
+        self.in_flight += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+            held = time.monotonic() - started
+            self._hold_seconds += 0.2 * (held - self._hold_seconds)
+
+    def _drain(self) -> float:
+        """Estimated seconds until the current queue has been served."""
+        return (self.queued + 1) * self._hold_seconds / self.max_in_flight
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_in_flight": self.max_in_flight,
+            "max_queued": self.max_queued,
+            "tracked_users": len(self._user_buckets),
+            "hold_seconds": round(self._hold_seconds, 4),
+        }
@@ -0,0 +1,79 @@
+"""
+This module provides bounded worker pools for running blocking work off the
+event loop.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Sequence
+
+from app.utils.extraction_sandbox import ExtractionSandbox
+from app.utils.profiler import current_profile, profiled_call
+
+
+class WorkerPools:
+    """
+    Holds an extraction sandbox for CPU-bound work (text extraction) and a
+    thread pool for blocking I/O (LLM calls).
+
+    Child processes and threads are created lazily so that importing the
+    application does not fork.
+    """
+
+    def __init__(
+        self,
+        cpu_workers: int,
+        io_workers: int,
+        cpu_timeout_seconds: float = 30.0,
+        cpu_max_rss_bytes: int | None = None,
+        cpu_max_tasks_per_child: int = 100,
+        cpu_warm_up_modules: Sequence[str] = (),
+    ):
+        self.cpu_workers = cpu_workers
+        self.io_workers = io_workers
+        self.sandbox = ExtractionSandbox(
+            workers=cpu_workers,
+            timeout_seconds=cpu_timeout_seconds,
+            max_rss_bytes=cpu_max_rss_bytes,
+            max_tasks_per_child=cpu_max_tasks_per_child,
+            warm_up_modules=cpu_warm_up_modules,
+        )
+        self._thread_pool: ThreadPoolExecutor | None = None
+
+    @property
+    def thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.io_workers, thread_name_prefix="io-worker"
+            )
+        return self._thread_pool
+
+    async def run_cpu(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Runs a picklable callable in the extraction sandbox.
+
+        Raises:
+            FileTypeError: If the file is not a valid document of its type
+            ParsingError: If the callable fails or exceeds a sandbox limit
+        """
+        profile = current_profile.get()
+        if profile is None:
+            return await self.sandbox.run_async(func, *args)
+        # The request is being profiled; profile the child's work too
+        result, stats = await self.sandbox.run_async(profiled_call, func, *args)
+        profile.add_sandbox_stats(stats)
+        return result
+
+    async def run_io(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Runs a blocking callable in the thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.thread_pool, partial(func, *args, **kwargs)
+        )
+
+    def shutdown(self) -> None:
+        """Shuts down the sandbox and the thread pool."""
+        self.sandbox.shutdown()
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
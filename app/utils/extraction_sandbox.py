@@ -0,0 +1,246 @@
+"""
+This module provides an isolated process pool for text extraction.
+
+Each job runs in a child process that is killed and replaced when it exceeds
+its wall-clock timeout or resident memory limit, and recycled after a fixed
+number of tasks, so a malformed file cannot hang or bloat the API worker.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Sequence
+
+from app.exceptions.exceptions import FileTypeError, ParsingError
+from app.utils.registry import warm_up_modules
+
+logger = logging.getLogger(__name__)
+
+# Errors raised by pdfplumber/pdfminer and python-docx when the file content
+# is not a valid document of the declared type.
+_INVALID_FILE_ERRORS = {
+    "BadZipFile",
+    "PackageNotFoundError",
+    "PdfminerException",
+    "PDFSyntaxError",
+    "PSEOF",
+}
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _worker_main(conn, warm_up: Sequence[str] = ()) -> None:
+    # Import extraction backends before the first job rather than during it
+    warm_up_modules(warm_up)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+
+        func, args = job
+        try:
+            conn.send(("ok", func(*args)))
+        except Exception as e:
+            conn.send(("error", type(e).__name__, str(e)))
+
+
+def _rss_bytes(pid: int) -> int | None:
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        # Not Linux, or the process already exited
+        return None
+
+
+class _Worker:
+    def __init__(self, context, warm_up: Sequence[str] = ()):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, tuple(warm_up)), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.conn.close()
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ExtractionSandbox:
+    """Runs picklable callables in recycled, resource-limited child processes."""
+
+    def __init__(
+        self,
+        workers: int,
+        timeout_seconds: float,
+        max_rss_bytes: int | None,
+        max_tasks_per_child: int,
+        poll_interval: float = 0.05,
+        warm_up_modules: Sequence[str] = (),
+    ):
+        self.workers = workers
+        self.timeout_seconds = timeout_seconds
+        self.max_rss_bytes = max_rss_bytes
+        self.max_tasks_per_child = max_tasks_per_child
+        self.poll_interval = poll_interval
+        self.warm_up_modules = tuple(warm_up_modules)
+
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        # One waiting thread per child process
+        self._threads = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="extraction-sandbox"
+        )
+
+        self.timeouts = 0
+        self.memory_kills = 0
+        self.crashes = 0
+        self.recycled = 0
+
+    async def run_async(self, func: Callable[..., Any], *args) -> Any:
+        """Runs ``func(*args)`` in a child process without blocking the loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._threads, partial(self.run, func, *args))
+
+    def run(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Runs ``func(*args)`` in a child process and waits for the result.
+
+        Raises:
+            FileTypeError: If the file is not a valid document of its type
+            ParsingError: If extraction fails or exceeds a resource limit
+        """
+        worker = self._acquire()
+        healthy = False
+        try:
+            try:
+                worker.conn.send((func, args))
+            except OSError:
+                self.crashes += 1
+                raise ParsingError("Extraction worker crashed")
+            worker.tasks += 1
+            result = self._wait(worker)
+            healthy = True
+        finally:
+            self._release(worker, healthy)
+
+        if result[0] == "ok":
+            return result[1]
+
+        _, error_type, message = result
+        if error_type in _INVALID_FILE_ERRORS:
+            raise FileTypeError(f"File content is not a valid document: {message}")
+        raise ParsingError(f"Failed to extract text: {message}")
+
+    def _wait(self, worker: _Worker) -> tuple:
+        deadline = time.monotonic() + self.timeout_seconds
+        pid = worker.process.pid
+        while True:
+            try:
+                if worker.conn.poll(self.poll_interval):
+                    return worker.conn.recv()
+            except (EOFError, OSError):
+                self.crashes += 1
+                raise ParsingError("Extraction worker crashed")
+
+            if not worker.process.is_alive():
+                self.crashes += 1
+                raise ParsingError("Extraction worker crashed")
+
+            if time.monotonic() > deadline:
+                self.timeouts += 1
+                logger.warning(f"Extraction in worker {pid} timed out, killing it")
+                raise ParsingError(
+                    f"Extraction timed out after {self.timeout_seconds}s"
+                )
+
+            if self.max_rss_bytes is not None:
+                rss = _rss_bytes(pid)
+                if rss is not None and rss > self.max_rss_bytes:
+                    self.memory_kills += 1
+                    logger.warning(
+                        f"Extraction worker {pid} exceeded memory limit "
+                        f"({rss} bytes), killing it"
+                    )
+                    raise ParsingError("Extraction exceeded the memory limit")
+
+    def _acquire(self) -> _Worker:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.workers:
+                self._created += 1
+                return _Worker(self._context, self.warm_up_modules)
+        return self._idle.get()
+
+    def _release(self, worker: _Worker, healthy: bool) -> None:
+        if self._closed:
+            worker.kill()
+            return
+
+        if healthy and worker.tasks < self.max_tasks_per_child:
+            self._idle.put(worker)
+            return
+
+        if healthy:
+            self.recycled += 1
+            worker.stop()
+        else:
+            worker.kill()
+        # Start the replacement right away so it is warm for the next job
+        self._idle.put(_Worker(self._context, self.warm_up_modules))
+
+    def start(self) -> None:
+        """Starts every child process now instead of on first use."""
+        with self._lock:
+            while self._created < self.workers and not self._closed:
+                self._created += 1
+                self._idle.put(_Worker(self._context, self.warm_up_modules))
+
+    def stats(self) -> dict:
+        return {
+            "workers": self._created,
+            "timeouts": self.timeouts,
+            "memory_kills": self.memory_kills,
+            "crashes": self.crashes,
+            "recycled": self.recycled,
+        }
+
+    def shutdown(self) -> None:
+        """Stops all idle child processes; busy ones are killed on release."""
+        self._closed = True
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._created = 0
@@ -1,26 +1,122 @@
 """
 This module provides utilities for extracting text from different file formats.
+
+pdfplumber and python-docx are imported on first use, so a process only
+loads the backends for the formats it actually extracts. ``EXTRACTORS`` maps
+each supported content type to its extractor.
 """
-import docx
-import pdfplumber
+import sys
+import time
+from functools import lru_cache
+from importlib import metadata
+from typing import List, NamedTuple
+
+from app.utils.registry import LazyRegistry, timed_import
+
+PDF_CONTENT_TYPE = "application/pdf"
+DOCX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+)
+TXT_CONTENT_TYPE = "text/plain"
+
+# Bump an entry whenever that extractor's output changes, so text stored by
+# the previous version is extracted again
+EXTRACTOR_VERSIONS = {
+    PDF_CONTENT_TYPE: "2",
+    DOCX_CONTENT_TYPE: "1",
+    TXT_CONTENT_TYPE: "1",
+}
+# Separates the pages of extracted PDF text
+PAGE_BREAK = "\f"
+_BACKEND_DISTRIBUTIONS = {
+    PDF_CONTENT_TYPE: "pdfplumber",
+    DOCX_CONTENT_TYPE: "python-docx",
+}
+
+
+class PageText(NamedTuple):
+    page_number: int
+    text: str
+    seconds: float
 
 
 def extract_text_from_docx(file_path: str) -> str:
     """Extracts text from a DOCX file."""
-    doc = docx.Document(file_path)
+    doc = timed_import("docx").Document(file_path)
     return "\n".join([paragraph.text for paragraph in doc.paragraphs])
 
 
-def extract_text_from_pdf(file_path: str) -> str:
+def count_pdf_pages(file_path: str) -> int:
+    """Returns the number of pages in a PDF file."""
+    with timed_import("pdfplumber").open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_pdf_pages(file_path: str, start: int, stop: int) -> List[PageText]:
+    """
+    Extracts text from pages ``start`` (inclusive) to ``stop`` (exclusive) of a
+    PDF file, timing each page.
+    """
+    pages = []
+    with timed_import("pdfplumber").open(file_path) as pdf:
+        for page_number in range(start, min(stop, len(pdf.pages))):
+            page_start = time.perf_counter()
+            page = pdf.pages[page_number]
+            # extract_text returns None for pages without a text layer; the
+            # page cache is flushed so long documents do not accumulate objects
+            text = page.extract_text() or ""
+            page.flush_cache()
+            pages.append(
+                PageText(page_number + 1, text, time.perf_counter() - page_start)
+            )
+    return pages
+
+
+def join_pages(pages: List[PageText]) -> str:
+    """
+    Joins extracted pages into a single document, separated by form feeds so
+    later steps can tell where each page starts.
+    """
+    return PAGE_BREAK.join([f"{page.text}\n" for page in pages])
+
+
+def extract_text_from_pdf(file_path: str, max_pages: int | None = None) -> str:
     """Extracts text from a PDF file."""
-    text = ""
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() + "\n"
-    return text
+    stop = max_pages if max_pages is not None else sys.maxsize
+    return join_pages(extract_pdf_pages(file_path, 0, stop))
 
 
 def extract_text_from_txt(file_path: str) -> str:
     """Extracts text from a TXT file."""
     with open(file_path, "r", encoding="utf-8") as f:
         return f.read()
+
+
+EXTRACTORS = LazyRegistry("extractor")
+EXTRACTORS.register(
+    PDF_CONTENT_TYPE,
+    "app.utils.file_extractor:extract_text_from_pdf",
+    backends=["pdfplumber"],
+)
+EXTRACTORS.register(
+    DOCX_CONTENT_TYPE,
+    "app.utils.file_extractor:extract_text_from_docx",
+    backends=["docx"],
+)
+EXTRACTORS.register(TXT_CONTENT_TYPE, "app.utils.file_extractor:extract_text_from_txt")
+
+
+@lru_cache(maxsize=None)
+def extractor_version(content_type: str) -> str:
+    """
+    Identifies the extractor for a content type, including the installed
+    version of its backend (read from package metadata, without importing it).
+    """
+    version = EXTRACTOR_VERSIONS[content_type]
+    distribution = _BACKEND_DISTRIBUTIONS.get(content_type)
+    if distribution is None:
+        return version
+    try:
+        return f"{version}+{distribution}-{metadata.version(distribution)}"
+    except metadata.PackageNotFoundError:
+        return version
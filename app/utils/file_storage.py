@@ -0,0 +1,149 @@
+"""
+This module provides content-addressed storage for uploaded files.
+"""
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO, Tuple
+
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartParser
+from starlette.requests import Request
+
+from app.exceptions.exceptions import FileTooLargeError
+
+# Allowance for the multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+def _remove_if_exists(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+
+
+@dataclass
+class StoredFile:
+    content_hash: str
+    size: int
+    path: str
+    deduplicated: bool
+
+
+class ContentAddressedStorage:
+    """
+    Stores files under the SHA-256 of their content, sharded into two levels
+    of directories (``ab/cd/abcd...``) so no directory grows unbounded.
+
+    Files are streamed to a temporary file in chunks while being hashed, then
+    moved into place. Content that is already stored is not written again.
+    """
+
+    def __init__(self, root: str, max_bytes: int, chunk_size: int = 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self._tmp_dir = os.path.join(root, "tmp")
+
+    def path_for(self, content_hash: str) -> str:
+        return os.path.join(
+            self.root, content_hash[:2], content_hash[2:4], content_hash
+        )
+
+    async def receive_upload(
+        self, request: Request, field: str = "file"
+    ) -> UploadFile | None:
+        """
+        Parses a multipart request body, rejecting bodies over ``max_bytes``
+        before they are received: up front from ``Content-Length`` when the
+        client sends it, otherwise on the chunk that crosses the limit.
+
+        Returns None if the body is not a form with a file under ``field``.
+
+        Raises:
+            FileTooLargeError: If the body exceeds ``max_bytes``
+            MultiPartException: If the body is not valid multipart data
+        """
+        content_type = request.headers.get("content-type", "")
+        if not content_type.startswith("multipart/form-data"):
+            return None
+
+        limit = self.max_bytes + MULTIPART_OVERHEAD_BYTES
+        content_length = request.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > limit:
+            raise FileTooLargeError(self.max_bytes)
+
+        async def capped() -> AsyncIterator[bytes]:
+            received = 0
+            async for chunk in request.stream():
+                received += len(chunk)
+                if received > limit:
+                    raise FileTooLargeError(self.max_bytes)
+                yield chunk
+
+        form = await MultiPartParser(request.headers, capped(), max_files=1).parse()
+        upload = form.get(field)
+        if not isinstance(upload, UploadFile):
+            await form.close()
+            return None
+        return upload
+
+    async def save_upload(self, upload: UploadFile) -> StoredFile:
+        """
+        Streams an upload to storage without blocking the event loop.
+
+        Raises:
+            FileTooLargeError: If the upload exceeds ``max_bytes``
+        """
+        fd, tmp_path = await asyncio.to_thread(self._create_tmp)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as buffer:
+                while chunk := await upload.read(self.chunk_size):
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise FileTooLargeError(self.max_bytes)
+                    digest.update(chunk)
+                    await asyncio.to_thread(buffer.write, chunk)
+            return await asyncio.to_thread(
+                self._commit, tmp_path, digest.hexdigest(), size
+            )
+        finally:
+            await asyncio.to_thread(_remove_if_exists, tmp_path)
+
+    def save_stream(self, stream: BinaryIO) -> StoredFile:
+        """
+        Blocking variant of ``save_upload`` for file-like objects.
+
+        Raises:
+            FileTooLargeError: If the stream exceeds ``max_bytes``
+        """
+        fd, tmp_path = self._create_tmp()
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as buffer:
+                while chunk := stream.read(self.chunk_size):
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise FileTooLargeError(self.max_bytes)
+                    digest.update(chunk)
+                    buffer.write(chunk)
+            return self._commit(tmp_path, digest.hexdigest(), size)
+        finally:
+            _remove_if_exists(tmp_path)
+
+    def _create_tmp(self) -> Tuple[int, str]:
+        os.makedirs(self._tmp_dir, exist_ok=True)
+        return tempfile.mkstemp(dir=self._tmp_dir)
+
+    def _commit(self, tmp_path: str, content_hash: str, size: int) -> StoredFile:
+        path = self.path_for(content_hash)
+        if os.path.exists(path):
+            return StoredFile(content_hash, size, path, deduplicated=True)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+        return StoredFile(content_hash, size, path, deduplicated=False)
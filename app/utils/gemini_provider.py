@@ -0,0 +1,94 @@
+"""
+This module provides the Google Gemini LLM provider.
+
+The Gemini SDK takes about a second to import, so it is loaded on the first
+request (or by ``warm_up``) rather than when the provider is created.
+"""
+import asyncio
+import threading
+from typing import AsyncIterator
+
+from app.utils.llm_provider import (
+    LLMProvider,
+    LLMProviderError,
+    LLMResponse,
+    estimate_tokens,
+)
+from app.utils.registry import timed_import
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini, configured once and reused for every request."""
+
+    def __init__(self, api_key: str | None, model_name: str):
+        self.model_name = model_name
+        self._api_key = api_key
+        self._model = None
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        self._get_model()
+
+    def _get_model(self):
+        with self._lock:
+            if self._model is None:
+                genai = timed_import("google.generativeai")
+                if self._api_key:
+                    genai.configure(api_key=self._api_key)
+                self._model = genai.GenerativeModel(self.model_name)
+            return self._model
+
+    async def _ready_model(self):
+        if not self._api_key:
+            raise LLMProviderError("GEMINI_API_KEY not found in environment variables.")
+        # Off the event loop, in case warm-up has not imported the SDK yet
+        return self._model or await asyncio.to_thread(self._get_model)
+
+    @staticmethod
+    def _provider_error(e: Exception) -> LLMProviderError | None:
+        """Maps an SDK exception to a provider error, or None if it is not one."""
+        google_exceptions = timed_import("google.api_core.exceptions")
+        if isinstance(
+            e,
+            (
+                google_exceptions.ResourceExhausted,
+                google_exceptions.ServiceUnavailable,
+                google_exceptions.DeadlineExceeded,
+                google_exceptions.InternalServerError,
+            ),
+        ):
+            return LLMProviderError(str(e), retryable=True)
+        if isinstance(e, (google_exceptions.GoogleAPIError, ValueError)):
+            # response.text raises ValueError when the answer was blocked
+            return LLMProviderError(str(e))
+        return None
+
+    async def generate(self, prompt: str) -> LLMResponse:
+        model = await self._ready_model()
+        try:
+            response = await model.generate_content_async(prompt)
+            text = response.text
+        except Exception as e:
+            error = self._provider_error(e)
+            if error is None:
+                raise
+            raise error
+
+        return LLMResponse(
+            text=text,
+            prompt_tokens=estimate_tokens(prompt),
+            output_tokens=estimate_tokens(text or ""),
+        )
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        model = await self._ready_model()
+        try:
+            response = await model.generate_content_async(prompt, stream=True)
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            error = self._provider_error(e)
+            if error is None:
+                raise
+            raise error
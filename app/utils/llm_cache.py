@@ -0,0 +1,149 @@
+"""
+This module provides a content-hash keyed cache for LLM extraction results.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Collapses whitespace so formatting-only differences share a cache entry."""
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+class LLMResultCache:
+    """
+    Two-tier cache of raw LLM JSON results.
+
+    The memory tier is an LRU bounded by the total size of the serialized
+    entries. The optional disk tier stores one JSON file per key, sharded by
+    key prefix, and survives restarts.
+    """
+
+    def __init__(self, max_bytes: int, disk_path: str | None = None):
+        self.max_bytes = max_bytes
+        self.disk_path = disk_path
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.disk_path:
+            os.makedirs(self.disk_path, exist_ok=True)
+
+    @staticmethod
+    def make_key(resume_text: str, version_tag: str) -> str:
+        """Builds a key from the normalized text and the prompt/model version."""
+        digest = hashlib.sha256()
+        digest.update(version_tag.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(normalize_text(resume_text).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        """Returns the cached result for a key, or None on a miss."""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(payload)
+
+        payload = self._read_disk(key)
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._store(key, payload)
+        return json.loads(payload)
+
+    def set(self, key: str, value: dict) -> None:
+        """Stores a result in the memory tier and, if enabled, on disk."""
+        payload = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        with self._lock:
+            self._store(key, payload)
+        self._write_disk(key, payload)
+
+    async def aget(self, key: str) -> dict | None:
+        """``get`` that keeps disk reads off the event loop."""
+        if self.disk_path:
+            return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def aset(self, key: str, value: dict) -> None:
+        """``set`` that keeps disk writes off the event loop."""
+        if self.disk_path:
+            await asyncio.to_thread(self.set, key, value)
+        else:
+            self.set(key, value)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _store(self, key: str, payload: bytes) -> None:
+        if len(payload) > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = payload
+        self._size += len(payload)
+
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    def _disk_file(self, key: str) -> str:
+        return os.path.join(self.disk_path, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str) -> bytes | None:
+        if not self.disk_path:
+            return None
+        try:
+            with open(self._disk_file(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Failed to read LLM cache entry {key}: {e}")
+            return None
+
+    def _write_disk(self, key: str, payload: bytes) -> None:
+        if not self.disk_path:
+            return
+        path = self._disk_file(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so readers never see partial data
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write LLM cache entry {key}: {e}")
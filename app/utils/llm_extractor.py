@@ -1,17 +1,36 @@
 """
 This module provides utilities for extracting structured data from resume text
-using Google Gemini.
+using an LLM (Google Gemini by default).
 """
+import asyncio
 import json
-import os
-
-import google.generativeai as genai
+import re
+from typing import AsyncIterator
 
 from app.utils.data_transformer import (
     transform_skills_to_list,
     transform_to_list_of_dicts,
     transform_work_experience,
 )
+from app.utils.llm_cache import LLMResultCache
+from app.utils.llm_provider import LLMClient, LLMProviderError, estimate_tokens
+from app.utils.metrics import stage_timer
+from app.utils.partial_json import PartialJSONObjectParser, strip_code_fence
+from app.utils.rule_extractor import CONTACT_SECTION, SECTION_HEADINGS, split_sections
+
+# Bump whenever the prompt changes so cached results from the old prompt are
+# not reused.
+PROMPT_VERSION = "1"
+
+# Sectioned extraction splits list sections longer than this between entries
+DEFAULT_MAX_CHUNK_TOKENS = 400
+
+
+def _cache_version_tag(client: LLMClient, fields: list[str] | None) -> str:
+    tag = f"{client.model_name}:{PROMPT_VERSION}"
+    if fields:
+        tag += ":" + ",".join(sorted(fields))
+    return tag
 
 
 def _normalize_keys(data: dict) -> dict:
@@ -29,79 +48,126 @@ def _normalize_keys(data: dict) -> dict:
     return normalized_data
 
 
-def extract_with_llm(resume_text: str) -> dict:
-    """Extracts structured data from resume text using Google Gemini."""
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        print("Error: GEMINI_API_KEY not found in environment variables.")
-        return {}
-
-    genai.configure(api_key=api_key)
-
-    model = genai.GenerativeModel("gemini-2.5-flash")
-
-    prompt = f"""**Resume Parsing Instructions**
+def transform_llm_output(parsed_json: dict) -> dict:
+    """Normalizes raw LLM JSON into the field names and types we store."""
+    normalized_data = _normalize_keys(parsed_json)
 
-**Objective:** Extract structured information from the provided resume
-text and return it in a clean JSON format.
+    # Transform fields to their expected data types
+    if "skills" in normalized_data:
+        normalized_data["skills"] = transform_skills_to_list(normalized_data["skills"])
+    if "projects" in normalized_data:
+        normalized_data["projects"] = transform_to_list_of_dicts(
+            normalized_data["projects"]
+        )
+    if "education" in normalized_data:
+        normalized_data["education"] = transform_to_list_of_dicts(
+            normalized_data["education"]
+        )
+    if "work_experience" in normalized_data:
+        normalized_data["work_experience"] = transform_work_experience(
+            normalized_data["work_experience"]
+        )
+    if "certifications" in normalized_data:
+        normalized_data["certifications"] = transform_to_list_of_dicts(
+            normalized_data["certifications"]
+        )
 
-**Resume Text:**
-```
-{resume_text}
-```
+    return normalized_data
 
-**Extraction Fields:**
 
-1.  **Full Name:**
-    -   Extract the full name of the candidate.
+# Prompt sections per output field, keyed by the normalized field name
+FIELD_INSTRUCTIONS = {
+    "full_name": (
+        "Full Name",
+        """    -   Extract the full name of the candidate.
     -   Example: "John Doe"
-
-2.  **Email:**
-    -   Extract the primary email address.
+""",
+    ),
+    "email": (
+        "Email",
+        """    -   Extract the primary email address.
     -   Look for email patterns like name@domain.com.
-
-3.  **Phone:**
-    -   Extract the primary phone number.
+""",
+    ),
+    "phone": (
+        "Phone",
+        """    -   Extract the primary phone number.
     -   Look for phone patterns with digits and common separators.
-
-4.  **Skills:**
-    -   Extract all technical and soft skills mentioned.
+""",
+    ),
+    "skills": (
+        "Skills",
+        """    -   Extract all technical and soft skills mentioned.
     -   Return as a flat list of strings.
     -   Example: ["Python", "FastAPI", "Teamwork"]
-
-5.  **Education:**
-    -   Extract all educational qualifications.
+""",
+    ),
+    "education": (
+        "Education",
+        """    -   Extract all educational qualifications.
     -   Return as a list of dictionaries.
     -   Keys: degree, institution, year.
-    -   Example: [{{"degree": "Bachelor of Science", "institution":
-     "University", "year": "2020"}}]
-
-6.  **Work Experience:**
-    -   Extract all work experience entries from sections like "Work
+    -   Example: [{"degree": "Bachelor of Science", "institution":
+     "University", "year": "2020"}]
+""",
+    ),
+    "work_experience": (
+        "Work Experience",
+        """    -   Extract all work experience entries from sections like "Work
       Experience", "Employment History", "Professional Experience",
       "Career History", or "Work History".
     -   Return as a list of dictionaries.
     -   Keys: job_title, company, duration, responsibilities.
     -   responsibilities should be a list of strings.
-    -   Example: [{{"job_title": "Software Engineer", "company":
+    -   Example: [{"job_title": "Software Engineer", "company":
      "Tech Corp", "duration": "2020-2022", "responsibilities":
-     ["Developed features", "Fixed bugs"]}}]
-
-7.  **Certifications:**
-    -   Extract all certifications and licenses.
+     ["Developed features", "Fixed bugs"]}]
+""",
+    ),
+    "certifications": (
+        "Certifications",
+        """    -   Extract all certifications and licenses.
     -   Return as a list of dictionaries.
     -   Keys: name, issuing_organization, year.
-    -   Example: [{{"name": "Certified Kubernetes Administrator",
-     "issuing_organization": "CNCF", "year": "2021"}}]
-
-8.  **Projects:**
-    -   Extract all projects mentioned.
+    -   Example: [{"name": "Certified Kubernetes Administrator",
+     "issuing_organization": "CNCF", "year": "2021"}]
+""",
+    ),
+    "projects": (
+        "Projects",
+        """    -   Extract all projects mentioned.
     -   Return as a list of dictionaries.
     -   Keys: name, description, technologies.
     -   technologies should be a list of strings.
-    -   Example: [{{"name": "Resume Scanner", "description":
-     "Parse resumes", "technologies": ["Python", "FastAPI"]}}]
+    -   Example: [{"name": "Resume Scanner", "description":
+     "Parse resumes", "technologies": ["Python", "FastAPI"]}]
+""",
+    ),
+}
+
+ALL_FIELDS = list(FIELD_INSTRUCTIONS)
+
+
+def build_prompt(resume_text: str, fields: list[str] | None = None) -> str:
+    """Builds the extraction prompt for a resume, optionally for some fields."""
+    sections = "\n".join(
+        f"{number}.  **{FIELD_INSTRUCTIONS[field][0]}:**\n"
+        f"{FIELD_INSTRUCTIONS[field][1]}"
+        for number, field in enumerate(fields or ALL_FIELDS, start=1)
+    )
+    return f"""**Resume Parsing Instructions**
 
+**Objective:** Extract structured information from the provided resume
+text and return it in a clean JSON format.
+
+**Resume Text:**
+```
+{resume_text}
+```
+
+**Extraction Fields:**
+
+{sections}
 **Important Instructions:**
 
 -   Carefully search through the entire resume for contact information.
@@ -113,47 +179,46 @@ text and return it in a clean JSON format.
 -   Return ONLY valid JSON, no markdown or extra text.
 """
 
+
+async def _request_json(
+    resume_text: str,
+    client: LLMClient,
+    cache: LLMResultCache | None,
+    fields: list[str] | None,
+) -> dict:
+    """Returns the model's raw JSON answer for some fields, or {} on failure."""
+    cache_key = None
+    if cache is not None:
+        with stage_timer("llm_cache_lookup"):
+            cache_key = cache.make_key(resume_text, _cache_version_tag(client, fields))
+            cached = await cache.aget(cache_key)
+        if cached is not None:
+            return cached
+
+    prompt = build_prompt(resume_text, fields)
+
     try:
-        response = model.generate_content(prompt)
+        with stage_timer("llm_call"):
+            response = await client.generate(prompt)
 
         if not response.text or not response.text.strip():
             print("Error: Gemini returned an empty response.")
             return {}
 
-        # Clean the response to remove markdown formatting
-        cleaned_text = response.text.strip()
-        if cleaned_text.startswith("```json"):
-            cleaned_text = cleaned_text[7:]
-        if cleaned_text.endswith("```"):
-            cleaned_text = cleaned_text[:-3]
-
-        parsed_json = json.loads(cleaned_text)
-        normalized_data = _normalize_keys(parsed_json)
-
-        # Transform fields to their expected data types
-        if "skills" in normalized_data:
-            normalized_data["skills"] = transform_skills_to_list(
-                normalized_data["skills"]
-            )
-        if "projects" in normalized_data:
-            normalized_data["projects"] = transform_to_list_of_dicts(
-                normalized_data["projects"]
-            )
-        if "education" in normalized_data:
-            normalized_data["education"] = transform_to_list_of_dicts(
-                normalized_data["education"]
-            )
-        if "work_experience" in normalized_data:
-            normalized_data["work_experience"] = transform_work_experience(
-                normalized_data["work_experience"]
-            )
-        if "certifications" in normalized_data:
-            normalized_data["certifications"] = transform_to_list_of_dicts(
-                normalized_data["certifications"]
-            )
+        with stage_timer("llm_json_cleanup"):
+            # Clean the response to remove markdown formatting
+            parsed_json = json.loads(strip_code_fence(response.text))
 
-        return normalized_data
+        if not isinstance(parsed_json, dict):
+            print(f"Error: expected a JSON object, got {type(parsed_json).__name__}")
+            return {}
+        if cache is not None:
+            await cache.aset(cache_key, parsed_json)
+        return parsed_json
 
+    except LLMProviderError as e:
+        print(f"Error: {e.message}")
+        return {}
     except json.JSONDecodeError as e:
         print(f"Error decoding JSON from Gemini: {e}")
         print(f"Raw Gemini response: {response.text}")
@@ -161,3 +226,173 @@ text and return it in a clean JSON format.
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
         return {}
+
+
+async def extract_with_llm(
+    resume_text: str,
+    client: LLMClient,
+    cache: LLMResultCache | None = None,
+    fields: list[str] | None = None,
+) -> dict:
+    """
+    Extracts structured data from resume text using the configured LLM.
+
+    ``fields`` limits the prompt to a subset of ``ALL_FIELDS``. When a cache
+    is given, results for previously seen text are returned without calling
+    the model.
+    """
+    parsed_json = await _request_json(resume_text, client, cache, fields)
+    if not parsed_json:
+        return {}
+    return transform_llm_output(parsed_json)
+
+
+async def stream_with_llm(
+    resume_text: str,
+    client: LLMClient,
+    cache: LLMResultCache | None = None,
+    fields: list[str] | None = None,
+) -> AsyncIterator[dict]:
+    """
+    Extracts structured data like ``extract_with_llm``, but streams the
+    model's answer and yields each field, transformed, as soon as the JSON
+    for it is complete.
+
+    Yields dicts of normalized fields (one answer member can expand to
+    several, e.g. "Contact Information"). The complete answer is decoded once
+    the stream ends, and only then stored in the cache.
+
+    Raises:
+        LLMProviderError: If the request fails
+        ValueError: If the answer is not a JSON object
+    """
+    cache_key = None
+    if cache is not None:
+        with stage_timer("llm_cache_lookup"):
+            cache_key = cache.make_key(resume_text, _cache_version_tag(client, fields))
+            cached = await cache.aget(cache_key)
+        if cached is not None:
+            yield transform_llm_output(cached)
+            return
+
+    parser = PartialJSONObjectParser()
+    emitted = set()
+    with stage_timer("llm_call"):
+        async for chunk in client.generate_stream(build_prompt(resume_text, fields)):
+            for key, value in parser.feed(chunk):
+                emitted.add(key)
+                yield transform_llm_output({key: value})
+
+    parsed_json = parser.result()
+    # Members the incremental scan could not decode on their own
+    missing = {key: value for key, value in parsed_json.items() if key not in emitted}
+    if missing:
+        yield transform_llm_output(missing)
+    if cache is not None:
+        await cache.aset(cache_key, parsed_json)
+
+
+def _split_paragraphs(text: str, max_tokens: int) -> list[str]:
+    """Packs blank-line separated paragraphs into chunks of up to max_tokens."""
+    chunks: list[str] = []
+    current: list[str] = []
+    tokens = 0
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph_tokens = estimate_tokens(paragraph)
+        if current and tokens + paragraph_tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, tokens = [], 0
+        current.append(paragraph)
+        tokens += paragraph_tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def plan_sections(
+    resume_text: str,
+    fields: list[str] | None = None,
+    max_chunk_tokens: int = DEFAULT_MAX_CHUNK_TOKENS,
+) -> list[tuple[str, list[str]]]:
+    """
+    Splits a resume into ``(text, fields)`` prompts: one per list section
+    found by its heading, and one for the contact details and skills over
+    the text outside those sections. List sections longer than
+    ``max_chunk_tokens`` are split further between entries (at blank lines).
+
+    List fields without a recognized heading are asked for in the prompt
+    over the remaining text, where a section under an unfamiliar heading
+    ends up. They are only left out when all the text belongs to the
+    recognized sections.
+    """
+    wanted = fields or ALL_FIELDS
+    sections = split_sections(resume_text)
+    plan = []
+    leftover = sections.get(CONTACT_SECTION)
+    other_fields = [field for field in wanted if field not in SECTION_HEADINGS]
+    if leftover is not None:
+        other_fields += [
+            field
+            for field in wanted
+            if field in SECTION_HEADINGS and field not in sections
+        ]
+    if other_fields:
+        plan.append((leftover or resume_text, other_fields))
+    for field in SECTION_HEADINGS:
+        if field in wanted and field in sections:
+            plan.extend(
+                (chunk, [field])
+                for chunk in _split_paragraphs(sections[field], max_chunk_tokens)
+            )
+    return plan
+
+
+async def extract_sections_with_llm(
+    resume_text: str,
+    client: LLMClient,
+    cache: LLMResultCache | None = None,
+    fields: list[str] | None = None,
+    max_chunk_tokens: int = DEFAULT_MAX_CHUNK_TOKENS,
+) -> dict:
+    """
+    Extracts structured data with one smaller prompt per resume section (or
+    part of a long section), sent concurrently.
+
+    A single large answer takes as long as its whole output to generate;
+    split up, the slowest answer is roughly the largest chunk. Each answer
+    goes through the same transformations as a single-prompt answer, and
+    the lists from chunks of one section are concatenated in order. Text
+    without recognizable headings falls back to ``extract_with_llm``. The
+    result is {} only if every chunk's request fails; otherwise the fields
+    of failed chunks are missing or empty.
+    """
+    plan = plan_sections(resume_text, fields, max_chunk_tokens)
+    if len(plan) < 2:
+        return await extract_with_llm(resume_text, client, cache, fields)
+
+    answers = await asyncio.gather(
+        *(
+            _request_json(chunk_text, client, cache, chunk_fields)
+            for chunk_text, chunk_fields in plan
+        )
+    )
+    if not any(answers):
+        return {}
+
+    merged = {
+        # List sections missing from the text
+        field: []
+        for field in SECTION_HEADINGS
+        if field in (fields or ALL_FIELDS)
+    }
+    for (_, chunk_fields), answer in zip(plan, answers):
+        normalized = _normalize_keys(answer)
+        transformed = transform_llm_output(
+            {field: normalized[field] for field in chunk_fields if field in normalized}
+        )
+        for field, value in transformed.items():
+            if field in SECTION_HEADINGS:
+                merged[field].extend(value)
+            else:
+                merged[field] = value
+    return merged
@@ -0,0 +1,301 @@
+"""
+This module provides LLM providers and a shared client that applies
+concurrency limits, rate limits and retries around them.
+"""
+import asyncio
+import json
+import logging
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from app.utils.metrics import LLM_CALL_SECONDS, LLM_REQUESTS, LLM_TOKENS
+from app.utils.rate_limiter import TokenBucket
+from app.utils.registry import LazyRegistry
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+@dataclass
+class LLMResponse:
+    text: str
+    prompt_tokens: int
+    output_tokens: int
+
+
+class LLMProviderError(Exception):
+    """Raised by providers; ``retryable`` marks transient failures."""
+
+    def __init__(self, message: str, retryable: bool = False):
+        self.message = message
+        self.retryable = retryable
+        super().__init__(message)
+
+
+class LLMProvider(ABC):
+    """A text generation backend."""
+
+    model_name: str
+
+    @abstractmethod
+    async def generate(self, prompt: str) -> LLMResponse:
+        """Generates a completion for the prompt."""
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Generates a completion as a sequence of text chunks.
+
+        Providers without streaming yield the whole completion at once.
+        """
+        response = await self.generate(prompt)
+        yield response.text
+
+    def warm_up(self) -> None:
+        """Loads the provider's SDK ahead of the first request."""
+
+
+FAKE_RESPONSE = {
+    "Full Name": "Jane Doe",
+    "Email": "jane.doe@example.com",
+    "Phone": "+1 555 0100",
+    "Skills": ["Python", "FastAPI", "PostgreSQL"],
+    "Education": [
+        {"degree": "BSc Computer Science", "institution": "State University"}
+    ],
+    "Work Experience": [
+        {
+            "job_title": "Software Engineer",
+            "company": "Tech Corp",
+            "duration": "2020-2023",
+            "responsibilities": ["Built APIs"],
+        }
+    ],
+    "Certifications": [],
+    "Projects": [],
+}
+
+
+class FakeLLMProvider(LLMProvider):
+    """
+    Offline provider with configurable latency and error rate, used for
+    benchmarks and local development.
+    """
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.5,
+        jitter_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        response: dict | None = None,
+        seed: int | None = None,
+        stream_chunk_chars: int = 16,
+    ):
+        self.model_name = "fake"
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.error_rate = error_rate
+        self.response_text = json.dumps(response or FAKE_RESPONSE)
+        self.stream_chunk_chars = stream_chunk_chars
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    def _start_call(self) -> float:
+        """Counts a call and returns its simulated latency."""
+        self.calls += 1
+        jitter = self._random.uniform(-self.jitter_seconds, self.jitter_seconds)
+        return max(0.0, self.latency_seconds + jitter)
+
+    def _maybe_fail(self) -> None:
+        if self._random.random() < self.error_rate:
+            raise LLMProviderError("Simulated provider error", retryable=True)
+
+    async def generate(self, prompt: str) -> LLMResponse:
+        await asyncio.sleep(self._start_call())
+        self._maybe_fail()
+        return LLMResponse(
+            text=self.response_text,
+            prompt_tokens=estimate_tokens(prompt),
+            output_tokens=estimate_tokens(self.response_text),
+        )
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        # The same total latency as ``generate``, spread evenly over the chunks
+        latency = self._start_call()
+        self._maybe_fail()
+        text = self.response_text
+        size = self.stream_chunk_chars
+        chunks = [text[i : i + size] for i in range(0, len(text), size)]
+        for chunk in chunks:
+            await asyncio.sleep(latency / len(chunks))
+            yield chunk
+
+
+# Providers are imported on first use so that e.g. the Gemini SDK is only
+# loaded by processes configured to call Gemini
+PROVIDERS = LazyRegistry("LLM provider")
+PROVIDERS.register(
+    "gemini",
+    "app.utils.gemini_provider:GeminiProvider",
+    backends=["google.generativeai", "google.api_core.exceptions"],
+)
+PROVIDERS.register("fake", "app.utils.llm_provider:FakeLLMProvider")
+
+
+def create_llm_provider(
+    name: str,
+    api_key: str | None = None,
+    model_name: str = "gemini-2.5-flash",
+    fake_latency_seconds: float = 0.5,
+    fake_error_rate: float = 0.0,
+) -> LLMProvider:
+    """Builds a provider by name ("gemini" or "fake")."""
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown LLM provider: {name}")
+    options = {
+        "gemini": {"api_key": api_key, "model_name": model_name},
+        "fake": {
+            "latency_seconds": fake_latency_seconds,
+            "error_rate": fake_error_rate,
+        },
+    }
+    return PROVIDERS.get(name)(**options.get(name, {}))
+
+
+class LLMClient:
+    """
+    Long-lived client around a provider that bounds concurrency, rate-limits
+    requests and tokens, and retries transient errors with jittered backoff.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        max_concurrency: int,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_retries: int = 3,
+        backoff_base_seconds: float = 0.5,
+        backoff_max_seconds: float = 8.0,
+    ):
+        self.provider = provider
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._requests = TokenBucket(
+            requests_per_minute / 60, capacity=max(1.0, requests_per_minute / 60)
+        )
+        self._tokens = TokenBucket(
+            tokens_per_minute / 60, capacity=max(1.0, tokens_per_minute / 60)
+        )
+
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+
+    @property
+    def model_name(self) -> str:
+        return self.provider.model_name
+
+    async def generate(self, prompt: str) -> LLMResponse:
+        """
+        Generates a completion, waiting for rate-limit capacity first.
+
+        Raises:
+            LLMProviderError: If the request fails permanently or retries run out
+        """
+        estimated_tokens = estimate_tokens(prompt)
+        attempt = 0
+        while True:
+            await self._requests.acquire(1)
+            await self._tokens.acquire(estimated_tokens)
+            self.requests += 1
+            try:
+                async with self._semaphore:
+                    with LLM_CALL_SECONDS.time():
+                        response = await self.provider.generate(prompt)
+            except LLMProviderError as e:
+                if not e.retryable or attempt >= self.max_retries:
+                    self.failures += 1
+                    LLM_REQUESTS.labels("failure").inc()
+                    raise
+                attempt += 1
+                self.retries += 1
+                LLM_REQUESTS.labels("retry").inc()
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            self._record_success(response.prompt_tokens, response.output_tokens)
+            return response
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Streams a completion in chunks, under the same limits as ``generate``.
+
+        Failures before the first chunk are retried like ``generate``; once
+        text has been yielded they are raised, since the caller has already
+        consumed part of the answer.
+
+        Raises:
+            LLMProviderError: If the request fails permanently, retries run out
+                or the stream breaks off
+        """
+        estimated_tokens = estimate_tokens(prompt)
+        attempt = 0
+        while True:
+            await self._requests.acquire(1)
+            await self._tokens.acquire(estimated_tokens)
+            self.requests += 1
+            output = []
+            try:
+                async with self._semaphore:
+                    with LLM_CALL_SECONDS.time():
+                        async for chunk in self.provider.generate_stream(prompt):
+                            output.append(chunk)
+                            yield chunk
+            except LLMProviderError as e:
+                if output or not e.retryable or attempt >= self.max_retries:
+                    self.failures += 1
+                    LLM_REQUESTS.labels("failure").inc()
+                    raise
+                attempt += 1
+                self.retries += 1
+                LLM_REQUESTS.labels("retry").inc()
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            self._record_success(estimated_tokens, estimate_tokens("".join(output)))
+            return
+
+    def _record_success(self, prompt_tokens: int, output_tokens: int) -> None:
+        # Output tokens count against the budget once they are known
+        self._tokens.consume(output_tokens)
+        self.prompt_tokens += prompt_tokens
+        self.output_tokens += output_tokens
+        LLM_REQUESTS.labels("success").inc()
+        LLM_TOKENS.labels("prompt").inc(prompt_tokens)
+        LLM_TOKENS.labels("output").inc(output_tokens)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform between zero and the capped exponential delay
+        ceiling = min(
+            self.backoff_max_seconds, self.backoff_base_seconds * 2 ** (attempt - 1)
+        )
+        return random.uniform(0, ceiling)
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+        }
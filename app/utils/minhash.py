@@ -0,0 +1,161 @@
+"""
+This module provides MinHash signatures and an LSH banding index for finding
+near-duplicate documents in sub-linear time.
+
+Documents are reduced to hashed word shingles, and each of ``num_perm``
+universal hash functions keeps its minimum over the shingles. Two
+signatures agree at any position with probability equal to the Jaccard
+similarity of the shingle sets. Signatures are split into bands; documents
+that share any whole band land in the same bucket and become candidates,
+which are then verified against the full signature.
+"""
+import re
+import threading
+import zlib
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_HASH_MASK = (1 << 32) - 1
+_WORD_RE = re.compile(r"\w+")
+_CHUNK = 4096
+
+
+class MinHasher:
+    """Computes MinHash signatures over word shingles of a text."""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # Fixed seed so signatures stay comparable across restarts
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self._powers = np.array(
+            [pow(31, i, 1 << 32) for i in range(shingle_size)], dtype=np.uint64
+        )
+
+    def shingles(self, text: str) -> np.ndarray:
+        """Returns the unique 32-bit hashes of the text's word shingles."""
+        words = _WORD_RE.findall(text.lower())
+        if not words:
+            return np.empty(0, dtype=np.uint64)
+        hashes = np.fromiter(
+            (zlib.crc32(word.encode()) for word in words),
+            dtype=np.uint64,
+            count=len(words),
+        )
+        if len(hashes) >= self.shingle_size:
+            windows = np.lib.stride_tricks.sliding_window_view(
+                hashes, self.shingle_size
+            )
+            # Polynomial hash of each window; uint64 arithmetic wraps
+            hashes = (windows * self._powers).sum(axis=1) & np.uint64(_HASH_MASK)
+        return np.unique(hashes)
+
+    def signature(self, text: str) -> np.ndarray | None:
+        """Returns the signature, or None when the text has no words."""
+        shingles = self.shingles(text)
+        if not len(shingles):
+            return None
+        signature = np.full(self.num_perm, _MERSENNE_PRIME, dtype=np.uint64)
+        for start in range(0, len(shingles), _CHUNK):
+            chunk = shingles[start : start + _CHUNK]
+            permuted = (
+                self._a[:, None] * chunk[None, :] + self._b[:, None]
+            ) % np.uint64(_MERSENNE_PRIME)
+            np.minimum(signature, permuted.min(axis=1), out=signature)
+        return signature.astype(np.uint32)
+
+
+class MinHashLSH:
+    """
+    LSH banding index over MinHash signatures.
+
+    With ``b`` bands of ``r`` rows, two documents with Jaccard similarity
+    ``s`` become candidates with probability ``1 - (1 - s**r)**b``.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self._rows_per_band = num_perm // bands
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._signatures = np.zeros((1024, num_perm), dtype=np.uint32)
+        self._row_of: Dict[int, int] = {}
+        self._next_row = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def _band_keys(self, signature: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        r = self._rows_per_band
+        for band in range(self.bands):
+            yield band, signature[band * r : (band + 1) * r].tobytes()
+
+    def insert(self, key: int, signature: np.ndarray) -> None:
+        """Adds a signature, replacing any earlier one stored under the key."""
+        with self._lock:
+            self.remove(key)
+            if self._next_row == len(self._signatures):
+                self._signatures = np.concatenate(
+                    [self._signatures, np.zeros_like(self._signatures)]
+                )
+            row = self._next_row
+            self._next_row += 1
+            self._signatures[row] = signature
+            self._row_of[key] = row
+            for band, band_key in self._band_keys(signature):
+                self._buckets[band].setdefault(band_key, []).append(key)
+
+    def remove(self, key: int) -> None:
+        with self._lock:
+            row = self._row_of.pop(key, None)
+            if row is None:
+                return
+            for band, band_key in self._band_keys(self._signatures[row]):
+                bucket = self._buckets[band].get(band_key)
+                if bucket is not None and key in bucket:
+                    bucket.remove(key)
+                    if not bucket:
+                        del self._buckets[band][band_key]
+
+    def query(
+        self, signature: np.ndarray, threshold: float, exclude: int | None = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Returns ``(key, estimated_similarity)`` pairs at or above the
+        threshold, most similar first.
+        """
+        with self._lock:
+            candidates = set()
+            for band, band_key in self._band_keys(signature):
+                candidates.update(self._buckets[band].get(band_key, ()))
+            candidates.discard(exclude)
+            if not candidates:
+                return []
+
+            keys = list(candidates)
+            rows = [self._row_of[key] for key in keys]
+            similarity = (self._signatures[rows] == signature).mean(axis=1)
+
+        matches = [
+            (key, float(score))
+            for key, score in zip(keys, similarity)
+            if score >= threshold
+        ]
+        matches.sort(key=lambda match: (-match[1], -match[0]))
+        return matches
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "documents": len(self._row_of),
+                "bands": self.bands,
+                "rows_per_band": self._rows_per_band,
+                "buckets": sum(len(buckets) for buckets in self._buckets),
+            }
@@ -0,0 +1,137 @@
+"""
+This module provides an incremental parser for a JSON object that arrives in
+chunks, such as a streamed LLM answer.
+
+The parser only tracks string and bracket nesting, so it can tell when a
+top-level member's value is complete without re-parsing the text seen so
+far; each completed value is then decoded on its own with ``json.loads``.
+"""
+import json
+from typing import Any, List, Tuple
+
+# States while scanning the top-level object
+_START = "start"
+_KEY = "key"
+_KEY_STRING = "key_string"
+_COLON = "colon"
+_VALUE_START = "value_start"
+_VALUE = "value"
+_DONE = "done"
+
+
+def strip_code_fence(text: str) -> str:
+    """Removes the markdown fence models sometimes wrap JSON answers in."""
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return text
+
+
+class PartialJSONObjectParser:
+    """
+    Emits ``(key, value)`` for each top-level member of a streamed JSON object
+    as soon as the text that completes it has been fed.
+
+    Text before the opening brace (e.g. a markdown fence) is ignored. Members
+    whose value does not decode are skipped; ``result`` decodes the complete
+    text, so a malformed answer still fails there.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._state = _START
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key_start = 0
+        self._key: str | None = None
+        self._value_start = 0
+
+    @property
+    def text(self) -> str:
+        return self._buffer
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Adds a chunk and returns the members it completed."""
+        start = len(self._buffer)
+        self._buffer += chunk
+        buffer = self._buffer
+        completed = []
+        for i in range(start, len(buffer)):
+            if self._state == _DONE:
+                break
+            c = buffer[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif c == "\\":
+                    self._escaped = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._state == _KEY_STRING:
+                        self._key = json.loads(buffer[self._key_start : i + 1])
+                        self._state = _COLON
+                continue
+
+            if self._state == _START:
+                if c == "{":
+                    self._depth = 1
+                    self._state = _KEY
+            elif self._state == _KEY:
+                if c == '"':
+                    self._in_string = True
+                    self._key_start = i
+                    self._state = _KEY_STRING
+                elif c == "}":
+                    self._state = _DONE
+            elif self._state == _COLON:
+                if c == ":":
+                    self._state = _VALUE_START
+            else:
+                if self._state == _VALUE_START:
+                    if c.isspace():
+                        continue
+                    self._value_start = i
+                    self._state = _VALUE
+                member = self._scan_value(buffer, i, c)
+                if member is not None:
+                    completed.append(member)
+        return completed
+
+    def _scan_value(self, buffer: str, i: int, c: str) -> Tuple[str, Any] | None:
+        if c == '"':
+            self._in_string = True
+        elif c in "{[":
+            self._depth += 1
+        elif c in "}]":
+            if self._depth > 1:
+                self._depth -= 1
+                return None
+            # The closing brace of the object also ends its last value
+            self._state = _DONE
+            return self._complete(buffer, i)
+        elif c == "," and self._depth == 1:
+            self._state = _KEY
+            return self._complete(buffer, i)
+        return None
+
+    def _complete(self, buffer: str, end: int) -> Tuple[str, Any] | None:
+        try:
+            value = json.loads(buffer[self._value_start : end])
+        except json.JSONDecodeError:
+            return None
+        return self._key, value
+
+    def result(self) -> dict:
+        """
+        Decodes the complete text fed so far.
+
+        Raises:
+            ValueError: If the text is not a JSON object
+        """
+        parsed = json.loads(strip_code_fence(self._buffer))
+        if not isinstance(parsed, dict):
+            raise ValueError(f"expected a JSON object, got {type(parsed).__name__}")
+        return parsed
@@ -0,0 +1,355 @@
+"""
+This module provides on-demand profiling of single requests.
+
+A profiled request runs under either cProfile (deterministic, every call on
+the event loop thread) or a stack sampler (a background thread that records
+the event loop thread's stack every few milliseconds, with much lower
+overhead). Work sent to the extraction sandbox runs in another process, so
+it is profiled there with cProfile and the statistics are shipped back with
+the result and reported in their own section.
+
+Both modes observe the whole event loop thread, so requests served
+concurrently with a profiled one show up in its report too.
+"""
+import asyncio
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MODES = ("cprofile", "sampling")
+TOP_FUNCTIONS = 40
+
+# Set for the duration of a profiled request so that sandboxed work can be
+# profiled in the child process as well
+current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar(
+    "current_profile", default=None
+)
+
+
+class _StatsHolder:
+    """Adapts a raw cProfile stats dict to what ``pstats.Stats`` accepts."""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+def profiled_call(func: Callable[..., Any], *args) -> Tuple[Any, dict]:
+    """Runs ``func(*args)`` under cProfile and returns its result and stats."""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args)
+    profiler.create_stats()
+    return result, profiler.stats
+
+
+def _function_rows(stats: pstats.Stats, limit: int) -> List[dict]:
+    rows = []
+    ordered = sorted(stats.stats.items(), key=lambda item: -item[1][3])
+    for (filename, line, name), (_, calls, total, cumulative, _) in ordered[:limit]:
+        rows.append(
+            {
+                "function": name,
+                "file": filename,
+                "line": line,
+                "calls": calls,
+                "total_ms": round(total * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+        )
+    return rows
+
+
+def _stats_text(stats: pstats.Stats, limit: int) -> str:
+    buffer = io.StringIO()
+    stats.stream = buffer
+    stats.sort_stats("cumulative").print_stats(limit)
+    return buffer.getvalue()
+
+
+class _StackSampler(threading.Thread):
+    """Records the stack of one thread at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval_seconds: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self._thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self._stopped = threading.Event()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            stack = tuple(
+                f"{os.path.basename(entry.filename)}:{entry.name}"
+                for entry in traceback.extract_stack(frame)
+            )
+            self.stacks[stack] += 1
+            self.samples += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+
+@dataclass
+class RequestProfile:
+    """Profile of one request while it is being captured."""
+
+    request_id: str
+    method: str
+    path: str
+    mode: str
+    sandbox_stats: List[dict] = field(default_factory=list)
+
+    def add_sandbox_stats(self, stats: dict) -> None:
+        self.sandbox_stats.append(stats)
+
+
+@dataclass
+class ProfileReport:
+    request_id: str
+    method: str
+    path: str
+    mode: str
+    status_code: int
+    duration_ms: float
+    created_at: datetime
+    functions: List[dict]
+    sandbox_functions: List[dict]
+    text: str
+
+    def summary(self) -> dict:
+        return {
+            "request_id": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "mode": self.mode,
+            "status_code": self.status_code,
+            "duration_ms": self.duration_ms,
+            "created_at": self.created_at,
+        }
+
+
+class ProfileStore:
+    """
+    Keeps the most recent reports in memory. With a directory configured the
+    text report is also written there as ``<request_id>.txt``, in a worker
+    thread.
+    """
+
+    def __init__(self, max_reports: int = 100, directory: str | None = None):
+        self.max_reports = max_reports
+        self.directory = directory
+        self._reports: "OrderedDict[str, ProfileReport]" = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    async def add(self, report: ProfileReport) -> None:
+        with self._lock:
+            self._reports[report.request_id] = report
+            while len(self._reports) > self.max_reports:
+                self._reports.popitem(last=False)
+        if self.directory:
+            await asyncio.to_thread(self._write, report)
+
+    def _write(self, report: ProfileReport) -> None:
+        path = os.path.join(self.directory, f"{report.request_id}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(report.text)
+
+    def get(self, request_id: str) -> ProfileReport | None:
+        with self._lock:
+            return self._reports.get(request_id)
+
+    def list(self) -> List[ProfileReport]:
+        """Returns stored reports, newest first."""
+        with self._lock:
+            return list(reversed(self._reports.values()))
+
+
+class RequestProfiler:
+    """
+    Decides which requests to profile and turns captures into reports.
+
+    A request is profiled when it carries the trigger header (whose value
+    must equal ``token`` when one is configured) or is picked by
+    ``sample_rate``. Only one cProfile capture can run at a time, since the
+    interpreter has a single profile hook per thread; requests that would
+    overlap are served unprofiled.
+    """
+
+    def __init__(
+        self,
+        store: ProfileStore,
+        mode: str = "cprofile",
+        sample_rate: float = 0.0,
+        token: str | None = None,
+        sampling_interval_seconds: float = 0.005,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.store = store
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.token = token
+        self.sampling_interval_seconds = sampling_interval_seconds
+        self._cprofile_lock = threading.Lock()
+
+    def authorized(self, token: str | None) -> bool:
+        """Checks a token presented to trigger profiling or read reports."""
+        if self.token is None:
+            return True
+        return token is not None and hmac.compare_digest(token, self.token)
+
+    def should_profile(self, trigger: str | None) -> bool:
+        """Decides from the trigger header value, then the sampling rate."""
+        if trigger is not None:
+            return self.authorized(trigger)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def capture(self, profile: RequestProfile) -> "_Capture":
+        return _Capture(self, profile)
+
+    async def _finish(
+        self,
+        profile: RequestProfile,
+        status_code: int,
+        duration: float,
+        stats: pstats.Stats | None,
+        sampler: _StackSampler | None,
+    ) -> None:
+        sections = [
+            f"{profile.method} {profile.path} -> {status_code} in "
+            f"{duration * 1000:.1f}ms ({profile.mode})\n"
+        ]
+        functions: List[dict] = []
+        if stats is not None:
+            functions = _function_rows(stats, TOP_FUNCTIONS)
+            sections.append(_stats_text(stats, TOP_FUNCTIONS))
+        if sampler is not None:
+            functions = _sampled_rows(sampler, TOP_FUNCTIONS)
+            sections.append(_sampled_text(sampler, TOP_FUNCTIONS))
+
+        sandbox_functions: List[dict] = []
+        if profile.sandbox_stats:
+            sandbox = pstats.Stats(_StatsHolder(profile.sandbox_stats[0]))
+            for extra in profile.sandbox_stats[1:]:
+                sandbox.add(_StatsHolder(extra))
+            sandbox_functions = _function_rows(sandbox, TOP_FUNCTIONS)
+            sections.append("Extraction sandbox\n")
+            sections.append(_stats_text(sandbox, TOP_FUNCTIONS))
+
+        await self.store.add(
+            ProfileReport(
+                request_id=profile.request_id,
+                method=profile.method,
+                path=profile.path,
+                mode=profile.mode,
+                status_code=status_code,
+                duration_ms=round(duration * 1000, 3),
+                created_at=datetime.now(timezone.utc),
+                functions=functions,
+                sandbox_functions=sandbox_functions,
+                text="\n".join(sections),
+            )
+        )
+
+
+class _Capture:
+    """Async context manager that profiles the enclosed request handling."""
+
+    def __init__(self, profiler: RequestProfiler, profile: RequestProfile):
+        self._profiler = profiler
+        self.profile = profile
+        self.status_code = 500
+        self.active = False
+        self._cprofile: cProfile.Profile | None = None
+        self._sampler: _StackSampler | None = None
+
+    async def __aenter__(self) -> "_Capture":
+        if self.profile.mode == "cprofile":
+            if not self._profiler._cprofile_lock.acquire(blocking=False):
+                logger.info(
+                    f"Skipping profile of {self.profile.request_id}: "
+                    "another cProfile capture is running"
+                )
+                return self
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        else:
+            self._sampler = _StackSampler(
+                threading.get_ident(), self._profiler.sampling_interval_seconds
+            )
+            self._sampler.start()
+        self.active = True
+        self._token = current_profile.set(self.profile)
+        self._start = time.perf_counter()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if not self.active:
+            return
+        duration = time.perf_counter() - self._start
+        current_profile.reset(self._token)
+        stats = None
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._profiler._cprofile_lock.release()
+            stats = pstats.Stats(self._cprofile)
+        if self._sampler is not None:
+            self._sampler.stop()
+        try:
+            await self._profiler._finish(
+                self.profile, self.status_code, duration, stats, self._sampler
+            )
+        except Exception:
+            logger.exception(f"Failed to store profile {self.profile.request_id}")
+
+
+def _sampled_rows(sampler: _StackSampler, limit: int) -> List[dict]:
+    """Per-function sample counts: ``self`` on top of stack, ``total`` anywhere."""
+    own: Counter = Counter()
+    total: Counter = Counter()
+    for stack, count in sampler.stacks.items():
+        own[stack[-1]] += count
+        for name in set(stack):
+            total[name] += count
+    interval_ms = sampler.interval_seconds * 1000
+    return [
+        {
+            "function": name,
+            "samples": samples,
+            "self_samples": own[name],
+            "estimated_ms": round(samples * interval_ms, 3),
+        }
+        for name, samples in total.most_common(limit)
+    ]
+
+
+def _sampled_text(sampler: _StackSampler, limit: int) -> str:
+    """The hottest stacks in collapsed (flame graph) format."""
+    lines: List[str] = [f"{sampler.samples} samples"]
+    for stack, count in sampler.stacks.most_common(limit):
+        lines.append(f"{';'.join(stack)} {count}")
+    return "\n".join(lines) + "\n"
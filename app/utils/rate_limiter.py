@@ -0,0 +1,69 @@
+"""
+This module provides a token-bucket rate limiter.
+"""
+import asyncio
+import math
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``rate`` tokens per second up to
+    ``capacity``.
+
+    ``acquire`` waits until enough tokens are available, ``try_acquire`` never
+    waits and ``consume`` debits tokens after the fact (the balance may go
+    negative, delaying later callers).
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """
+        Takes tokens if available.
+
+        Returns:
+            0 on success, otherwise the seconds until enough tokens accrue,
+            or ``math.inf`` if they never will because ``rate`` is zero
+        """
+        # Requests larger than the bucket could never be served otherwise
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            self._refill()
+            # A bucket without capacity holds no tokens to take
+            if self._tokens >= tokens and self.capacity > 0:
+                self._tokens -= tokens
+                return 0.0
+            if self.rate <= 0:
+                return math.inf
+            return (tokens - self._tokens) / self.rate
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """Waits until tokens are available and takes them."""
+        while (wait := self.try_acquire(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+    def consume(self, tokens: float) -> None:
+        """Debits tokens without waiting."""
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
@@ -0,0 +1,110 @@
+"""
+This module provides registries whose entries are imported on first use.
+
+Entries are registered as ``"package.module:attribute"`` strings together
+with the heavy third-party modules they depend on, so a process only pays
+for the backends it actually uses. ``warm_up`` imports them ahead of time,
+for example right after startup, and every import is timed for the startup
+report.
+"""
+import importlib
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Tuple
+
+_import_seconds: Dict[str, float] = {}
+_import_lock = threading.Lock()
+
+
+def timed_import(module_name: str):
+    """Imports a module, recording how long the first import took."""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    with _import_lock:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        _import_seconds.setdefault(module_name, time.perf_counter() - start)
+    return module
+
+
+def import_timings() -> Dict[str, float]:
+    """Returns seconds spent on each lazily imported module so far."""
+    with _import_lock:
+        return dict(_import_seconds)
+
+
+@dataclass(frozen=True)
+class _Entry:
+    target: str
+    backends: Tuple[str, ...]
+
+
+class LazyRegistry:
+    """Maps keys to lazily imported objects, such as extractors or providers."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self._entries: Dict[str, _Entry] = {}
+        self._loaded: Dict[str, Any] = {}
+
+    def register(self, key: str, target: str, backends: Iterable[str] = ()):
+        """
+        Registers ``target`` (``"module:attribute"``) under ``key``.
+        ``backends`` are the third-party modules the target imports on use.
+        """
+        self._entries[key] = _Entry(target, tuple(backends))
+        self._loaded.pop(key, None)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def keys(self) -> List[str]:
+        return list(self._entries)
+
+    def get(self, key: str) -> Any:
+        """
+        Returns the object registered under ``key``, importing its module.
+
+        Raises:
+            KeyError: If nothing is registered under ``key``
+        """
+        loaded = self._loaded.get(key)
+        if loaded is not None:
+            return loaded
+        entry = self._entries.get(key)
+        if entry is None:
+            raise KeyError(f"Unknown {self.kind}: {key}")
+        module_name, attribute = entry.target.split(":")
+        loaded = getattr(timed_import(module_name), attribute)
+        self._loaded[key] = loaded
+        return loaded
+
+    def backends(self, keys: Iterable[str] | None = None) -> List[str]:
+        """Returns the backend modules of the given (or all) entries."""
+        modules: List[str] = []
+        for key in self._entries if keys is None else keys:
+            for module in self._entries[key].backends:
+                if module not in modules:
+                    modules.append(module)
+        return modules
+
+    def warm_up(self, keys: Iterable[str] | None = None) -> Dict[str, float]:
+        """Imports entries and their backends now; returns seconds per module."""
+        keys = list(self._entries if keys is None else keys)
+        for key in keys:
+            self.get(key)
+        return warm_up_modules(self.backends(keys))
+
+
+def warm_up_modules(modules: Iterable[str]) -> Dict[str, float]:
+    """Imports modules now; returns seconds spent on each new import."""
+    timings = {}
+    for module in modules:
+        if module in sys.modules:
+            continue
+        timed_import(module)
+        timings[module] = import_timings().get(module, 0.0)
+    return timings
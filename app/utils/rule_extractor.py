@@ -0,0 +1,278 @@
+"""
+This module provides a deterministic, rule-based extractor for resume fields
+that do not need an LLM.
+
+Email and phone numbers come from compiled regular expressions and skills
+from an Aho-Corasick automaton over a skill vocabulary. Sections without a
+recognized heading are reported as empty, but with low confidence: the
+heading may simply be worded differently, so the LLM is still asked.
+"""
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"(?<![\w+])\+?\(?\d[\d\s().-]{6,}\d(?!\w)")
+NAME_RE = re.compile(r"^[A-Z][a-zA-Z'.-]+(?: [A-Z][a-zA-Z'.-]+){1,3}$")
+
+# fmt: off
+DEFAULT_SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Ruby", "PHP",
+    "Kotlin", "Swift", "Scala", "Rust", "Golang", "SQL", "NoSQL", "HTML", "CSS",
+    "Bash", "FastAPI", "Django", "Flask", "Spring Boot", "Node.js", "Express",
+    "React", "Angular", "Vue.js", "Next.js", ".NET", "Ruby on Rails",
+    "PostgreSQL", "MySQL", "SQLite", "MongoDB", "Redis", "Elasticsearch",
+    "Cassandra", "DynamoDB", "Kafka", "RabbitMQ", "Spark", "Hadoop", "Airflow",
+    "AWS", "Azure", "GCP", "Google Cloud", "Docker", "Kubernetes", "Terraform",
+    "Ansible", "Jenkins", "GitHub Actions", "CI/CD", "Git", "Linux",
+    "Microservices", "REST", "GraphQL", "gRPC", "Machine Learning",
+    "Deep Learning", "NLP", "Computer Vision", "TensorFlow", "PyTorch",
+    "scikit-learn", "Pandas", "NumPy", "Data Analysis", "Tableau", "Power BI",
+    "Excel", "Agile", "Scrum", "Jira", "Project Management", "Leadership",
+    "Communication", "Teamwork", "Problem Solving",
+]
+
+# Headings that introduce each list section
+SECTION_HEADINGS: Dict[str, List[str]] = {
+    "work_experience": [
+        "experience", "work experience", "professional experience",
+        "employment", "employment history", "work history", "career history",
+    ],
+    "education": ["education", "academic background", "qualifications"],
+    "certifications": [
+        "certifications", "certificates", "licenses", "licenses & certifications",
+        "licenses and certifications",
+    ],
+    "projects": ["projects", "personal projects", "selected projects"],
+}
+
+# Headings of sections that hold no list field; they end the section before
+# them and their lines count as part of the contact section
+OTHER_HEADINGS = [
+    "summary", "professional summary", "profile", "objective", "about me",
+    "skills", "technical skills", "core competencies", "languages",
+    "interests", "hobbies", "awards", "publications", "volunteering",
+    "references",
+]
+# Title words that open a resume but are never part of a name
+RESUME_TITLE_WORDS = ["resume", "résumé", "curriculum", "vitae", "cv", "biodata"]
+# Job title words, so a title line such as "Senior Software Engineer" is not
+# taken for a name
+JOB_TITLE_WORDS = [
+    "senior", "junior", "lead", "principal", "staff", "chief", "head",
+    "associate", "assistant", "intern", "trainee", "software", "engineer",
+    "engineering", "developer", "programmer", "architect", "scientist",
+    "analyst", "consultant", "designer", "manager", "director", "officer",
+    "administrator", "specialist", "coordinator", "executive", "president",
+    "vp", "cto", "ceo", "founder", "full-stack", "fullstack", "frontend",
+    "backend", "devops", "data", "product", "marketing", "sales",
+]
+# fmt: on
+
+CONTACT_SECTION = "contact"
+
+# Confidence of a list section reported empty because no heading was found.
+# Below any sensible fast-path threshold: headings vary too much to rely on
+MISSING_SECTION_CONFIDENCE = 0.5
+
+# Ceiling on the skills confidence, below the default fast-path threshold: a
+# vocabulary only knows the skills it lists, so however many it finds the LLM
+# is still asked for the rest
+MAX_SKILLS_CONFIDENCE = 0.85
+
+# How many leading lines may be title boilerplate before the name
+_NAME_SEARCH_LINES = 3
+
+
+class AhoCorasick:
+    """Case-insensitive multi-pattern matcher that reports whole-word hits."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for pattern in patterns:
+            self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str) -> None:
+        state = 0
+        for char in pattern.lower():
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def search(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yields ``(start, end, pattern_index)`` for whole-word matches."""
+        lowered = text.lower()
+        state = 0
+        for end, char in enumerate(lowered, start=1):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._output[state]:
+                start = end - len(self.patterns[index])
+                before = lowered[start - 1] if start > 0 else " "
+                after = lowered[end] if end < len(lowered) else " "
+                if not before.isalnum() and not after.isalnum():
+                    yield start, end, index
+
+
+@dataclass
+class RuleExtraction:
+    fields: Dict[str, object] = field(default_factory=dict)
+    confidence: Dict[str, float] = field(default_factory=dict)
+
+    def confident_fields(self, threshold: float) -> List[str]:
+        return [name for name, c in self.confidence.items() if c >= threshold]
+
+
+def _is_heading(line: str, headings: List[str]) -> bool:
+    normalized = line.strip().strip(":").strip().lower()
+    return len(normalized.split()) <= 5 and normalized in headings
+
+
+def _boilerplate_words() -> Set[str]:
+    words = set(RESUME_TITLE_WORDS)
+    for heading in [*OTHER_HEADINGS, *sum(SECTION_HEADINGS.values(), [])]:
+        words.update(heading.split())
+    words.discard("&")
+    words.discard("and")
+    return words
+
+
+# Words of titles and section headings, which a name line must not contain
+_BOILERPLATE_WORDS = _boilerplate_words()
+_NOT_NAME_WORDS = _BOILERPLATE_WORDS | set(JOB_TITLE_WORDS)
+
+
+def _words(line: str) -> List[str]:
+    return [word.strip(".,:;|-").lower() for word in line.split()]
+
+
+def find_name(lines: List[str]) -> str | None:
+    """
+    Returns the name from the first lines of a resume, skipping a title
+    such as "Curriculum Vitae", or None if the first other line is not a
+    name. A name is two to four capitalized words, none of them a heading
+    or job title word.
+    """
+    for line in lines[:_NAME_SEARCH_LINES]:
+        words = [word for word in _words(line) if word]
+        if words and all(word in _BOILERPLATE_WORDS for word in words):
+            continue
+        if NAME_RE.match(line) and not any(word in _NOT_NAME_WORDS for word in words):
+            return line
+        return None
+    return None
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """
+    Splits resume text at recognized headings into ``CONTACT_SECTION`` (the
+    text before the first heading plus sections without a list field) and
+    one entry per ``SECTION_HEADINGS`` key found. A section that appears
+    more than once is joined in order.
+    """
+    sections: Dict[str, List[str]] = {CONTACT_SECTION: []}
+    current = CONTACT_SECTION
+    for line in text.splitlines():
+        if line.strip():
+            heading = next(
+                (
+                    section
+                    for section, headings in SECTION_HEADINGS.items()
+                    if _is_heading(line, headings)
+                ),
+                None,
+            )
+            if heading is not None:
+                current = heading
+            elif _is_heading(line, OTHER_HEADINGS):
+                current = CONTACT_SECTION
+        sections.setdefault(current, []).append(line)
+    joined = {section: "\n".join(lines).strip() for section, lines in sections.items()}
+    return {section: text for section, text in joined.items() if text}
+
+
+class RuleBasedExtractor:
+    """Extracts contact details, skills and absent sections without an LLM."""
+
+    def __init__(self, skills: Iterable[str] = DEFAULT_SKILLS):
+        self._skills = AhoCorasick(skills)
+
+    def extract(self, text: str) -> RuleExtraction:
+        result = RuleExtraction()
+
+        emails = list(dict.fromkeys(EMAIL_RE.findall(text)))
+        if emails:
+            result.fields["email"] = emails[0]
+            result.confidence["email"] = 0.99 if len(emails) == 1 else 0.85
+
+        phones = [
+            match.strip()
+            for match in PHONE_RE.findall(text)
+            if 10 <= sum(char.isdigit() for char in match) <= 15
+        ]
+        phones = list(dict.fromkeys(phones))
+        if phones:
+            result.fields["phone"] = phones[0]
+            result.confidence["phone"] = 0.95 if len(phones) == 1 else 0.8
+
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        name = find_name(lines)
+        if name is not None:
+            result.fields["full_name"] = name
+            result.confidence["full_name"] = 0.9
+
+        skills = list(
+            dict.fromkeys(
+                self._skills.patterns[index]
+                for _, _, index in self._skills.search(text)
+            )
+        )
+        if skills:
+            result.fields["skills"] = skills
+            # More dictionary hits make it less likely the LLM finds much more
+            result.confidence["skills"] = min(
+                MAX_SKILLS_CONFIDENCE, 0.5 + 0.05 * len(skills)
+            )
+
+        for section, headings in SECTION_HEADINGS.items():
+            if not any(_is_heading(line, headings) for line in lines):
+                result.fields[section] = []
+                result.confidence[section] = MISSING_SECTION_CONFIDENCE
+
+        return result
+
+
+def load_skill_vocabulary(path: str | None) -> List[str]:
+    """Reads one skill per line from a file, or returns the default list."""
+    if not path:
+        return DEFAULT_SKILLS
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
@@ -0,0 +1,160 @@
+"""
+This module provides password hashing and access token issuance and
+verification.
+
+bcrypt is deliberately slow (around 100-300 ms of CPU per hash at the default
+cost), so hashes are computed and checked in the I/O thread pool, where the
+``bcrypt`` extension releases the GIL, with a separate bound on how many run
+at once so a burst of logins cannot take every pool thread. Tokens are signed
+JWTs that carry the user's email, ID and role; verifying one needs only the
+key, never the users table.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from jose import JWTError, jwk, jwt
+from passlib.context import CryptContext
+
+from app.utils.executors import WorkerPools
+
+# passlib 1.7.4 reads bcrypt.__about__, which bcrypt 4.1 removed, and logs a
+# traceback on first use; hashing itself is unaffected
+logging.getLogger("passlib.handlers.bcrypt").setLevel(logging.ERROR)
+
+# Claims every token must carry
+_REQUIRED_CLAIMS = ("sub", "uid", "role", "exp")
+
+
+class InvalidTokenError(Exception):
+    """Raised for access tokens that are malformed, forged or expired."""
+
+
+class PasswordHasher:
+    """bcrypt password hashes, computed off the event loop."""
+
+    def __init__(
+        self, worker_pools: WorkerPools, rounds: int = 12, max_concurrency: int = 4
+    ):
+        self.rounds = rounds
+        self._worker_pools = worker_pools
+        self._context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._dummy_hash: str | None = None
+
+    async def hash(self, password: str) -> str:
+        async with self._semaphore:
+            return await self._worker_pools.run_io(self._context.hash, password)
+
+    async def verify(self, password: str, hashed: str | None) -> bool:
+        """
+        Checks a password against a hash.
+
+        Without a hash (an unknown user) the password is checked against a
+        dummy hash, so a failed login takes as long whether or not the email
+        is registered.
+        """
+        if hashed is None:
+            if self._dummy_hash is None:
+                self._dummy_hash = await self.hash("dummy-password")
+            hashed = self._dummy_hash
+        async with self._semaphore:
+            return await self._worker_pools.run_io(self._verify, password, hashed)
+
+    def _verify(self, password: str, hashed: str) -> bool:
+        try:
+            return self._context.verify(password, hashed)
+        except ValueError:
+            # Not a hash this context understands
+            return False
+
+
+class TokenManager:
+    """
+    Issues and verifies signed JWT access tokens.
+
+    The signing and verification keys are parsed once, and verified tokens
+    are kept in a small LRU cache until they expire, so a client presenting
+    the same token on every request is only checked cryptographically once.
+    """
+
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str = "HS256",
+        expire_minutes: int = 30,
+        public_key: str | None = None,
+        issuer: str | None = None,
+        cache_size: int = 10000,
+    ):
+        self.algorithm = algorithm
+        self.expire_seconds = expire_minutes * 60
+        self.issuer = issuer
+        self.cache_size = cache_size
+        self._signing_key = jwk.construct(secret_key, algorithm)
+        # Asymmetric algorithms verify with the public key; HMAC with the secret
+        self._verifying_key = (
+            jwk.construct(public_key, algorithm) if public_key else self._signing_key
+        )
+        self._verified: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def issue(self, email: str, user_id: int, role: str) -> Tuple[str, int]:
+        """Returns a signed token and its lifetime in seconds."""
+        now = int(time.time())
+        claims = {
+            "sub": email,
+            "uid": user_id,
+            "role": role,
+            "iat": now,
+            "exp": now + self.expire_seconds,
+        }
+        if self.issuer:
+            claims["iss"] = self.issuer
+        token = jwt.encode(claims, self._signing_key, algorithm=self.algorithm)
+        return token, self.expire_seconds
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Returns a token's claims.
+
+        Raises:
+            InvalidTokenError: If the token is malformed, forged or expired
+        """
+        claims = self._verified.get(token)
+        if claims is not None:
+            if claims["exp"] > time.time():
+                self._verified.move_to_end(token)
+                self.cache_hits += 1
+                return claims
+            del self._verified[token]
+
+        self.cache_misses += 1
+        try:
+            claims = jwt.decode(
+                token,
+                self._verifying_key,
+                algorithms=[self.algorithm],
+                issuer=self.issuer,
+            )
+        except JWTError as e:
+            raise InvalidTokenError(str(e))
+        if any(name not in claims for name in _REQUIRED_CLAIMS):
+            raise InvalidTokenError("Token is missing required claims")
+
+        self._verified[token] = claims
+        if len(self._verified) > self.cache_size:
+            self._verified.popitem(last=False)
+        return claims
+
+    def stats(self) -> dict:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "cached_tokens": len(self._verified),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,126 @@
+"""
+This module provides utilities for compacting extracted resume text before it
+is sent to the LLM.
+"""
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+from app.utils.file_extractor import PAGE_BREAK
+from app.utils.llm_provider import estimate_tokens
+
+_WHITESPACE_RE = re.compile(r"[ \t\f\v ]+")
+_PAGE_NUMBER_RE = re.compile(
+    r"^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$|^-\s*\d{1,3}\s*-$", re.IGNORECASE
+)
+_DECORATION_RE = re.compile(r"^[\W_]+$")
+_BOILERPLATE = {
+    "curriculum vitae",
+    "resume",
+    "résumé",
+    "cv",
+    "confidential",
+    "references available upon request",
+    "references available on request",
+    "references: available upon request",
+}
+# Lines this close to the top or bottom of a page may be headers or footers
+_PAGE_EDGE_LINES = 3
+
+
+@dataclass
+class CompactedText:
+    text: str
+    tokens_before: int
+    tokens_after: int
+
+
+def _is_noise(line: str) -> bool:
+    lowered = line.lower().rstrip(".:")
+    return (
+        bool(_PAGE_NUMBER_RE.match(line))
+        or bool(_DECORATION_RE.match(line))
+        or lowered in _BOILERPLATE
+    )
+
+
+def _edge_lines(page: list[str]) -> set[tuple[int, str]]:
+    """
+    The first and last few non-blank lines of a page, keyed by their distance
+    from the top (positive) or bottom (negative) edge.
+    """
+    lines = [line for line in page if line]
+    top = [(i, line) for i, line in enumerate(lines[:_PAGE_EDGE_LINES])]
+    bottom = [(-i - 1, line) for i, line in enumerate(reversed(lines))]
+    return set(top + bottom[:_PAGE_EDGE_LINES])
+
+
+def _truncate(line: str, budget: int) -> str:
+    """Cuts a line to at most ``budget`` tokens, at a word boundary if any."""
+    cut = line[: max(0, 4 * budget - 1)]
+    if len(cut) < len(line) and " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut
+
+
+def compact_resume_text(
+    text: str, max_tokens: int, min_repeats: int = 3
+) -> CompactedText:
+    """
+    Removes noise from extracted resume text and trims it to a token budget.
+
+    - Collapses runs of spaces and tabs, and runs of blank lines
+    - Drops page numbers, decoration-only lines and boilerplate phrases
+    - Keeps only the first occurrence of consecutive duplicates, and of page
+      headers and footers: lines at the same place near the top or bottom of
+      at least ``min_repeats`` pages (or of every page, for shorter documents)
+    - Cuts at a line boundary once ``max_tokens`` is reached, truncating the
+      line that crosses it
+    """
+    tokens_before = estimate_tokens(text)
+
+    pages = [
+        [_WHITESPACE_RE.sub(" ", line).strip() for line in page.splitlines()]
+        for page in text.split(PAGE_BREAK)
+    ]
+    headers = set()
+    if len(pages) > 1:
+        edge_counts = Counter(line for page in pages for line in _edge_lines(page))
+        repeats = min(min_repeats, len(pages))
+        headers = {line for (_, line), count in edge_counts.items() if count >= repeats}
+
+    kept = []
+    seen_headers = set()
+    previous = None
+    budget = max_tokens
+    for line in (line for page in pages for line in page):
+        if not line:
+            # Collapse blank runs to a single separator line
+            if kept and kept[-1] != "":
+                kept.append("")
+            previous = None
+            continue
+        if line == previous or _is_noise(line):
+            continue
+        if line in headers:
+            if line in seen_headers:
+                continue
+            seen_headers.add(line)
+
+        line_tokens = estimate_tokens(line)
+        if line_tokens > budget:
+            # Keep what fits of the line that crosses the budget
+            line = _truncate(line, budget)
+            if line:
+                kept.append(line)
+            break
+        budget -= line_tokens
+        kept.append(line)
+        previous = line
+
+    compacted = "\n".join(kept).strip()
+    return CompactedText(
+        text=compacted,
+        tokens_before=tokens_before,
+        tokens_after=estimate_tokens(compacted),
+    )
@@ -0,0 +1,175 @@
+"""
+This module provides an on-disk store for text extracted from resume files.
+
+Extraction output depends only on the file content and the extractor, so it
+is stored once per ``(content hash, extractor version)`` key and re-parsing a
+resume reads the text back instead of running pdfplumber again.
+
+Texts are zlib-compressed and appended to a single segment file, which
+readers map into memory; an append-only index file maps each key to its
+offset and length. Writers hold an exclusive ``flock`` on the index, so
+several server processes can share one store, and each process picks up the
+others' entries by reading the index tail on a miss.
+"""
+import fcntl
+import logging
+import mmap
+import os
+import threading
+import zlib
+from typing import Dict, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+_SEGMENT_FILE = "texts.bin"
+_INDEX_FILE = "index.tsv"
+
+
+class _Location(NamedTuple):
+    offset: int
+    length: int
+    text_length: int
+
+
+class ExtractedTextStore:
+    """
+    Extracted text by file content hash and extractor version.
+
+    Entries are never rewritten; once the segment reaches ``max_bytes`` new
+    texts are no longer stored (and are extracted again on every parse).
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1024 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._segment_path = os.path.join(directory, _SEGMENT_FILE)
+        self._index_path = os.path.join(directory, _INDEX_FILE)
+        # Both files are created up front so readers can always open them
+        for path in (self._segment_path, self._index_path):
+            open(path, "ab").close()
+
+        self._index: Dict[str, _Location] = {}
+        self._index_position = 0
+        self._map: mmap.mmap | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.skipped_writes = 0
+        self._text_bytes = 0
+        with self._lock:
+            self._read_index_tail()
+
+    @staticmethod
+    def make_key(content_hash: str, extractor_version: str) -> str:
+        return f"{content_hash}:{extractor_version}"
+
+    def get(self, key: str) -> str | None:
+        """Returns the stored text for a key, or None on a miss."""
+        with self._lock:
+            location = self._index.get(key)
+            if location is None:
+                # Another process may have stored it since the last look
+                self._read_index_tail()
+                location = self._index.get(key)
+            if location is None:
+                self.misses += 1
+                return None
+            try:
+                payload = self._read(location)
+                text = zlib.decompress(payload).decode("utf-8")
+            except (OSError, ValueError, zlib.error) as e:
+                logger.warning(f"Failed to read stored text {key}: {e}")
+                self.misses += 1
+                return None
+            self.hits += 1
+            return text
+
+    def put(self, key: str, text: str) -> None:
+        """Stores the text for a key unless it is already stored."""
+        encoded = text.encode("utf-8")
+        payload = zlib.compress(encoded)
+        with self._lock:
+            try:
+                self._append(key, payload, len(encoded))
+            except OSError as e:
+                logger.warning(f"Failed to store extracted text {key}: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "writes": self.writes,
+                "skipped_writes": self.skipped_writes,
+                "entries": len(self._index),
+                "text_bytes": self._text_bytes,
+                "disk_bytes": os.path.getsize(self._segment_path)
+                + os.path.getsize(self._index_path),
+                "max_bytes": self.max_bytes,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+    def _read(self, location: _Location) -> bytes:
+        end = location.offset + location.length
+        if self._map is None or end > len(self._map):
+            # The segment has grown since it was mapped
+            if self._map is not None:
+                self._map.close()
+            with open(self._segment_path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map[location.offset : end]
+
+    def _read_index_tail(self) -> None:
+        with open(self._index_path, "rb") as f:
+            f.seek(self._index_position)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Being written by another process; read it next time
+                    break
+                self._index_position += len(line)
+                self._add_index_line(line)
+
+    def _add_index_line(self, line: bytes) -> None:
+        try:
+            key, offset, length, text_length = line.decode("utf-8").split("\t")
+            location = _Location(int(offset), int(length), int(text_length))
+        except ValueError:
+            logger.warning("Skipping corrupt extracted text index entry")
+            return
+        if key not in self._index:
+            self._text_bytes += location.text_length
+        self._index[key] = location
+
+    def _append(self, key: str, payload: bytes, text_length: int) -> None:
+        with open(self._index_path, "ab+") as index:
+            fcntl.flock(index, fcntl.LOCK_EX)
+            try:
+                self._read_index_tail()
+                if key in self._index:
+                    return
+                with open(self._segment_path, "ab") as segment:
+                    offset = segment.seek(0, os.SEEK_END)
+                    if offset + len(payload) > self.max_bytes:
+                        self.skipped_writes += 1
+                        return
+                    segment.write(payload)
+                # The segment is written before the entry that points into it,
+                # so readers never see an entry for missing bytes
+                line = f"{key}\t{offset}\t{len(payload)}\t{text_length}\n"
+                encoded = line.encode("utf-8")
+                index.write(encoded)
+                index.flush()
+                self._index_position += len(encoded)
+                self._add_index_line(encoded)
+                self.writes += 1
+            finally:
+                fcntl.flock(index, fcntl.LOCK_UN)
@@ -1,18 +1,52 @@
+import asyncio
 import logging
+import os
+import secrets
+import sys
+import time
 from typing import Optional
 
-from app.api.base_components import BaseAPI
+from app.api.admin.controllers import AdminController
+from app.api.admin.services import AdminService
+from app.api.base_components import BaseAPI, Response
+from app.api.resume_scanner.bulk import BulkIngestionPipeline
 from app.api.resume_scanner.controllers import ResumeScannerController
+from app.api.resume_scanner.jobs import ParseJobQueue
+from app.api.resume_scanner.ranking import SPARSE_MODULE, ResumeRankingEngine
 from app.api.resume_scanner.repositories import ResumeRepository
+from app.api.resume_scanner.search import ResumeSearchIndex
 from app.api.resume_scanner.services import ResumeScannerService
+from app.api.user_management.auth import current_user
 from app.api.user_management.controllers import UserManagementController
 from app.api.user_management.services import UserManagementService
-from app.db.database import Database
-from app.exceptions.exception_handlers import resume_processing_exception_handler
-from app.exceptions.exceptions import ResumeProcessingError
+from app.config.config import AppConfig
+from app.db.database import BaseDatabase, Database
+from app.db.sqlite_database import SQLiteDatabase
+from app.exceptions.exception_handlers import (
+    authentication_exception_handler,
+    resume_processing_exception_handler,
+)
+from app.exceptions.exceptions import AuthenticationError, ResumeProcessingError
+from app.utils.admission import AdmissionController
+from app.utils.executors import WorkerPools
+from app.utils.file_extractor import EXTRACTORS
+from app.utils.file_storage import ContentAddressedStorage
+from app.utils.llm_cache import LLMResultCache
+from app.utils.llm_provider import LLMClient, create_llm_provider
+from app.utils.metrics import REGISTRY, MetricsRegistry
+from app.utils.minhash import MinHasher, MinHashLSH
+from app.utils.profiler import ProfileStore, RequestProfiler
+from app.utils.registry import import_timings, warm_up_modules
+from app.utils.rule_extractor import RuleBasedExtractor, load_skill_vocabulary
+from app.utils.security import PasswordHasher, TokenManager
+from app.utils.text_store import ExtractedTextStore
 
 logger = logging.getLogger(__name__)
-# config = AppConfig.from_yaml()
+config = AppConfig.from_env()
+
+# Third-party modules that are slow to import; the startup report shows
+# which of them a process has loaded
+HEAVY_MODULES = ["pdfplumber", "docx", "google.generativeai", SPARSE_MODULE]
 
 
 class AppContext:
@@ -22,11 +56,20 @@ class AppContext:
 
     # Service instances (initialized later)
     user_management_service: Optional[UserManagementService] = None
+    token_manager: Optional[TokenManager] = None
+    admission: Optional[AdmissionController] = None
     resume_scanner_service: Optional[ResumeScannerService] = None
+    worker_pools: Optional[WorkerPools] = None
+    parse_job_queue: Optional[ParseJobQueue] = None
+    database: Optional[BaseDatabase] = None
+    llm_client: Optional[LLMClient] = None
+    text_store: Optional[ExtractedTextStore] = None
 
     api: Optional[BaseAPI] = None
     controllers: list = []
 
+    startup: dict = {}
+    _warm_up_task: Optional[asyncio.Task] = None
     _initialized: bool = False
 
     @classmethod
@@ -44,19 +87,154 @@ class AppContext:
             logger.warning("AppContext already initialized")
             return
 
+        started = time.perf_counter()
         try:
             logger.info("Initializing AppContext...")
 
             # Database initialization
+            cls.database = cls._create_database()
 
             # Services
             logger.info("Initializing services...")
-            cls.user_management_service = UserManagementService()
 
-            # Initialize database and repository for resume scanner
-            db = Database()
-            resume_repository = ResumeRepository(db)
-            cls.resume_scanner_service = ResumeScannerService(resume_repository)
+            # Repository for resume scanner
+            resume_repository = ResumeRepository(
+                cls.database,
+                search_index=ResumeSearchIndex(),
+                ranking_engine=ResumeRankingEngine(
+                    k1=config.ranking_bm25_k1, b=config.ranking_bm25_b
+                ),
+                duplicate_index=MinHashLSH(
+                    num_perm=config.minhash_permutations, bands=config.minhash_bands
+                ),
+            )
+            cls.worker_pools = WorkerPools(
+                cpu_workers=config.extraction_workers,
+                io_workers=config.llm_workers,
+                cpu_timeout_seconds=config.extraction_timeout_seconds,
+                cpu_max_rss_bytes=config.extraction_max_rss_mb * 1024 * 1024,
+                cpu_max_tasks_per_child=config.extraction_max_tasks_per_child,
+                cpu_warm_up_modules=(
+                    EXTRACTORS.backends() if config.warm_up != "none" else ()
+                ),
+            )
+            cls.token_manager = cls._create_token_manager()
+            current_user.token_manager = cls.token_manager
+            cls.admission = (
+                AdmissionController(
+                    cls.token_manager,
+                    user_rates=config.admission_user_rates,
+                    role_rates=config.admission_role_rates,
+                    max_in_flight=config.admission_max_in_flight,
+                    max_queued=config.admission_max_queued,
+                    queue_timeout_seconds=config.admission_queue_timeout_seconds,
+                    burst_seconds=config.admission_burst_seconds,
+                )
+                if config.admission_enabled
+                else None
+            )
+            cls.user_management_service = UserManagementService(
+                cls.database,
+                PasswordHasher(
+                    cls.worker_pools,
+                    rounds=config.password_hash_rounds,
+                    max_concurrency=config.password_hash_concurrency,
+                ),
+                cls.token_manager,
+            )
+            storage = ContentAddressedStorage(
+                root=config.media_path,
+                max_bytes=config.max_upload_bytes,
+                chunk_size=config.upload_chunk_size,
+            )
+            cls.llm_client = LLMClient(
+                provider=create_llm_provider(
+                    config.llm_provider,
+                    api_key=config.gemini_api_key,
+                    model_name=config.llm_model,
+                    fake_latency_seconds=config.fake_llm_latency_seconds,
+                    fake_error_rate=config.fake_llm_error_rate,
+                ),
+                max_concurrency=config.llm_max_concurrency,
+                requests_per_minute=config.llm_requests_per_minute,
+                tokens_per_minute=config.llm_tokens_per_minute,
+                max_retries=config.llm_max_retries,
+                backoff_base_seconds=config.llm_backoff_base_seconds,
+                backoff_max_seconds=config.llm_backoff_max_seconds,
+            )
+            llm_cache = LLMResultCache(
+                max_bytes=config.llm_cache_max_bytes,
+                disk_path=config.llm_cache_dir,
+            )
+            if config.extracted_text_enabled:
+                cls.text_store = ExtractedTextStore(
+                    config.extracted_text_dir
+                    or os.path.join(config.media_path, "extracted_text"),
+                    max_bytes=config.extracted_text_max_bytes,
+                )
+            cls.resume_scanner_service = ResumeScannerService(
+                resume_repository,
+                cls.worker_pools,
+                cls.llm_client,
+                llm_cache,
+                pdf_max_pages=config.pdf_max_pages,
+                pdf_pages_per_task=config.pdf_pages_per_task,
+                slow_page_seconds=config.slow_page_seconds,
+                prompt_max_tokens=config.prompt_max_tokens,
+                rule_extractor=(
+                    RuleBasedExtractor(
+                        load_skill_vocabulary(config.skills_vocabulary_path)
+                    )
+                    if config.fast_path_enabled
+                    else None
+                ),
+                fast_path_confidence=config.fast_path_confidence,
+                minhasher=(
+                    MinHasher(num_perm=config.minhash_permutations)
+                    if config.near_duplicate_enabled
+                    else None
+                ),
+                near_duplicate_threshold=config.near_duplicate_threshold,
+                reuse_duplicate_parses=config.near_duplicate_reuse_parse,
+                text_store=cls.text_store,
+                sectioned_min_tokens=(
+                    config.llm_sectioned_min_tokens
+                    if config.llm_sectioned_extraction
+                    else None
+                ),
+            )
+            cls.parse_job_queue = ParseJobQueue(
+                cls.resume_scanner_service,
+                concurrency=config.parse_job_workers,
+                max_queue_size=config.parse_job_queue_size,
+                # Other workers may be asked for the jobs this one accepted
+                shared_db=cls.database if config.api_workers > 1 else None,
+            )
+
+            bulk_pipeline = BulkIngestionPipeline(
+                cls.resume_scanner_service,
+                storage,
+                extract_concurrency=config.extraction_workers,
+                llm_concurrency=config.llm_workers,
+                batch_size=config.bulk_batch_size,
+            )
+
+            profiler = None
+            if config.profiling_enabled:
+                if config.profiling_token is None:
+                    logger.warning(
+                        "Request profiling is enabled without PROFILING_TOKEN; "
+                        "anyone can trigger profiles and read reports"
+                    )
+                profiler = RequestProfiler(
+                    ProfileStore(
+                        max_reports=config.profiling_max_reports,
+                        directory=config.profiling_dir,
+                    ),
+                    mode=config.profiling_mode,
+                    sample_rate=config.profiling_sample_rate,
+                    token=config.profiling_token,
+                )
 
             logger.info("Services initialized successfully")
 
@@ -65,26 +243,45 @@ class AppContext:
             api_version = "v1"
             cls.controllers = [
                 UserManagementController(cls.user_management_service, api_version),
-                ResumeScannerController(cls.resume_scanner_service, api_version),
+                ResumeScannerController(
+                    cls.resume_scanner_service,
+                    cls.parse_job_queue,
+                    bulk_pipeline,
+                    api_version,
+                    storage,
+                ),
+                AdminController(
+                    AdminService(profiler, startup_report=cls.startup_report),
+                    api_version,
+                ),
             ]
             logger.info("Controllers initialized successfully")
 
             # API
             logger.info("Initializing API...")
+            Response.fast_encoding = config.fast_response_encoding
             cls.api = BaseAPI(
-                ip="0.0.0.0",
-                port=8000,
+                ip=config.api_host,
+                port=config.api_port,
                 debug=True,
                 title="Resume Scanner API",
                 description="API for parsing and managing resumes.",
                 version="1.0.0",
                 summary="Resume Scanner API",
+                metrics_registry=REGISTRY if config.metrics_enabled else None,
+                profiler=profiler,
+                admission=cls.admission,
             )
+            if config.metrics_enabled:
+                cls._register_metric_collectors(REGISTRY, llm_cache, resume_repository)
 
             # Register controllers
             cls.api.register_controllers(controllers=cls.controllers)
             cls.api.register_exception_handlers(
-                [(ResumeProcessingError, resume_processing_exception_handler)]
+                [
+                    (ResumeProcessingError, resume_processing_exception_handler),
+                    (AuthenticationError, authentication_exception_handler),
+                ]
             )
             logger.info("Controllers registered successfully")
 
@@ -93,18 +290,182 @@ class AppContext:
             logger.info("API initialized successfully")
 
             cls._initialized = True
-            logger.info("AppContext initialization complete")
+            cls.startup = {
+                "initialize_seconds": round(time.perf_counter() - started, 4),
+                "warm_up": config.warm_up,
+            }
+            logger.info(
+                "AppContext initialization complete in "
+                f"{cls.startup['initialize_seconds']:.3f}s"
+            )
+
+            if config.warm_up == "eager":
+                await cls.warm_up()
+            elif config.warm_up == "background":
+                cls._warm_up_task = asyncio.create_task(cls.warm_up())
 
         except Exception as e:
             logger.error(f"Failed to initialize AppContext: {str(e)}")
             raise
 
+    @classmethod
+    def _create_database(cls) -> BaseDatabase:
+        """Opens the store selected by ``DB_BACKEND``."""
+        if config.db_backend == "memory":
+            return Database(
+                data_dir=config.db_data_dir,
+                snapshot_every=config.db_snapshot_every,
+            )
+        if config.db_backend == "sqlite":
+            path = config.db_sqlite_path or os.path.join(
+                config.db_data_dir or config.media_path, "resume_scanner.sqlite3"
+            )
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            logger.info(f"Using SQLite database at {path}")
+            return SQLiteDatabase(path, pool_size=config.db_pool_size)
+        raise ValueError(f"Unknown DB_BACKEND: {config.db_backend}")
+
+    @classmethod
+    def _create_token_manager(cls) -> TokenManager:
+        secret_key = config.jwt_secret_key
+        if secret_key is None:
+            logger.warning(
+                "JWT_SECRET_KEY is not set; access tokens are signed with a "
+                "per-process key and stop working when the server restarts"
+            )
+            secret_key = secrets.token_urlsafe(32)
+        return TokenManager(
+            secret_key,
+            algorithm=config.jwt_algorithm,
+            expire_minutes=config.jwt_expire_minutes,
+            public_key=config.jwt_public_key,
+            issuer=config.jwt_issuer,
+            cache_size=config.jwt_verify_cache_size,
+        )
+
+    @classmethod
+    async def warm_up(cls) -> None:
+        """
+        Starts the extraction workers (which import their backends) and loads
+        the LLM provider's SDK and SciPy, so the first parse or ranking does
+        not pay for them.
+        """
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(
+                asyncio.to_thread(cls.worker_pools.sandbox.start),
+                asyncio.to_thread(cls.llm_client.provider.warm_up),
+                asyncio.to_thread(warm_up_modules, [SPARSE_MODULE]),
+            )
+        except Exception as e:
+            # Backends are imported on first use instead
+            logger.warning(f"Warm-up failed: {e}")
+            return
+        cls.startup["warm_up_seconds"] = round(time.perf_counter() - started, 4)
+        logger.info(f"Warm-up complete in {cls.startup['warm_up_seconds']:.3f}s")
+
+    @classmethod
+    def startup_report(cls) -> dict:
+        """Startup timings, lazy import timings and which backends are loaded."""
+        return {
+            **cls.startup,
+            "lazy_imports": {
+                module: round(seconds, 4)
+                for module, seconds in import_timings().items()
+            },
+            "loaded_modules": {
+                module: module in sys.modules for module in HEAVY_MODULES
+            },
+        }
+
+    @classmethod
+    def _register_metric_collectors(
+        cls,
+        registry: MetricsRegistry,
+        llm_cache: LLMResultCache,
+        resume_repository: ResumeRepository,
+    ) -> None:
+        """Exposes component statistics that are read on every scrape."""
+        registry.register_collector(
+            "llm_cache",
+            "LLM result cache statistics.",
+            lambda: [({"stat": k}, v) for k, v in llm_cache.stats().items()],
+        )
+        registry.register_collector(
+            "extraction_sandbox",
+            "Extraction sandbox worker statistics.",
+            lambda: [
+                ({"stat": k}, v) for k, v in cls.worker_pools.sandbox.stats().items()
+            ],
+        )
+        registry.register_collector(
+            "extracted_text_store",
+            "Extracted text store reuse and disk usage.",
+            lambda: [
+                ({"stat": k}, v)
+                for k, v in cls.resume_scanner_service.text_store_stats().items()
+                if k != "enabled"
+            ],
+        )
+        registry.register_collector(
+            "access_token_cache",
+            "Verified access token cache statistics.",
+            lambda: [({"stat": k}, v) for k, v in cls.token_manager.stats().items()],
+        )
+        if cls.admission is not None:
+            registry.register_collector(
+                "admission",
+                "Admission control slots, queue and tracked callers.",
+                lambda: [({"stat": k}, v) for k, v in cls.admission.stats().items()],
+            )
+        registry.register_collector(
+            "parse_job_queue_depth",
+            "Parse jobs waiting for a worker.",
+            lambda: [({}, cls.parse_job_queue.depth)],
+        )
+        registry.register_collector(
+            "fast_path_fields_answered_total",
+            "Fields answered by the rule-based fast path.",
+            lambda: [
+                ({"field": name}, field["answered"])
+                for name, field in cls.resume_scanner_service.fast_path_stats()[
+                    "fields"
+                ].items()
+            ],
+            kind="counter",
+        )
+        registry.register_collector(
+            "resume_index_documents",
+            "Resumes held by each in-memory index.",
+            lambda: [
+                ({"index": name}, size)
+                for name, size in resume_repository.index_sizes().items()
+            ],
+        )
+
     @classmethod
     async def shutdown(cls) -> None:
         """Shutdown application context and cleanup resources."""
         try:
             logger.info("Shutting down application context")
 
+            if cls._warm_up_task is not None:
+                cls._warm_up_task.cancel()
+                cls._warm_up_task = None
+
+            if cls.parse_job_queue is not None:
+                await cls.parse_job_queue.shutdown()
+                cls.parse_job_queue = None
+            if cls.worker_pools is not None:
+                cls.worker_pools.shutdown()
+                cls.worker_pools = None
+            if cls.database is not None:
+                cls.database.close()
+                cls.database = None
+            if cls.text_store is not None:
+                cls.text_store.close()
+                cls.text_store = None
+
             cls._initialized = False
             logger.info("Application context shutdown complete")
 
@@ -0,0 +1,132 @@
+"""
+Drives the synchronous parse route above its capacity and compares latency
+with and without admission control.
+
+Requests arrive at a fixed rate (open loop) while the fake LLM provider
+serves ``LLM_MAX_CONCURRENCY`` calls at a time. Without admission control
+the backlog, and with it the latency of every later request, grows for as
+long as the overload lasts; with it the excess is shed with 429s and the
+latency of admitted requests stays bounded by the in-flight limit and queue.
+
+Usage:
+    python -m benchmarks.bench_admission [--rate 30] [--duration 10]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+
+from benchmarks.common import summarize, write_results
+
+SAMPLE_RESUME = b"""John Doe
+john.doe@example.com
++1 555 0100
+
+Skills: Python, FastAPI, PostgreSQL
+"""
+
+
+async def _drive(args, admission: bool) -> dict:
+    import app_context
+    from app_context import AppContext
+
+    app_context.config.admission_enabled = admission
+    await AppContext.initialize()
+    total = int(args.rate * args.duration)
+
+    async with httpx.AsyncClient(
+        app=AppContext.api.app, base_url="http://bench", timeout=None
+    ) as client:
+        response = await client.post(
+            "/api/v1/resumes/upload",
+            files={"file": ("resume.txt", SAMPLE_RESUME, "text/plain")},
+        )
+        resume_id = response.json()["body"]["id"]
+        # Warm the worker pools so process start-up is not measured
+        await client.post(f"/api/v1/resumes/{resume_id}/parse")
+
+        admitted: list[float] = []
+        shed: list[float] = []
+        statuses: Counter = Counter()
+
+        async def parse() -> None:
+            start = time.perf_counter()
+            response = await client.post(f"/api/v1/resumes/{resume_id}/parse")
+            elapsed = time.perf_counter() - start
+            statuses[response.status_code] += 1
+            (shed if response.status_code == 429 else admitted).append(elapsed)
+
+        tasks = []
+        started = time.perf_counter()
+        for i in range(total):
+            # Open loop: arrivals do not wait for earlier responses
+            await asyncio.sleep(max(0.0, started + i / args.rate - time.perf_counter()))
+            tasks.append(asyncio.create_task(parse()))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    await AppContext.shutdown()
+    return {
+        "requests": total,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "served_per_second": round(len(admitted) / elapsed, 2),
+        "admitted": summarize(admitted),
+        "shed": summarize(shed),
+    }
+
+
+async def _run(args) -> dict:
+    return {
+        "without_admission": await _drive(args, admission=False),
+        "with_admission": await _drive(args, admission=True),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=float, default=30)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--llm-concurrency", type=int, default=8)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--max-queued", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as media_path:
+        os.environ.update(
+            MEDIA_PATH=media_path,
+            LLM_PROVIDER="fake",
+            FAKE_LLM_LATENCY_SECONDS=str(args.llm_latency),
+            LLM_MAX_CONCURRENCY=str(args.llm_concurrency),
+            LLM_REQUESTS_PER_MINUTE="1000000",
+            # Every parse uses the same text; make each one reach the LLM
+            LLM_CACHE_MAX_BYTES="0",
+            NEAR_DUPLICATE_ENABLED="false",
+            FAST_PATH_ENABLED="false",
+            # Only the in-flight limit and queue should shed in this run
+            ADMISSION_USER_RATES="anonymous=1000000",
+            ADMISSION_ROLE_RATES="",
+            ADMISSION_MAX_IN_FLIGHT=str(args.max_in_flight),
+            ADMISSION_MAX_QUEUED=str(args.max_queued),
+        )
+        results = asyncio.run(_run(args))
+    write_results(
+        "admission",
+        {
+            "arrival_rate": args.rate,
+            "duration_s": args.duration,
+            "llm_latency_s": args.llm_latency,
+            "llm_concurrency": args.llm_concurrency,
+            "max_in_flight": args.max_in_flight,
+            "max_queued": args.max_queued,
+            "results": results,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
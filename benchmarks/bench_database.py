@@ -0,0 +1,106 @@
+"""
+Measures Database insert and lookup cost as the number of records grows.
+
+``--backend sqlite`` runs the same workload against ``SQLiteDatabase`` in a
+temporary file, and also times inserts batched through ``add_many``.
+
+Usage:
+    python -m benchmarks.bench_database [--sizes 10000 100000 1000000]
+        [--backend memory|sqlite]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from app.db.database import Database
+from app.db.sqlite_database import SQLiteDatabase
+from benchmarks.common import stopwatch, summarize, write_results
+
+LOOKUPS = 10000
+INSERT_BATCH = 100
+
+
+def _record(i: int) -> dict:
+    return {
+        "resume_id": i,
+        "email": f"candidate{i}@example.com",
+        "full_name": f"Candidate {i}",
+        "skills": ["Python", "FastAPI"],
+    }
+
+
+def _open(backend: str, directory: str, name: str):
+    if backend == "sqlite":
+        return SQLiteDatabase(os.path.join(directory, f"{name}.sqlite3"))
+    return Database()
+
+
+def _bench_size(size: int, backend: str, directory: str) -> dict:
+    db = _open(backend, directory, f"single-{size}")
+    start = time.perf_counter()
+    for i in range(1, size + 1):
+        db.add("parsed_resumes", _record(i))
+    insert_seconds = time.perf_counter() - start
+
+    batched_db = _open(backend, directory, f"batched-{size}")
+    start = time.perf_counter()
+    for first in range(1, size + 1, INSERT_BATCH):
+        batched_db.add_many(
+            "parsed_resumes",
+            [_record(i) for i in range(first, min(first + INSERT_BATCH, size + 1))],
+        )
+    batched_seconds = time.perf_counter() - start
+    batched_db.close()
+
+    rng = random.Random(size)
+    ids = [rng.randint(1, size) for _ in range(LOOKUPS)]
+
+    by_id: list[float] = []
+    for record_id in ids:
+        with stopwatch(by_id):
+            db.get_by_id("parsed_resumes", record_id)
+
+    by_index: list[float] = []
+    for record_id in ids:
+        with stopwatch(by_index):
+            db.find_by("parsed_resumes", "email", f"candidate{record_id}@example.com")
+
+    # The previous implementation scanned the table; a handful of scans is
+    # enough to show the gap.
+    rows = db.get_all("parsed_resumes")
+    scans: list[float] = []
+    for record_id in ids[:20]:
+        with stopwatch(scans):
+            next(r for r in rows if r["id"] == record_id)
+
+    db.close()
+    return {
+        "records": size,
+        "insert_per_record_us": round(insert_seconds / size * 1e6, 3),
+        f"add_many_{INSERT_BATCH}_per_record_us": round(
+            batched_seconds / size * 1e6, 3
+        ),
+        "get_by_id": summarize(by_id),
+        "find_by_indexed_email": summarize(by_index),
+        "linear_scan_baseline": summarize(scans),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        results = [_bench_size(n, args.backend, directory) for n in args.sizes]
+    write_results(
+        f"database_{args.backend}", {"backend": args.backend, "results": results}
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Measures login and upload latency while slow parses are in flight.
+
+The fake LLM provider stands in for Gemini so the benchmark runs offline.
+With the parse path off the event loop, login/upload latency should stay in
+the low milliseconds regardless of how long the simulated LLM call takes.
+
+Usage:
+    python -m benchmarks.bench_event_loop [--parses 8] [--llm-latency 2.0]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+
+import httpx
+
+from benchmarks.common import stopwatch, summarize, write_results
+
+SAMPLE_RESUME = b"""John Doe
+john.doe@example.com
++1 555 0100
+
+Skills: Python, FastAPI, PostgreSQL
+"""
+
+
+async def _run(parses: int, probes: int, llm_latency: float) -> dict:
+    from app_context import AppContext
+
+    await AppContext.initialize()
+    app = AppContext.api.app
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        await client.post(
+            "/api/v1/users/register",
+            json={
+                "email": "bench@example.com",
+                "password": "benchmark-password",
+                "role": "recruiter",
+            },
+        )
+        response = await client.post(
+            "/api/v1/resumes/upload",
+            files={"file": ("resume.txt", SAMPLE_RESUME, "text/plain")},
+        )
+        resume_id = response.json()["body"]["id"]
+
+        # Warm the worker pools so process start-up is not measured
+        await client.post(f"/api/v1/resumes/{resume_id}/parse")
+
+        login_samples: list[float] = []
+        upload_samples: list[float] = []
+        parse_samples: list[float] = []
+
+        async def parse() -> None:
+            with stopwatch(parse_samples):
+                await client.post(f"/api/v1/resumes/{resume_id}/parse")
+
+        async def probe() -> None:
+            for i in range(probes):
+                with stopwatch(login_samples):
+                    await client.post(
+                        "/api/v1/users/login",
+                        data={
+                            "username": "bench@example.com",
+                            "password": "benchmark-password",
+                        },
+                    )
+                with stopwatch(upload_samples):
+                    await client.post(
+                        "/api/v1/resumes/upload",
+                        files={"file": (f"probe-{i}.txt", SAMPLE_RESUME, "text/plain")},
+                    )
+                await asyncio.sleep(llm_latency / probes)
+
+        await asyncio.gather(*(parse() for _ in range(parses)), probe())
+
+    await AppContext.shutdown()
+    return {
+        "parses_in_flight": parses,
+        "llm_latency_s": llm_latency,
+        "parse": summarize(parse_samples),
+        "login": summarize(login_samples),
+        "upload": summarize(upload_samples),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--parses", type=int, default=8)
+    parser.add_argument("--probes", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as media_path:
+        os.environ["MEDIA_PATH"] = media_path
+        os.environ["LLM_PROVIDER"] = "fake"
+        os.environ["FAKE_LLM_LATENCY_SECONDS"] = str(args.llm_latency)
+        # Every parse uses the same text; keep the LLM cache out of the way
+        os.environ["LLM_CACHE_MAX_BYTES"] = "0"
+        results = asyncio.run(_run(args.parses, args.probes, args.llm_latency))
+    write_results("event_loop", results)
+
+
+if __name__ == "__main__":
+    main()
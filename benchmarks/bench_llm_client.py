@@ -0,0 +1,75 @@
+"""
+Measures LLMClient throughput and latency against the fake provider.
+
+Shows the effect of the concurrency limit, the request rate limit and
+retries on transient errors without calling a real model.
+
+Usage:
+    python -m benchmarks.bench_llm_client [--requests 200] [--error-rate 0.1]
+"""
+import argparse
+import asyncio
+import time
+
+from app.utils.llm_provider import FakeLLMProvider, LLMClient, LLMProviderError
+from benchmarks.common import stopwatch, summarize, write_results
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    provider = FakeLLMProvider(
+        latency_seconds=args.latency,
+        jitter_seconds=args.latency / 4,
+        error_rate=args.error_rate,
+        seed=7,
+    )
+    client = LLMClient(
+        provider,
+        max_concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        max_retries=args.retries,
+        backoff_base_seconds=0.05,
+        backoff_max_seconds=1.0,
+    )
+    prompt = "Resume text " * 500
+    samples: list[float] = []
+    failed = 0
+
+    async def one() -> None:
+        nonlocal failed
+        with stopwatch(samples):
+            try:
+                await client.generate(prompt)
+            except LLMProviderError:
+                failed += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "config": vars(args),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(args.requests / elapsed, 2),
+        "failed": failed,
+        "latency": summarize(samples),
+        "client": client.stats(),
+        "provider_calls": provider.calls,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--rpm", type=float, default=6000)
+    parser.add_argument("--tpm", type=float, default=10_000_000)
+    parser.add_argument("--retries", type=int, default=3)
+    args = parser.parse_args()
+    write_results("llm_client", asyncio.run(_run(args)))
+
+
+if __name__ == "__main__":
+    main()
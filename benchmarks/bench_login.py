@@ -0,0 +1,117 @@
+"""
+Measures login throughput and event-loop responsiveness with bcrypt run on
+the event loop versus in the I/O thread pool, and the cost of verifying an
+access token with and without the verified-token cache.
+
+Event-loop lag is sampled by a task that sleeps 5 ms at a time and records
+how late it wakes up; with hashing on the loop every login blocks it for the
+whole bcrypt computation.
+
+Usage:
+    python -m benchmarks.bench_login [--logins 40] [--rounds 10]
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+
+from passlib.context import CryptContext
+
+from app.utils.executors import WorkerPools
+from app.utils.security import PasswordHasher, TokenManager
+from benchmarks.common import summarize, write_results
+
+PASSWORD = "benchmark-password"
+_LAG_INTERVAL = 0.005
+
+
+async def _measure(
+    verify: Callable[[str, str], Awaitable[bool]], hashed: str, logins: int
+) -> dict:
+    lag: List[float] = []
+    latencies: List[float] = []
+    stopped = asyncio.Event()
+
+    async def probe() -> None:
+        while not stopped.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(_LAG_INTERVAL)
+            lag.append(time.perf_counter() - start - _LAG_INTERVAL)
+
+    async def login() -> None:
+        start = time.perf_counter()
+        if not await verify(PASSWORD, hashed):
+            raise RuntimeError("Password did not verify")
+        latencies.append(time.perf_counter() - start)
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.sleep(_LAG_INTERVAL * 2)
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stopped.set()
+    await probe_task
+    return {
+        "logins_per_second": round(logins / elapsed, 2),
+        "login": summarize(latencies),
+        "event_loop_lag": summarize(lag),
+    }
+
+
+def _token_verify_us(manager: TokenManager, token: str, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        manager.verify(token)
+    return round((time.perf_counter() - start) / repeats * 1e6, 2)
+
+
+async def _run(args) -> dict:
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=args.rounds)
+    hashed = context.hash(PASSWORD)
+
+    async def inline(password: str, hashed: str) -> bool:
+        return context.verify(password, hashed)
+
+    results = {"event_loop": await _measure(inline, hashed, args.logins)}
+    for concurrency in args.concurrency:
+        pools = WorkerPools(cpu_workers=1, io_workers=args.io_workers)
+        hasher = PasswordHasher(pools, rounds=args.rounds, max_concurrency=concurrency)
+        results[f"thread_pool_x{concurrency}"] = await _measure(
+            hasher.verify, hashed, args.logins
+        )
+        pools.shutdown()
+
+    token_manager = TokenManager("benchmark-secret", cache_size=0)
+    token, _ = token_manager.issue("bench@example.com", 1, "recruiter")
+    cached_manager = TokenManager("benchmark-secret")
+    return {
+        "logins": results,
+        "token_verify_us": {
+            "uncached": _token_verify_us(token_manager, token, args.verifications),
+            "cached": _token_verify_us(cached_manager, token, args.verifications),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--io-workers", type=int, default=8)
+    parser.add_argument("--verifications", type=int, default=5000)
+    args = parser.parse_args()
+
+    results = asyncio.run(_run(args))
+    write_results(
+        "login",
+        {
+            "bcrypt_rounds": args.rounds,
+            "logins": args.logins,
+            "results": results,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
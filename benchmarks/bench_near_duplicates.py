@@ -0,0 +1,93 @@
+"""
+Measures MinHash signature, LSH insert and LSH query cost as the corpus
+grows, plus recall on lightly edited copies.
+
+Usage:
+    python -m benchmarks.bench_near_duplicates [--sizes 10000 100000]
+"""
+import argparse
+import random
+import time
+
+from app.utils.minhash import MinHasher, MinHashLSH
+from benchmarks.common import stopwatch, summarize, write_results
+
+VOCABULARY = [f"word{i}" for i in range(50000)]
+WORDS_PER_RESUME = 400
+QUERIES = 500
+THRESHOLD = 0.85
+
+
+def _text(rng: random.Random) -> str:
+    return " ".join(rng.choices(VOCABULARY, k=WORDS_PER_RESUME))
+
+
+def _edit(rng: random.Random, text: str) -> str:
+    """Replaces a handful of words, like a candidate tweaking their CV."""
+    words = text.split()
+    for _ in range(3):
+        words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+    return " ".join(words)
+
+
+def _bench_size(size: int, hasher: MinHasher) -> dict:
+    rng = random.Random(size)
+    index = MinHashLSH(num_perm=hasher.num_perm, bands=16)
+    texts = {}
+
+    signature_seconds = insert_seconds = 0.0
+    for key in range(1, size + 1):
+        text = _text(rng)
+        if key <= QUERIES:
+            texts[key] = text
+        start = time.perf_counter()
+        signature = hasher.signature(text)
+        signature_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.insert(key, signature)
+        insert_seconds += time.perf_counter() - start
+
+    duplicate_queries: list[float] = []
+    found = 0
+    for key, text in texts.items():
+        signature = hasher.signature(_edit(rng, text))
+        with stopwatch(duplicate_queries):
+            matches = index.query(signature, THRESHOLD)
+        found += any(match == key for match, _ in matches)
+
+    unique_queries: list[float] = []
+    false_positives = 0
+    for _ in range(QUERIES):
+        signature = hasher.signature(_text(rng))
+        with stopwatch(unique_queries):
+            false_positives += bool(index.query(signature, THRESHOLD))
+
+    return {
+        "resumes": size,
+        "signature_per_resume_us": round(signature_seconds / size * 1e6, 3),
+        "insert_per_resume_us": round(insert_seconds / size * 1e6, 3),
+        "query_edited_duplicate": summarize(duplicate_queries),
+        "query_unique": summarize(unique_queries),
+        "recall": round(found / len(texts), 4),
+        "false_positive_rate": round(false_positives / QUERIES, 4),
+        "index": index.stats(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+    hasher = MinHasher()
+    write_results(
+        "near_duplicates",
+        {
+            "threshold": THRESHOLD,
+            "results": [_bench_size(n, hasher) for n in args.sizes],
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
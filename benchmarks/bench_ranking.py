@@ -0,0 +1,121 @@
+"""
+Measures BM25 ranking latency against a job description as the number of
+indexed resumes grows.
+
+Usage:
+    python -m benchmarks.bench_ranking [--sizes 100000 1000000] [--queries 50]
+"""
+import argparse
+import itertools
+import math
+import random
+import time
+from collections import Counter
+
+from app.api.resume_scanner.ranking import ResumeRankingEngine, document_text, tokenize
+from app.utils.rule_extractor import DEFAULT_SKILLS
+from benchmarks.common import stopwatch, summarize, write_results
+
+VOCABULARY = [f"term{i}" for i in range(20000)]
+# Zipf-like weights so a few words are common and most are rare
+CUMULATIVE_WEIGHTS = list(
+    itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY)))
+)
+BASELINE_DOCUMENTS = 20000
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choices(VOCABULARY, cum_weights=CUMULATIVE_WEIGHTS, k=count))
+
+
+def _resume(rng: random.Random) -> dict:
+    return {
+        "skills": rng.sample(DEFAULT_SKILLS, 8),
+        "work_experience": [
+            {
+                "job_title": _words(rng, 2),
+                "company": _words(rng, 1),
+                "responsibilities": [_words(rng, 12) for _ in range(3)],
+            }
+            for _ in range(2)
+        ],
+        "projects": [{"name": _words(rng, 2), "description": _words(rng, 15)}],
+    }
+
+
+def _job_description(rng: random.Random) -> str:
+    return " ".join(rng.sample(DEFAULT_SKILLS, 6)) + " " + _words(rng, 60)
+
+
+def _python_loop_rank(counts: list, text: str, top_k: int) -> list:
+    """Scores every document in Python, as a naive implementation would."""
+    frequency = Counter(term for c in counts for term in c)
+    average = sum(sum(c.values()) for c in counts) / len(counts)
+    query = Counter(tokenize(text))
+    scores = []
+    for index, c in enumerate(counts):
+        length = sum(c.values())
+        score = 0.0
+        for term, weight in query.items():
+            tf = c.get(term)
+            if not tf:
+                continue
+            df = frequency[term]
+            idf = math.log1p((len(counts) - df + 0.5) / (df + 0.5))
+            score += (
+                weight * idf * tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * length / average))
+            )
+        scores.append((score, index))
+    return sorted(scores, reverse=True)[:top_k]
+
+
+def _bench_size(size: int, queries: int) -> dict:
+    rng = random.Random(size)
+    engine = ResumeRankingEngine()
+    baseline_documents = []
+
+    insert_seconds = 0.0
+    for resume_id in range(1, size + 1):
+        resume = _resume(rng)
+        start = time.perf_counter()
+        engine.add(resume_id, resume)
+        insert_seconds += time.perf_counter() - start
+        if resume_id <= BASELINE_DOCUMENTS:
+            baseline_documents.append(Counter(tokenize(document_text(resume))))
+
+    descriptions = [_job_description(rng) for _ in range(queries)]
+    with stopwatch(first := []):
+        # The first query seals the buffered tail
+        engine.rank(descriptions[0])
+    rank_samples: list[float] = []
+    for description in descriptions:
+        with stopwatch(rank_samples):
+            engine.rank(description, top_k=20)
+
+    baseline: list[float] = []
+    for description in descriptions[:3]:
+        with stopwatch(baseline):
+            _python_loop_rank(baseline_documents, description, 20)
+
+    return {
+        "resumes": size,
+        "insert_per_resume_us": round(insert_seconds / size * 1e6, 3),
+        "first_rank_ms": round(first[0] * 1000, 3),
+        "rank_top20": summarize(rank_samples),
+        "index": engine.stats(),
+        f"python_loop_baseline_{len(baseline_documents)}_resumes": summarize(baseline),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+    write_results(
+        "ranking", {"results": [_bench_size(n, args.queries) for n in args.sizes]}
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compares the standard and fast Response envelope encoders on typical bodies
+and checks that both produce the same JSON.
+
+Usage:
+    python -m benchmarks.bench_response [--iterations 500]
+"""
+import argparse
+import json
+from datetime import datetime
+
+from app.api.base_components import Response
+from app.api.resume_scanner.models import (
+    JobStatus,
+    ParsedResume,
+    ParseJob,
+    SearchHit,
+    SearchResults,
+)
+from benchmarks.common import stopwatch, summarize, write_results
+
+
+def _parsed_resume(jobs: int) -> ParsedResume:
+    return ParsedResume(
+        full_name="Jane Doe",
+        email="jane.doe@example.com",
+        phone="+1 555 0100",
+        skills=[f"Skill {i}" for i in range(40)],
+        education=[
+            {"degree": "BSc Computer Science", "institution": "State University"}
+        ],
+        experience=[
+            {
+                "job_title": f"Engineer {i}",
+                "company": f"Company {i}",
+                "duration": "2020-2023",
+                "responsibilities": [
+                    f"Responsibility {j} of job {i}" for j in range(10)
+                ],
+            }
+            for i in range(jobs)
+        ],
+        projects=[
+            {"name": f"Project {i}", "description": "x" * 200} for i in range(10)
+        ],
+    )
+
+
+def _bodies() -> dict:
+    resume = _parsed_resume(jobs=50)
+    return {
+        "small_dict": {"access_token": "token", "token_type": "bearer"},
+        "parsed_resume_5_jobs": _parsed_resume(jobs=5),
+        "parsed_resume_50_jobs": resume,
+        "parse_job": ParseJob(
+            id="job",
+            resume_id=1,
+            status=JobStatus.SUCCEEDED,
+            queued_at=datetime(2024, 1, 1),
+            started_at=datetime(2024, 1, 1, 0, 0, 1),
+            finished_at=datetime(2024, 1, 1, 0, 0, 5),
+            result=resume,
+        ),
+        "search_results_20_hits": SearchResults(
+            query="python",
+            total=1000,
+            page=1,
+            page_size=20,
+            results=[SearchHit(resume_id=i, score=1, resume=resume) for i in range(20)],
+        ),
+        "dict_of_models": {"results": [resume] * 5, "count": 5},
+    }
+
+
+def _encode(fast: bool, body) -> bytes:
+    Response.fast_encoding = fast
+    return Response(message="OK", body=body).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    results = {}
+    for name, body in _bodies().items():
+        standard_bytes, fast_bytes = _encode(False, body), _encode(True, body)
+        assert json.loads(standard_bytes) == json.loads(fast_bytes), name
+
+        timings = {}
+        for label, fast in (("standard", False), ("fast", True)):
+            samples: list[float] = []
+            for _ in range(args.iterations):
+                with stopwatch(samples):
+                    _encode(fast, body)
+            timings[label] = summarize(samples)
+
+        results[name] = {
+            "bytes": len(fast_bytes),
+            "identical_bytes": standard_bytes == fast_bytes,
+            "speedup_p50": round(
+                timings["standard"]["p50_ms"] / max(timings["fast"]["p50_ms"], 1e-6),
+                2,
+            ),
+            **timings,
+        }
+
+    write_results("response", {"iterations": args.iterations, "results": results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Measures boolean search latency over the inverted index as the number of
+indexed resumes grows, by query shape, against a scan of the parsed records.
+
+Skills, titles and companies are drawn with Zipf-like weights, so common
+terms match a large share of resumes and rare ones a handful, as in a real
+candidate pool.
+
+Usage:
+    python -m benchmarks.bench_search [--sizes 100000 1000000] [--queries 50]
+"""
+import argparse
+import itertools
+import random
+import time
+
+from app.api.resume_scanner.search import ResumeSearchIndex, index_terms
+from app.utils.rule_extractor import DEFAULT_SKILLS
+from benchmarks.common import stopwatch, summarize, write_results
+
+TITLES = [
+    f"{level}{role}"
+    for level in ("", "Senior ", "Lead ", "Junior ")
+    for role in (
+        "Software Engineer",
+        "Data Scientist",
+        "Backend Developer",
+        "DevOps Engineer",
+        "Product Manager",
+        "Data Analyst",
+    )
+]
+COMPANIES = [f"Company {i}" for i in range(50000)]
+INSTITUTIONS = [f"University {i}" for i in range(2000)]
+BASELINE_DOCUMENTS = 20000
+
+# Query shape -> template; {skill} and friends are filled per query
+QUERY_SHAPES = {
+    "term": "{skill}",
+    "and": "{skill} AND {other}",
+    "and_not": "{skill} -{other}",
+    "or": "{skill} OR {other} OR {third}",
+    "prefix": "{prefix}*",
+    "phrase": 'title:"{title}"',
+    "field": 'company:"{company}"',
+    "nested": "({skill} OR {other}) AND title:engineer NOT {third}",
+}
+
+
+def _zipf(values: list) -> list:
+    return list(itertools.accumulate(1 / (rank + 1) for rank in range(len(values))))
+
+
+SKILL_WEIGHTS = _zipf(DEFAULT_SKILLS)
+COMPANY_WEIGHTS = _zipf(COMPANIES)
+
+
+def _resume(rng: random.Random) -> dict:
+    return {
+        "skills": list(
+            set(rng.choices(DEFAULT_SKILLS, cum_weights=SKILL_WEIGHTS, k=10))
+        ),
+        "experience": [
+            {
+                "job_title": rng.choice(TITLES),
+                "company": rng.choices(COMPANIES, cum_weights=COMPANY_WEIGHTS)[0],
+            }
+            for _ in range(2)
+        ],
+        "education": [{"institution": rng.choice(INSTITUTIONS)}],
+    }
+
+
+def _query(rng: random.Random, template: str) -> str:
+    skill, other, third = rng.sample(DEFAULT_SKILLS[:30], 3)
+    return template.format(
+        skill=f'"{skill}"',
+        other=f'"{other}"',
+        third=f'"{third}"',
+        prefix=rng.choice(DEFAULT_SKILLS).lower()[:2],
+        title=rng.choice(TITLES),
+        company=rng.choices(COMPANIES, cum_weights=COMPANY_WEIGHTS)[0],
+    )
+
+
+def _scan(documents: list, skill: str, other: str) -> list:
+    """Evaluates ``skill AND other`` by scanning every parse, newest first."""
+    hits = []
+    for resume_id in range(len(documents), 0, -1):
+        terms = index_terms(documents[resume_id - 1])
+        if ("skills", skill) in terms and ("skills", other) in terms:
+            hits.append(resume_id)
+    return hits[:20]
+
+
+def _bench_size(size: int, queries: int) -> dict:
+    rng = random.Random(size)
+    index = ResumeSearchIndex()
+    baseline_documents = []
+
+    insert_seconds = 0.0
+    for resume_id in range(1, size + 1):
+        resume = _resume(rng)
+        start = time.perf_counter()
+        index.add(resume_id, resume)
+        insert_seconds += time.perf_counter() - start
+        if resume_id <= BASELINE_DOCUMENTS:
+            baseline_documents.append(resume)
+
+    by_shape = {}
+    for shape, template in QUERY_SHAPES.items():
+        samples: list[float] = []
+        matched = []
+        for _ in range(queries):
+            query = _query(rng, template)
+            with stopwatch(samples):
+                page = index.search(query, limit=20)
+            matched.append(page.total)
+        by_shape[shape] = {
+            "search_top20": summarize(samples),
+            "mean_matches": round(sum(matched) / len(matched)),
+        }
+
+    baseline: list[float] = []
+    for _ in range(3):
+        skill, other = rng.sample(DEFAULT_SKILLS[:30], 2)
+        with stopwatch(baseline):
+            _scan(baseline_documents, skill.lower(), other.lower())
+
+    return {
+        "resumes": size,
+        "insert_per_resume_us": round(insert_seconds / size * 1e6, 3),
+        "queries": by_shape,
+        f"scan_baseline_{len(baseline_documents)}_resumes": summarize(baseline),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+    write_results(
+        "search", {"results": [_bench_size(n, args.queries) for n in args.sizes]}
+    )
+
+
+if __name__ == "__main__":
+    main()
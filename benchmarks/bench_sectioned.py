@@ -0,0 +1,185 @@
+"""
+Compares single-prompt and section-chunked LLM extraction latency (p50/p99)
+for short, medium and long resumes.
+
+The provider is simulated: each answer takes a time-to-first-token plus its
+output tokens at a fixed generation speed, with log-normal noise, and the
+output is about as long as the resume text it was asked about. That is the
+property sectioned extraction exploits, so absolute numbers depend on the
+chosen speeds but the comparison does not. ``--speedup`` shortens every
+simulated wait and scales the measurements back.
+
+Usage:
+    python -m benchmarks.bench_sectioned [--resumes 30] [--speedup 20]
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+
+from app.utils.llm_extractor import (
+    extract_sections_with_llm,
+    extract_with_llm,
+    plan_sections,
+)
+from app.utils.llm_provider import (
+    FAKE_RESPONSE,
+    LLMClient,
+    LLMProvider,
+    LLMResponse,
+    estimate_tokens,
+)
+from benchmarks.common import summarize, write_results
+from benchmarks.corpus import SIZES, resume_lines
+
+_FIELD_RE = re.compile(r"^\d+\.  \*\*(.+?):\*\*$", re.MULTILINE)
+_TEXT_RE = re.compile(r"\*\*Resume Text:\*\*\n```\n(.*?)\n```", re.DOTALL)
+_PROJECTS = ["Resume Scanner", "Trip Planner", "Ledger", "Chat Bot", "Inventory"]
+_CERTIFICATIONS = ["AWS Solutions Architect", "CKA", "PMP", "Scrum Master"]
+
+
+class SimulatedLLMProvider(LLMProvider):
+    """Answers after a delay proportional to the answer's length."""
+
+    def __init__(
+        self,
+        ttft_seconds: float,
+        tokens_per_second: float,
+        noise_sigma: float,
+        speedup: float,
+        seed: int,
+    ):
+        self.model_name = "simulated"
+        self.ttft_seconds = ttft_seconds
+        self.tokens_per_second = tokens_per_second
+        self.noise_sigma = noise_sigma
+        self.speedup = speedup
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    async def generate(self, prompt: str) -> LLMResponse:
+        titles = _FIELD_RE.findall(prompt)
+        resume_text = _TEXT_RE.search(prompt).group(1)
+        answer = {title: FAKE_RESPONSE[title] for title in titles}
+        output_tokens = estimate_tokens(resume_text)
+        noise = math.exp(self._random.gauss(0, self.noise_sigma))
+        seconds = (self.ttft_seconds + output_tokens / self.tokens_per_second) * noise
+        await asyncio.sleep(seconds / self.speedup)
+
+        self.calls += 1
+        self.prompt_tokens += estimate_tokens(prompt)
+        self.output_tokens += output_tokens
+        return LLMResponse(
+            text=json.dumps(answer),
+            prompt_tokens=estimate_tokens(prompt),
+            output_tokens=output_tokens,
+        )
+
+
+def _resume_text(rng: random.Random, pages: int) -> str:
+    """A corpus resume with projects and certifications sections added."""
+    lines = resume_lines(rng, pages)
+    lines += ["", "Projects"]
+    for _ in range(max(2, pages * 3)):
+        lines.append(f"{rng.choice(_PROJECTS)} - {rng.choice(_PROJECTS)} rewrite")
+        lines.append("- Python, FastAPI, PostgreSQL")
+    lines += ["", "Certifications"]
+    for _ in range(max(1, pages)):
+        lines.append(f"{rng.choice(_CERTIFICATIONS)}, {rng.randrange(2015, 2025)}")
+    return "\n".join(lines)
+
+
+async def _measure(extract, texts, client, speedup: float) -> list[float]:
+    async def one(text: str) -> float:
+        start = time.perf_counter()
+        result = await extract(text, client)
+        if not result:
+            raise RuntimeError("Extraction returned no data")
+        return (time.perf_counter() - start) * speedup
+
+    # Resumes are extracted concurrently; the client is sized so they do not
+    # queue behind each other
+    return list(await asyncio.gather(*(one(text) for text in texts)))
+
+
+async def _run(args) -> dict:
+    results = {}
+    for size, pages in SIZES.items():
+        rng = random.Random(f"{args.seed}-{size}")
+        texts = [_resume_text(rng, pages) for _ in range(args.resumes)]
+        by_mode = {}
+        for mode, extract in (
+            ("single", extract_with_llm),
+            ("sectioned", extract_sections_with_llm),
+        ):
+            provider = SimulatedLLMProvider(
+                ttft_seconds=args.ttft_ms / 1000,
+                tokens_per_second=args.tokens_per_second,
+                noise_sigma=args.noise_sigma,
+                speedup=args.speedup,
+                seed=args.seed,
+            )
+            client = LLMClient(
+                provider,
+                max_concurrency=args.resumes * 8,
+                requests_per_minute=1e9,
+                tokens_per_minute=1e12,
+            )
+            samples = await _measure(extract, texts, client, args.speedup)
+            by_mode[mode] = {
+                **summarize(samples),
+                "llm_calls": provider.calls,
+                "prompt_tokens": provider.prompt_tokens,
+                "output_tokens": provider.output_tokens,
+            }
+        results[size] = {
+            "pages": pages,
+            "resume_tokens": round(
+                sum(estimate_tokens(text) for text in texts) / len(texts)
+            ),
+            "sectioned_prompts": round(
+                sum(len(plan_sections(text)) for text in texts) / len(texts), 2
+            ),
+            **by_mode,
+            "p50_speedup": round(
+                by_mode["single"]["p50_ms"] / by_mode["sectioned"]["p50_ms"], 2
+            ),
+            "p99_speedup": round(
+                by_mode["single"]["p99_ms"] / by_mode["sectioned"]["p99_ms"], 2
+            ),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=30)
+    parser.add_argument("--ttft-ms", type=float, default=400)
+    parser.add_argument("--tokens-per-second", type=float, default=120)
+    parser.add_argument("--noise-sigma", type=float, default=0.3)
+    parser.add_argument("--speedup", type=float, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    results = asyncio.run(_run(args))
+    write_results(
+        "sectioned_extraction",
+        {
+            "simulated_provider": {
+                "ttft_ms": args.ttft_ms,
+                "tokens_per_second": args.tokens_per_second,
+                "noise_sigma": args.noise_sigma,
+            },
+            "resumes_per_size": args.resumes,
+            "results": results,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Times each stage of the resume pipeline separately on a synthetic corpus of
+PDF, DOCX and TXT resumes: text extraction, LLM output normalization, the
+database, response encoding, and the upload and parse endpoints end to end
+through the ASGI app with the fake LLM provider.
+
+Results land in ``bench_results/stages.json`` (tagged with the git commit),
+so two runs can be diffed with ``python -m benchmarks.compare``.
+
+Usage:
+    python -m benchmarks.bench_stages [--iterations 20] [--llm-latency 0]
+"""
+import argparse
+import asyncio
+import copy
+import os
+import random
+import tempfile
+
+import httpx
+
+from app.api.base_components import Response
+from app.api.resume_scanner.models import ParsedResume
+from app.db.database import Database
+from app.utils.data_transformer import (
+    transform_skills_to_list,
+    transform_to_list_of_dicts,
+    transform_work_experience,
+)
+from app.utils.file_extractor import (
+    extract_text_from_docx,
+    extract_text_from_pdf,
+    extract_text_from_txt,
+)
+from app.utils.llm_extractor import _normalize_keys, transform_llm_output
+from app.utils.llm_provider import FAKE_RESPONSE
+from benchmarks.common import stopwatch, summarize, write_results
+from benchmarks.corpus import CONTENT_TYPES, SIZES, render, resume_lines, write_corpus
+
+EXTRACTORS = {
+    "pdf": extract_text_from_pdf,
+    "docx": extract_text_from_docx,
+    "txt": extract_text_from_txt,
+}
+DATABASE_RECORDS = 10000
+
+
+def _time(func, iterations: int, *args) -> dict:
+    samples: list[float] = []
+    for _ in range(iterations):
+        with stopwatch(samples):
+            func(*args)
+    return summarize(samples)
+
+
+def _llm_output(jobs: int) -> dict:
+    """Returns raw LLM JSON shaped like FAKE_RESPONSE with ``jobs`` positions."""
+    output = copy.deepcopy(FAKE_RESPONSE)
+    job = output["Work Experience"][0]
+    output["Work Experience"] = [
+        {**job, "responsibilities": [f"Responsibility {i}" for i in range(6)]}
+        for _ in range(jobs)
+    ]
+    output["Skills"] = {"Languages": ["Python", "Go"], "Frameworks": ["FastAPI"]}
+    output["Projects"] = [f"Project {i}" for i in range(5)]
+    output["Contact Information"] = {"Email": output.pop("Email")}
+    return output
+
+
+def bench_extraction(corpus: list, iterations: int) -> dict:
+    results = {}
+    for item in corpus:
+        kind = item.filename.rsplit(".", 1)[1]
+        extractor = EXTRACTORS[kind]
+        results[item.filename] = {
+            "pages": item.pages,
+            "bytes": os.path.getsize(item.path),
+            "chars": len(extractor(item.path)),
+            **_time(extractor, iterations, item.path),
+        }
+    return results
+
+
+def bench_transform(iterations: int) -> dict:
+    results = {}
+    for jobs in (1, 10, 50):
+        raw = _llm_output(jobs)
+        normalized = _normalize_keys(raw)
+        results[f"{jobs}_jobs"] = {
+            "normalize_keys": _time(_normalize_keys, iterations, raw),
+            "transform_llm_output": _time(transform_llm_output, iterations, raw),
+            "transform_skills_to_list": _time(
+                transform_skills_to_list, iterations, normalized["skills"]
+            ),
+            "transform_to_list_of_dicts": _time(
+                transform_to_list_of_dicts, iterations, normalized["projects"]
+            ),
+            "transform_work_experience": _time(
+                transform_work_experience, iterations, normalized["work_experience"]
+            ),
+        }
+    return results
+
+
+def bench_database() -> dict:
+    db = Database()
+    record = transform_llm_output(_llm_output(5))
+    add: list[float] = []
+    for i in range(DATABASE_RECORDS):
+        with stopwatch(add):
+            db.add("parsed_resumes", {**record, "resume_id": i})
+
+    rng = random.Random(DATABASE_RECORDS)
+    get: list[float] = []
+    for _ in range(DATABASE_RECORDS):
+        record_id = rng.randint(1, DATABASE_RECORDS)
+        with stopwatch(get):
+            db.get_by_id("parsed_resumes", record_id)
+    return {"records": DATABASE_RECORDS, "add": summarize(add), "get": summarize(get)}
+
+
+def bench_response(iterations: int) -> dict:
+    results = {}
+    for jobs in (1, 10, 50):
+        resume = ParsedResume(**transform_llm_output(_llm_output(jobs)))
+        timings = {}
+        for label, fast in (("standard", False), ("fast", True)):
+            Response.fast_encoding = fast
+            timings[label] = _time(
+                lambda: Response(message="OK", body=resume).body, iterations
+            )
+        results[f"parsed_resume_{jobs}_jobs"] = timings
+    Response.fast_encoding = True
+    return results
+
+
+async def _bench_endpoints(iterations: int) -> dict:
+    from app_context import AppContext
+
+    await AppContext.initialize()
+    rng = random.Random(0)
+    results = {}
+    async with httpx.AsyncClient(
+        app=AppContext.api.app, base_url="http://bench"
+    ) as client:
+        for size, pages in SIZES.items():
+            lines = resume_lines(rng, pages)
+            for kind, content_type in CONTENT_TYPES.items():
+                # A unique line per upload so content-hash deduplication
+                # does not short-circuit the write
+                files = [
+                    render(kind, [*lines, f"Reference {i}"]) for i in range(iterations)
+                ]
+                upload: list[float] = []
+                resume_id = None
+                for i, content in enumerate(files):
+                    with stopwatch(upload):
+                        response = await client.post(
+                            "/api/v1/resumes/upload",
+                            files={
+                                "file": (f"{size}-{i}.{kind}", content, content_type)
+                            },
+                        )
+                    resume_id = response.json()["body"]["id"]
+
+                # The first parse warms the extraction sandbox
+                await client.post(f"/api/v1/resumes/{resume_id}/parse")
+                parse: list[float] = []
+                for _ in range(iterations):
+                    with stopwatch(parse):
+                        response = await client.post(
+                            f"/api/v1/resumes/{resume_id}/parse"
+                        )
+                    assert response.status_code == 200, response.text
+
+                results[f"{size}.{kind}"] = {
+                    "upload": summarize(upload),
+                    "parse": summarize(parse),
+                }
+    await AppContext.shutdown()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        corpus_dir = os.path.join(workdir, "corpus")
+        os.makedirs(corpus_dir)
+        corpus = write_corpus(corpus_dir)
+
+        os.environ["MEDIA_PATH"] = os.path.join(workdir, "media")
+        os.environ["LLM_PROVIDER"] = "fake"
+        os.environ["FAKE_LLM_LATENCY_SECONDS"] = str(args.llm_latency)
+        # Re-parsing the same text must reach the LLM stage every time
+        os.environ["LLM_CACHE_MAX_BYTES"] = "0"
+        os.environ["NEAR_DUPLICATE_REUSE_PARSE"] = "false"
+
+        results = {
+            "iterations": args.iterations,
+            "llm_latency_s": args.llm_latency,
+            "extraction": bench_extraction(corpus, args.iterations),
+            "transform": bench_transform(args.iterations * 50),
+            "database": bench_database(),
+            "response": bench_response(args.iterations * 10),
+            "endpoints": asyncio.run(_bench_endpoints(args.iterations)),
+        }
+    write_results("stages", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Measures cold-start cost in fresh interpreters: how long ``import
+app_context`` takes (with the slowest modules from ``-X importtime``), how
+long ``AppContext.initialize`` takes, and which heavy backends were loaded
+before the first request.
+
+With ``--budget-ms`` the script exits non-zero when the median import time
+exceeds the budget, so CI can catch startup regressions.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 5] [--budget-ms 2000]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import write_results
+
+_INITIALIZE_SCRIPT = """
+import asyncio, json, time
+started = time.perf_counter()
+from app_context import AppContext
+imported = time.perf_counter()
+
+async def main():
+    await AppContext.initialize()
+    report = AppContext.startup_report()
+    await AppContext.shutdown()
+    return report
+
+report = asyncio.run(main())
+report["import_seconds"] = imported - started
+print(json.dumps(report))
+"""
+
+
+def _import_times(env: dict) -> tuple[float, list]:
+    """Returns total ``import app_context`` seconds and the slowest modules."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app_context"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    ).stderr
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, self_us, cumulative_us, name = [
+            part.strip() for part in line.replace("import time:", "|").split("|")
+        ]
+        if self_us.isdigit():
+            modules.append((name, int(self_us), int(cumulative_us)))
+    total = next(cumulative for name, _, cumulative in modules if name == "app_context")
+    slowest = sorted(modules, key=lambda module: -module[1])[:15]
+    return total / 1e6, [
+        {"module": name, "self_ms": self_us / 1000, "cumulative_ms": cumulative / 1000}
+        for name, self_us, cumulative in slowest
+    ]
+
+
+def _initialize(env: dict) -> dict:
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", _INITIALIZE_SCRIPT],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    ).stdout
+    report = json.loads(output.strip().splitlines()[-1])
+    report["process_seconds"] = round(time.perf_counter() - started, 4)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as media_path:
+        env = {
+            **os.environ,
+            "MEDIA_PATH": media_path,
+            "LLM_PROVIDER": os.environ.get("LLM_PROVIDER", "gemini"),
+            # Measure the cold path; warm-up would import the backends
+            "WARM_UP": "none",
+            "PYTHONPATH": os.getcwd(),
+        }
+        import_seconds, slowest = [], []
+        for _ in range(args.runs):
+            seconds, slowest = _import_times(env)
+            import_seconds.append(seconds)
+        reports = [_initialize(env) for _ in range(args.runs)]
+
+    median_import_ms = statistics.median(import_seconds) * 1000
+    results = {
+        "runs": args.runs,
+        "llm_provider": env["LLM_PROVIDER"],
+        "import_app_context_ms": {
+            "median": round(median_import_ms, 3),
+            "min": round(min(import_seconds) * 1000, 3),
+            "max": round(max(import_seconds) * 1000, 3),
+        },
+        "initialize_ms": round(
+            statistics.median(r["initialize_seconds"] for r in reports) * 1000, 3
+        ),
+        "process_to_ready_ms": round(
+            statistics.median(r["process_seconds"] for r in reports) * 1000, 3
+        ),
+        "loaded_modules": reports[-1]["loaded_modules"],
+        "slowest_imports": slowest,
+    }
+    write_results("startup", results)
+
+    if args.budget_ms is not None and median_import_ms > args.budget_ms:
+        print(
+            f"Startup regression: importing app_context took "
+            f"{median_import_ms:.0f}ms, budget is {args.budget_ms:.0f}ms",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
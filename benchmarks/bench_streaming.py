@@ -0,0 +1,106 @@
+"""
+Compares time-to-first-field of streamed LLM extraction against the latency
+of waiting for the full answer.
+
+The fake provider takes the same total time either way and, when streaming,
+spreads its answer evenly over that time, so the gain comes only from
+emitting each field once its JSON is complete. ``--speedup`` shortens every
+simulated wait and scales the measurements back.
+
+Usage:
+    python -m benchmarks.bench_streaming [--resumes 50] [--latency-ms 3000]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.utils.llm_extractor import extract_with_llm, stream_with_llm
+from app.utils.llm_provider import FakeLLMProvider, LLMClient
+from benchmarks.common import summarize, write_results
+from benchmarks.corpus import resume_lines
+
+
+def _client(args) -> LLMClient:
+    provider = FakeLLMProvider(
+        latency_seconds=args.latency_ms / 1000 / args.speedup,
+        jitter_seconds=args.jitter_ms / 1000 / args.speedup,
+        seed=args.seed,
+        stream_chunk_chars=args.chunk_chars,
+    )
+    return LLMClient(
+        provider,
+        max_concurrency=args.resumes,
+        requests_per_minute=1e9,
+        tokens_per_minute=1e12,
+    )
+
+
+async def _full(text: str, client: LLMClient, speedup: float) -> float:
+    start = time.perf_counter()
+    if not await extract_with_llm(text, client):
+        raise RuntimeError("Extraction returned no data")
+    return (time.perf_counter() - start) * speedup
+
+
+async def _streamed(text: str, client: LLMClient, speedup: float) -> tuple:
+    start = time.perf_counter()
+    first = None
+    fields = 0
+    async for partial in stream_with_llm(text, client):
+        if first is None:
+            first = time.perf_counter() - start
+        fields += len(partial)
+    return first * speedup, (time.perf_counter() - start) * speedup, fields
+
+
+async def _run(args) -> dict:
+    rng = random.Random(args.seed)
+    texts = ["\n".join(resume_lines(rng, 1)) for _ in range(args.resumes)]
+
+    client = _client(args)
+    full = await asyncio.gather(*(_full(t, client, args.speedup) for t in texts))
+
+    client = _client(args)
+    streamed = await asyncio.gather(
+        *(_streamed(t, client, args.speedup) for t in texts)
+    )
+    first_field = [first for first, _, _ in streamed]
+    return {
+        "full_response": summarize(list(full)),
+        "streamed_first_field": summarize(first_field),
+        "streamed_last_field": summarize([last for _, last, _ in streamed]),
+        "fields_per_resume": streamed[0][2],
+        "p50_first_field_speedup": round(
+            summarize(list(full))["p50_ms"] / summarize(first_field)["p50_ms"], 2
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=3000)
+    parser.add_argument("--jitter-ms", type=float, default=500)
+    parser.add_argument("--chunk-chars", type=int, default=16)
+    parser.add_argument("--speedup", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    results = asyncio.run(_run(args))
+    write_results(
+        "streaming_parse",
+        {
+            "fake_provider": {
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "chunk_chars": args.chunk_chars,
+            },
+            "resumes": args.resumes,
+            "results": results,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
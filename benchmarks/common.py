@@ -0,0 +1,76 @@
+"""
+This module provides shared helpers for the benchmark scripts.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+from typing import Iterator, List
+
+
+def summarize(samples: List[float]) -> dict:
+    """Summarizes latency samples (seconds) as milliseconds percentiles."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        index = min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": pct(0.50),
+        "p90_ms": pct(0.90),
+        "p99_ms": pct(0.99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+@contextmanager
+def stopwatch(samples: List[float]) -> Iterator[None]:
+    """Appends the elapsed wall-clock time of the block to ``samples``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        samples.append(time.perf_counter() - start)
+
+
+def _git_commit() -> str | None:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def run_metadata() -> dict:
+    """Returns what is needed to tell two result files apart."""
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def write_results(name: str, results: dict, output_dir: str | None = None) -> str:
+    """Writes benchmark results as JSON and returns the file path."""
+    output_dir = output_dir or os.environ.get("BENCH_OUTPUT_DIR", "bench_results")
+    os.makedirs(output_dir, exist_ok=True)
+    results = {"meta": run_metadata(), **results}
+    path = os.path.join(output_dir, f"{name}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+    return path
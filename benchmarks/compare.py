@@ -0,0 +1,72 @@
+"""
+Compares two benchmark result files, typically from two commits, and prints
+every latency that moved by more than a threshold.
+
+Usage:
+    python -m benchmarks.compare old/stages.json new/stages.json [--threshold 10]
+"""
+import argparse
+import json
+from typing import Dict, Iterator, Tuple
+
+METRIC = "p50_ms"
+
+
+def _latencies(results: dict, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """Yields ``(path, p50)`` for every summarized timing in the results."""
+    for key, value in results.items():
+        if not isinstance(value, dict):
+            continue
+        path = f"{prefix}{key}"
+        if METRIC in value:
+            yield path, value[METRIC]
+        else:
+            yield from _latencies(value, f"{path}.")
+
+
+def compare(old: dict, new: dict) -> Dict[str, dict]:
+    """Returns old, new and percentage change for timings present in both."""
+    before = dict(_latencies(old))
+    changes = {}
+    for path, after in _latencies(new):
+        if path not in before:
+            continue
+        baseline = before[path]
+        change = (after - baseline) / baseline * 100 if baseline else 0.0
+        changes[path] = {"old": baseline, "new": after, "change_pct": change}
+    return changes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="percent change to report"
+    )
+    args = parser.parse_args()
+
+    with open(args.old, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+
+    commits = [r.get("meta", {}).get("commit") or "?" for r in (old, new)]
+    print(f"{METRIC}: {commits[0]} -> {commits[1]}")
+    changes = compare(old, new)
+    reported = 0
+    for path, change in sorted(
+        changes.items(), key=lambda item: -abs(item[1]["change_pct"])
+    ):
+        if abs(change["change_pct"]) < args.threshold:
+            continue
+        reported += 1
+        print(
+            f"{change['change_pct']:+8.1f}%  {change['old']:>10.3f} -> "
+            f"{change['new']:>10.3f} ms  {path}"
+        )
+    print(f"{reported} of {len(changes)} timings moved by {args.threshold}% or more")
+
+
+if __name__ == "__main__":
+    main()
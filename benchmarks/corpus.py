@@ -0,0 +1,161 @@
+"""
+This module provides a synthetic resume corpus for the benchmark scripts.
+
+Resumes are generated from a seeded RNG so every run sees the same text, and
+are rendered as TXT, DOCX (python-docx) or PDF (a minimal hand-written PDF
+with a Helvetica text layer, which pdfplumber reads like a real export).
+"""
+import io
+import os
+import random
+from typing import Dict, List, NamedTuple
+
+import docx
+
+from app.utils.rule_extractor import DEFAULT_SKILLS
+
+LINES_PER_PAGE = 48
+
+# Sizes are in PDF pages; DOCX and TXT renditions carry the same lines
+SIZES: Dict[str, int] = {"small": 1, "medium": 3, "large": 10}
+
+CONTENT_TYPES = {
+    "txt": "text/plain",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+}
+
+_FIRST_NAMES = ["Jane", "John", "Priya", "Wei", "Maria", "Ahmed", "Olga", "Kofi"]
+_LAST_NAMES = ["Doe", "Smith", "Patel", "Chen", "Garcia", "Hassan", "Ivanova"]
+_TITLES = ["Software Engineer", "Data Scientist", "Backend Developer", "SRE"]
+_COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark"]
+_VERBS = ["Built", "Designed", "Migrated", "Optimized", "Led", "Automated"]
+_OBJECTS = [
+    "the billing pipeline",
+    "a customer search service",
+    "internal reporting dashboards",
+    "the CI/CD workflow",
+    "a recommendation engine",
+    "the data warehouse",
+]
+
+
+class CorpusFile(NamedTuple):
+    path: str
+    filename: str
+    content_type: str
+    size: str
+    pages: int
+
+
+def resume_lines(rng: random.Random, pages: int) -> List[str]:
+    """Returns the lines of a plausible resume about ``pages`` pages long."""
+    first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}{rng.randrange(1000)}@example.com",
+        f"+1 555 {rng.randrange(1000, 10000)}",
+        "",
+        "Summary",
+        f"{rng.choice(_TITLES)} with {rng.randrange(2, 15)} years of experience.",
+        "",
+        "Skills",
+        ", ".join(rng.sample(DEFAULT_SKILLS, 12)),
+        "",
+        "Education",
+        "BSc Computer Science, State University, 2012",
+        "",
+        "Experience",
+    ]
+    target = pages * LINES_PER_PAGE
+    year = 2024
+    while len(lines) < target:
+        lines.append(f"{rng.choice(_TITLES)} - {rng.choice(_COMPANIES)}")
+        lines.append(f"{year - 2} - {year}")
+        year -= 2
+        for _ in range(rng.randrange(3, 7)):
+            lines.append(f"- {rng.choice(_VERBS)} {rng.choice(_OBJECTS)}")
+        lines.append("")
+    return lines[:target]
+
+
+def render_txt(lines: List[str]) -> bytes:
+    return "\n".join(lines).encode("utf-8")
+
+
+def render_docx(lines: List[str]) -> bytes:
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def render_pdf(lines: List[str]) -> bytes:
+    """Writes a minimal PDF with one Helvetica text block per page."""
+    pages = [
+        lines[start : start + LINES_PER_PAGE]
+        for start in range(0, len(lines), LINES_PER_PAGE)
+    ] or [[]]
+    count = len(pages)
+    font_id = 3 + 2 * count
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(count))
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {count} >>",
+    ]
+    for i, page in enumerate(pages):
+        text = " ".join(f"({_pdf_escape(line)}) Tj T*" for line in page)
+        content = f"BT /F1 11 Tf 14 TL 50 780 Td {text} ET"
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> "
+            f"/Contents {4 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    return bytes(out)
+
+
+RENDERERS = {"txt": render_txt, "docx": render_docx, "pdf": render_pdf}
+
+
+def render(kind: str, lines: List[str]) -> bytes:
+    """Renders resume lines as a ``txt``, ``docx`` or ``pdf`` file."""
+    return RENDERERS[kind](lines)
+
+
+def write_corpus(
+    directory: str, sizes: Dict[str, int] | None = None, seed: int = 1
+) -> List[CorpusFile]:
+    """Writes one resume per format and size into ``directory``."""
+    rng = random.Random(seed)
+    files = []
+    for size, pages in (sizes or SIZES).items():
+        lines = resume_lines(rng, pages)
+        for kind, content_type in CONTENT_TYPES.items():
+            filename = f"resume-{size}.{kind}"
+            path = os.path.join(directory, filename)
+            with open(path, "wb") as f:
+                f.write(render(kind, lines))
+            files.append(CorpusFile(path, filename, content_type, size, pages))
+    return files
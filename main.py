@@ -1,7 +1,10 @@
 import asyncio
 import logging
+import socket
+from typing import List
 
-from app_context import AppContext
+from app.api.base_components import BaseAPI
+from app_context import AppContext, config
 
 # from app.logger.logging_setup import setup_logging
 
@@ -10,9 +13,12 @@ from app_context import AppContext
 logger = logging.getLogger(__name__)
 
 
-async def main():
+async def main(sockets: List[socket.socket] | None = None):
     """
     Main application entry point using async/await properly.
+
+    In multi-worker mode each worker runs this with the listening sockets it
+    inherited from the parent process.
     """
     logger.info("**** Starting Resume Scanner API ****")
 
@@ -24,7 +30,7 @@ async def main():
 
         # Start API - uvicorn will manage the event loop
         logger.info("Starting API server...")
-        await AppContext.api.start()
+        await AppContext.api.start(sockets=sockets)
 
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt")
@@ -40,6 +46,29 @@ async def main():
             logger.error(f"Error during shutdown: {str(e)}")
 
 
+def run_worker(sockets: List[socket.socket]) -> None:
+    """Entry point of one worker process in multi-worker mode."""
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(sockets))
+
+
+def serve() -> None:
+    """Serves in this process, or in ``API_WORKERS`` processes sharing a port."""
+    if config.api_workers <= 1:
+        asyncio.run(main())
+        return
+    if config.db_backend == "memory":
+        # Every worker would hold its own copy of the data
+        raise RuntimeError("API_WORKERS > 1 requires DB_BACKEND=sqlite")
+    if config.jwt_secret_key is None:
+        # Tokens signed by one worker would be rejected by the others
+        raise RuntimeError("API_WORKERS > 1 requires JWT_SECRET_KEY")
+    logger.info(f"**** Starting {config.api_workers} API workers ****")
+    BaseAPI.run_workers(
+        config.api_host, config.api_port, config.api_workers, target=run_worker
+    )
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    asyncio.run(main())
+    serve()
@@ -0,0 +1,128 @@
+import asyncio
+import math
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.base_components import BaseAPI, BaseController, Endpoint, Response
+from app.config.config import _env_rates
+from app.utils.admission import (
+    MAX_RETRY_AFTER_SECONDS,
+    OVERLOADED,
+    QUOTA_EXCEEDED,
+    AdmissionController,
+    AdmissionRejected,
+    AdmissionRule,
+)
+from app.utils.rate_limiter import TokenBucket
+
+PARSE_RULE = AdmissionRule("parse", "POST", re.compile(r"^/api/v1/items/\d+$"), True)
+
+
+class ItemController(BaseController):
+    def __init__(self):
+        super().__init__(
+            title="Items",
+            prefix="/v1/items",
+            endpoints=[
+                Endpoint(rule="/{item_id}", func=self.parse_item, methods=["POST"])
+            ],
+        )
+
+    async def parse_item(self, item_id: int) -> Response:
+        return Response(message="Item parsed successfully", body={"id": item_id})
+
+
+def _client(user_rates, role_rates) -> TestClient:
+    api = BaseAPI(
+        ip="127.0.0.1",
+        port=0,
+        debug=False,
+        title="Test",
+        description="",
+        version="0",
+        summary="",
+        admission=AdmissionController(
+            None,
+            user_rates=user_rates,
+            role_rates=role_rates,
+            max_in_flight=4,
+            max_queued=4,
+            queue_timeout_seconds=1,
+            rules=[PARSE_RULE],
+        ),
+    )
+    api.register_controllers([ItemController()])
+    return TestClient(api.app)
+
+
+def test_exhausted_quota_gets_429_with_retry_after():
+    # Six a minute with ten seconds of burst: one request, then a 10s wait
+    client = _client(user_rates={"anonymous": 6}, role_rates={})
+
+    assert client.post("/api/v1/items/1").status_code == 200
+    response = client.post("/api/v1/items/1")
+
+    assert response.status_code == 429
+    assert response.json()["error_code"] == QUOTA_EXCEEDED
+    assert response.headers["Retry-After"] == "10"
+
+
+@pytest.mark.parametrize(
+    "user_rates, role_rates",
+    [({"anonymous": 0}, {}), ({"anonymous": 600}, {"anonymous": 0})],
+)
+def test_zero_rate_rejects_every_request(user_rates, role_rates):
+    client = _client(user_rates, role_rates)
+
+    for _ in range(2):
+        response = client.post("/api/v1/items/1")
+        assert response.status_code == 429
+        assert response.json()["error_code"] == QUOTA_EXCEEDED
+        assert response.headers["Retry-After"] == str(MAX_RETRY_AFTER_SECONDS)
+
+
+def test_zero_rate_bucket_never_refills():
+    assert TokenBucket(0.0, capacity=0.0).try_acquire() == math.inf
+
+    bucket = TokenBucket(0.0, capacity=1.0)
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == math.inf
+
+
+def test_rates_must_not_be_negative(monkeypatch):
+    monkeypatch.setenv("TEST_RATES", "admin=60, user=0")
+    assert _env_rates("TEST_RATES", "") == {"admin": 60.0, "user": 0.0}
+
+    for value in ("user=-1", "user=nan"):
+        monkeypatch.setenv("TEST_RATES", value)
+        with pytest.raises(ValueError):
+            _env_rates("TEST_RATES", "")
+
+
+def test_queue_timeout_refunds_the_quota():
+    # Two requests of burst per caller and a single in-flight slot
+    controller = AdmissionController(
+        None,
+        user_rates={"anonymous": 12},
+        role_rates={"anonymous": 12},
+        max_in_flight=1,
+        max_queued=1,
+        queue_timeout_seconds=0.05,
+    )
+    admit = controller.admit
+
+    async def run():
+        async with admit(PARSE_RULE, "client:a", "anonymous"):
+            with pytest.raises(AdmissionRejected) as shed:
+                async with admit(PARSE_RULE, "client:a", "anonymous"):
+                    pass
+            assert shed.value.error_code == OVERLOADED
+        # Charged again only if the shed request's tokens came back
+        async with admit(PARSE_RULE, "client:a", "anonymous"):
+            pass
+
+    asyncio.run(run())
+    assert controller.in_flight == 0
+    assert controller.queued == 0
@@ -0,0 +1,114 @@
+import asyncio
+import os
+
+import pytest
+from starlette.requests import Request
+
+from app.exceptions.exceptions import FileTooLargeError
+from app.utils.file_storage import MULTIPART_OVERHEAD_BYTES, ContentAddressedStorage
+
+BOUNDARY = "testboundary"
+
+
+def _multipart(content: bytes) -> bytes:
+    return (
+        (
+            f"--{BOUNDARY}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="cv.txt"\r\n'
+            "Content-Type: text/plain\r\n\r\n"
+        ).encode()
+        + content
+        + f"\r\n--{BOUNDARY}--\r\n".encode()
+    )
+
+
+def _request(chunks, content_length=None):
+    """Builds a request whose body arrives in ``chunks``, counting reads."""
+    headers = [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())]
+    if content_length is not None:
+        headers.append((b"content-length", str(content_length).encode()))
+    scope = {"type": "http", "method": "POST", "path": "/", "headers": headers}
+    reads = []
+
+    async def receive():
+        index = len(reads)
+        reads.append(index)
+        return {
+            "type": "http.request",
+            "body": chunks[index],
+            "more_body": index < len(chunks) - 1,
+        }
+
+    return Request(scope, receive), reads
+
+
+@pytest.fixture
+def storage(tmp_path) -> ContentAddressedStorage:
+    return ContentAddressedStorage(str(tmp_path), max_bytes=1024, chunk_size=256)
+
+
+def _receive_and_save(storage, request):
+    async def run():
+        upload = await storage.receive_upload(request)
+        try:
+            return await storage.save_upload(upload)
+        finally:
+            await upload.close()
+
+    return asyncio.run(run())
+
+
+def test_upload_is_stored_and_deduplicated(storage):
+    body = _multipart(b"Jane Doe\nPython")
+
+    first = _receive_and_save(storage, _request([body], len(body))[0])
+    second = _receive_and_save(storage, _request([body[:10], body[10:]])[0])
+
+    assert first.size == len(b"Jane Doe\nPython")
+    assert not first.deduplicated
+    assert second.deduplicated
+    assert second.path == first.path
+    with open(first.path, "rb") as f:
+        assert f.read() == b"Jane Doe\nPython"
+    assert os.listdir(os.path.join(storage.root, "tmp")) == []
+
+
+def test_oversized_content_length_is_rejected_before_reading(storage):
+    request, reads = _request([b""], content_length=10 * 1024 * 1024)
+
+    with pytest.raises(FileTooLargeError):
+        asyncio.run(storage.receive_upload(request))
+    assert reads == []
+
+
+def test_oversized_stream_is_rejected_mid_body(storage):
+    limit = storage.max_bytes + MULTIPART_OVERHEAD_BYTES
+    body = _multipart(b"x" * (4 * limit))
+    chunks = [body[i : i + 4096] for i in range(0, len(body), 4096)]
+    request, reads = _request(chunks)
+
+    with pytest.raises(FileTooLargeError):
+        asyncio.run(storage.receive_upload(request))
+    assert len(reads) < len(chunks) // 2
+
+
+def test_file_over_limit_within_overhead_is_rejected(storage):
+    body = _multipart(b"x" * (storage.max_bytes + 1))
+
+    with pytest.raises(FileTooLargeError):
+        _receive_and_save(storage, _request([body], len(body))[0])
+    assert os.listdir(os.path.join(storage.root, "tmp")) == []
+
+
+def test_non_multipart_body_has_no_upload(storage):
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/",
+        "headers": [(b"content-type", b"application/json")],
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"{}", "more_body": False}
+
+    assert asyncio.run(storage.receive_upload(Request(scope, receive))) is None
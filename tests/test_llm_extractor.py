@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+from app.utils.llm_extractor import extract_sections_with_llm, plan_sections
+from app.utils.llm_provider import LLMClient, LLMProvider, LLMProviderError, LLMResponse
+
+RESUME = """Jane Doe
+jane@example.com
+
+Professional Experience & Internships
+Software Engineer, Tech Corp, 2020-2023
+Built APIs
+
+Education
+BSc Computer Science, State University
+
+Certifications
+CKA, CNCF
+"""
+
+
+class ScriptedProvider(LLMProvider):
+    """Answers each prompt by the first marker found in it."""
+
+    model_name = "scripted"
+
+    def __init__(self, answers: dict):
+        self.answers = answers
+
+    async def generate(self, prompt: str) -> LLMResponse:
+        for marker, answer in self.answers.items():
+            if marker in prompt:
+                if answer is None:
+                    raise LLMProviderError("unavailable")
+                return LLMResponse(json.dumps(answer), 1, 1)
+        return LLMResponse("{}", 1, 1)
+
+
+def _extract(answers: dict) -> dict:
+    client = LLMClient(
+        ScriptedProvider(answers),
+        max_concurrency=4,
+        requests_per_minute=1e9,
+        tokens_per_minute=1e12,
+        max_retries=0,
+    )
+    return asyncio.run(extract_sections_with_llm(RESUME, client, max_chunk_tokens=50))
+
+
+def test_list_field_without_known_heading_is_asked_over_the_leftover_text():
+    plan = plan_sections(RESUME)
+
+    leftover, fields = plan[0]
+    assert "Professional Experience & Internships" in leftover
+    assert "work_experience" in fields
+    assert "education" not in fields
+    assert [fields for _, fields in plan[1:]] == [["education"], ["certifications"]]
+
+
+def test_list_field_is_left_out_when_all_text_is_in_known_sections():
+    plan = plan_sections("Education\nBSc, State University", ["education", "projects"])
+
+    assert plan == [("Education\nBSc, State University", ["education"])]
+
+
+def test_sections_under_unknown_headings_are_extracted():
+    parsed = _extract(
+        {
+            "Built APIs": {
+                "Full Name": "Jane Doe",
+                "Work Experience": [{"job_title": "Software Engineer"}],
+            },
+            "BSc Computer Science": {"Education": [{"degree": "BSc"}]},
+            "CKA, CNCF": {"Certifications": [{"name": "CKA"}]},
+        }
+    )
+
+    assert parsed["full_name"] == "Jane Doe"
+    assert parsed["work_experience"][0]["job_title"] == "Software Engineer"
+    assert parsed["education"] == [{"degree": "BSc"}]
+    assert parsed["certifications"] == [{"name": "CKA"}]
+
+
+def test_failed_or_empty_sections_keep_the_other_answers():
+    parsed = _extract(
+        {
+            "Built APIs": {"Full Name": "Jane Doe"},
+            "BSc Computer Science": None,
+            "CKA, CNCF": {},
+        }
+    )
+
+    assert parsed["full_name"] == "Jane Doe"
+    assert parsed["education"] == []
+    assert parsed["certifications"] == []
+
+
+def test_every_section_failing_fails_the_parse():
+    assert _extract({"": None}) == {}
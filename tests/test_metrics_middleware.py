@@ -0,0 +1,81 @@
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.base_components import BaseAPI, BaseController, Endpoint, Response
+from app.utils.admission import AdmissionController, AdmissionRule
+from app.utils.metrics import REGISTRY
+
+
+class ItemController(BaseController):
+    def __init__(self):
+        super().__init__(
+            title="Items",
+            prefix="/v1/items",
+            endpoints=[
+                Endpoint(rule="/{item_id}", func=self.get_item, methods=["GET"])
+            ],
+        )
+
+    async def get_item(self, item_id: int) -> Response:
+        return Response(message="Item retrieved successfully", body={"id": item_id})
+
+
+@pytest.fixture
+def client() -> TestClient:
+    api = BaseAPI(
+        ip="127.0.0.1",
+        port=0,
+        debug=False,
+        title="Test",
+        description="",
+        version="0",
+        summary="",
+        metrics_registry=REGISTRY,
+        # One request per caller, then shed before routing
+        admission=AdmissionController(
+            None,
+            user_rates={"anonymous": 0.001},
+            role_rates={},
+            max_in_flight=1,
+            max_queued=0,
+            queue_timeout_seconds=1,
+            rules=[AdmissionRule("limited", "GET", re.compile(r"^/api/v1/items/9$"))],
+        ),
+    )
+    api.register_controllers([ItemController()])
+    return TestClient(api.app)
+
+
+def _count(metrics: str, method: str, route: str, status: int) -> int:
+    prefix = (
+        f'http_request_seconds_count{{method="{method}",route="{route}",'
+        f'status="{status}"}} '
+    )
+    for line in metrics.splitlines():
+        if line.startswith(prefix):
+            return int(float(line[len(prefix) :]))
+    return 0
+
+
+def test_requests_are_labelled_by_route_template(client):
+    before = client.get("/metrics").text
+
+    assert client.get("/api/v1/items/1").status_code == 200
+    assert client.get("/api/v1/items/2").status_code == 200
+    assert client.post("/api/v1/items/3").status_code == 405
+    assert client.get("/nowhere").status_code == 404
+    assert client.get("/api/v1/items/9").status_code == 200
+    assert client.get("/api/v1/items/9").status_code == 429
+
+    after = client.get("/metrics").text
+    route = "/api/v1/items/{item_id}"
+    assert _count(after, "GET", route, 200) - _count(before, "GET", route, 200) == 3
+    assert _count(after, "GET", route, 429) - _count(before, "GET", route, 429) == 1
+    assert _count(after, "POST", route, 405) - _count(before, "POST", route, 405) == 1
+    assert (
+        _count(after, "GET", "unmatched", 404) - _count(before, "GET", "unmatched", 404)
+        == 1
+    )
+    assert "/api/v1/items/1" not in after
@@ -0,0 +1,94 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.utils.minhash import MinHasher, MinHashLSH
+
+WORDS = [f"word{i}" for i in range(500)]
+
+
+def _text(rng: random.Random, words: int = 300) -> str:
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+def _edit(rng: random.Random, text: str, fraction: float) -> str:
+    """Replaces a fraction of the words, keeping the rest in place."""
+    words = text.split()
+    for position in rng.sample(range(len(words)), int(len(words) * fraction)):
+        words[position] = rng.choice(WORDS)
+    return " ".join(words)
+
+
+@pytest.fixture
+def hasher() -> MinHasher:
+    return MinHasher(num_perm=128, shingle_size=5)
+
+
+def test_signatures_are_deterministic(hasher):
+    text = _text(random.Random(1))
+
+    assert np.array_equal(hasher.signature(text), MinHasher().signature(text))
+    assert hasher.signature(text.upper()).tolist() == hasher.signature(text).tolist()
+    assert hasher.signature("  ...  ") is None
+
+
+def test_signature_agreement_estimates_jaccard(hasher):
+    rng = random.Random(2)
+    text = _text(rng)
+    edited = _edit(rng, text, 0.05)
+    first, second = hasher.shingles(text), hasher.shingles(edited)
+    jaccard = len(np.intersect1d(first, second)) / len(np.union1d(first, second))
+
+    agreement = (hasher.signature(text) == hasher.signature(edited)).mean()
+
+    assert agreement == pytest.approx(jaccard, abs=0.15)
+
+
+def test_lsh_finds_near_duplicates_only(hasher):
+    rng = random.Random(3)
+    index = MinHashLSH(num_perm=128, bands=16)
+    originals = {key: _text(rng) for key in range(1, 51)}
+    for key, text in originals.items():
+        index.insert(key, hasher.signature(text))
+
+    near = hasher.signature(_edit(rng, originals[7], 0.01))
+    matches = index.query(near, threshold=0.8)
+
+    assert [key for key, _ in matches] == [7]
+    assert matches[0][1] >= 0.8
+    assert index.query(hasher.signature(_text(rng)), threshold=0.5) == []
+
+
+def test_lsh_exclude_replace_and_remove(hasher):
+    rng = random.Random(4)
+    index = MinHashLSH(num_perm=128, bands=16)
+    text = _text(rng)
+    signature = hasher.signature(text)
+    index.insert(1, signature)
+    index.insert(2, signature)
+
+    assert index.query(signature, threshold=0.9, exclude=1) == [(2, 1.0)]
+
+    index.insert(2, hasher.signature(_text(rng)))
+    assert index.query(signature, threshold=0.9) == [(1, 1.0)]
+    assert len(index) == 2
+
+    index.remove(1)
+    assert index.query(signature, threshold=0.9) == []
+    assert index.stats()["documents"] == 1
+
+
+def test_lsh_grows_past_initial_capacity(hasher):
+    index = MinHashLSH(num_perm=128, bands=16)
+    signatures = [hasher.signature(f"resume {i} " * 10) for i in range(1500)]
+    for key, signature in enumerate(signatures):
+        index.insert(key, signature)
+
+    assert len(index) == 1500
+    assert index.query(signatures[1234], threshold=1.0) == [(1234, 1.0)]
+
+
+def test_bands_must_divide_permutations():
+    with pytest.raises(ValueError):
+        MinHashLSH(num_perm=128, bands=10)
@@ -0,0 +1,13 @@
+import pytest
+
+from app.api.resume_scanner.models import ParsedResume
+
+JOBS = [{"job_title": "Engineer", "company": "Tech Corp"}]
+
+
+@pytest.mark.parametrize("key", ["Work Experience", "work_experience", "experience"])
+def test_parsed_resume_accepts_every_experience_key(key):
+    parsed = ParsedResume(**{"resume_id": 1, key: JOBS})
+
+    assert parsed.experience == JOBS
+    assert parsed.model_dump(by_alias=True)["Work Experience"] == JOBS
@@ -0,0 +1,64 @@
+import pytest
+
+from app.utils.partial_json import PartialJSONObjectParser, strip_code_fence
+
+ANSWER = (
+    '```json\n{"full_name": "Jane \\"JD\\" Doe", "skills": ["Python", "C{++}"],'
+    ' "education": [{"degree": "BSc", "institution": "MIT"}], "phone": null}\n```'
+)
+
+
+def _feed_in_chunks(text: str, size: int) -> tuple[PartialJSONObjectParser, list]:
+    parser = PartialJSONObjectParser()
+    members = []
+    for start in range(0, len(text), size):
+        members.extend(parser.feed(text[start : start + size]))
+    return parser, members
+
+
+@pytest.mark.parametrize("size", [1, 3, 16, len(ANSWER)])
+def test_members_are_emitted_once_complete(size):
+    parser, members = _feed_in_chunks(ANSWER, size)
+
+    assert members == [
+        ("full_name", 'Jane "JD" Doe'),
+        ("skills", ["Python", "C{++}"]),
+        ("education", [{"degree": "BSc", "institution": "MIT"}]),
+        ("phone", None),
+    ]
+    assert parser.result() == dict(members)
+
+
+def test_member_is_not_emitted_before_its_value_ends():
+    parser = PartialJSONObjectParser()
+
+    assert parser.feed('{"skills": ["Python", ') == []
+    assert parser.feed('"Go"], "email"') == [("skills", ["Python", "Go"])]
+    assert parser.feed(': "a@b.com"}') == [("email", "a@b.com")]
+
+
+def test_text_after_the_object_is_ignored():
+    parser = PartialJSONObjectParser()
+
+    assert parser.feed('{"a": 1} {"b": 2}') == [("a", 1)]
+
+
+def test_undecodable_member_is_skipped_and_result_fails():
+    parser, members = _feed_in_chunks('{"a": tru, "b": 2}', 4)
+
+    assert members == [("b", 2)]
+    with pytest.raises(ValueError):
+        parser.result()
+
+
+def test_result_rejects_non_objects():
+    parser = PartialJSONObjectParser()
+    parser.feed("[1, 2]")
+
+    with pytest.raises(ValueError):
+        parser.result()
+
+
+def test_strip_code_fence():
+    assert strip_code_fence('```json\n{"a": 1}\n```') == '\n{"a": 1}\n'
+    assert strip_code_fence(' {"a": 1} ') == '{"a": 1}'
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from app.api.base_components import BaseAPI, BaseController, Endpoint, Response
+from app.utils.profiler import ProfileReport, ProfileStore, RequestProfiler
+
+
+class PingController(BaseController):
+    def __init__(self):
+        super().__init__(
+            title="Ping",
+            prefix="/v1/ping",
+            endpoints=[Endpoint(rule="", func=self.ping, methods=["GET"])],
+        )
+
+    async def ping(self) -> Response:
+        return Response(message="pong")
+
+
+def _report(request_id: str) -> ProfileReport:
+    return ProfileReport(
+        request_id=request_id,
+        method="GET",
+        path="/",
+        mode="cprofile",
+        status_code=200,
+        duration_ms=1.0,
+        created_at=datetime.now(timezone.utc),
+        functions=[],
+        sandbox_functions=[],
+        text="report text",
+    )
+
+
+def test_report_file_is_written_off_the_event_loop(tmp_path, monkeypatch):
+    store = ProfileStore(max_reports=1, directory=str(tmp_path))
+    write = store._write
+    writer_threads = []
+
+    def recording_write(report):
+        writer_threads.append(threading.get_ident())
+        write(report)
+
+    monkeypatch.setattr(store, "_write", recording_write)
+
+    asyncio.run(store.add(_report("first")))
+    asyncio.run(store.add(_report("second")))
+
+    assert writer_threads and threading.get_ident() not in writer_threads
+    assert (tmp_path / "first.txt").read_text(encoding="utf-8") == "report text"
+    # Only the newest report is kept in memory; files stay on disk
+    assert [report.request_id for report in store.list()] == ["second"]
+    assert (tmp_path / "second.txt").exists()
+
+
+def test_profiled_request_is_stored(tmp_path):
+    profiler = RequestProfiler(ProfileStore(directory=str(tmp_path)))
+    api = BaseAPI(
+        ip="127.0.0.1",
+        port=0,
+        debug=False,
+        title="Test",
+        description="",
+        version="0",
+        summary="",
+        profiler=profiler,
+    )
+    api.register_controllers([PingController()])
+    client = TestClient(api.app)
+
+    response = client.get(
+        "/api/v1/ping", headers={"X-Profile": "1", "X-Request-ID": "req-1"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["X-Profile-Id"] == "req-1"
+    report = profiler.store.get("req-1")
+    assert report.status_code == 200
+    assert (tmp_path / "req-1.txt").read_text(encoding="utf-8") == report.text
+    assert client.get("/api/v1/ping").headers.get("X-Profile-Id") is None
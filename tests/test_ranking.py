@@ -0,0 +1,104 @@
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from app.api.resume_scanner.ranking import ResumeRankingEngine, document_text, tokenize
+
+WORDS = ["python", "java", "docker", "kubernetes", "sql", "react", "aws", "go"]
+
+
+def _resume(rng: random.Random) -> dict:
+    return {
+        "skills": rng.sample(WORDS, 3),
+        "work_experience": [
+            {
+                "job_title": "Engineer",
+                "responsibilities": [" ".join(rng.choices(WORDS, k=6))],
+            }
+        ],
+    }
+
+
+def _bm25(documents: dict, text: str, k1: float = 1.2, b: float = 0.75) -> dict:
+    """Scores every document directly from the BM25 formula."""
+    counts = {
+        resume_id: Counter(tokenize(document_text(parsed)))
+        for resume_id, parsed in documents.items()
+    }
+    average = sum(sum(c.values()) for c in counts.values()) / len(counts)
+    frequency = Counter(term for c in counts.values() for term in c)
+    query = Counter(tokenize(text))
+    scores = {}
+    for resume_id, c in counts.items():
+        length = sum(c.values())
+        score = 0.0
+        for term, weight in query.items():
+            tf = c.get(term, 0)
+            if not tf:
+                continue
+            df = frequency[term]
+            idf = math.log1p((len(counts) - df + 0.5) / (df + 0.5))
+            norm = k1 * (1 - b + b * length / average)
+            score += weight * idf * tf * (k1 + 1) / (tf + norm)
+        if score:
+            scores[resume_id] = score
+    return scores
+
+
+def _assert_matches_formula(engine: ResumeRankingEngine, documents: dict, text: str):
+    expected = _bm25(documents, text)
+    ranked = engine.rank(text, top_k=len(documents))
+
+    assert {resume_id for resume_id, _ in ranked} == set(expected)
+    for resume_id, score in ranked:
+        assert score == pytest.approx(expected[resume_id], rel=1e-5)
+    scores = [score for _, score in ranked]
+    assert scores == sorted(scores, reverse=True)
+
+
+@pytest.mark.parametrize("seal_every", [1, 3, 1000])
+def test_scores_match_bm25(seal_every):
+    rng = random.Random(seal_every)
+    engine = ResumeRankingEngine(seal_every=seal_every)
+    documents = {resume_id: _resume(rng) for resume_id in range(1, 40)}
+    for resume_id, parsed in documents.items():
+        engine.add(resume_id, parsed)
+
+    for text in ["python docker", "Kubernetes and AWS engineer", "go go sql"]:
+        _assert_matches_formula(engine, documents, text)
+
+
+def test_reparse_replaces_previous_document():
+    rng = random.Random(7)
+    engine = ResumeRankingEngine(seal_every=4)
+    documents = {resume_id: _resume(rng) for resume_id in range(1, 11)}
+    for resume_id, parsed in documents.items():
+        engine.add(resume_id, parsed)
+    engine.rank("python")
+
+    replaced = {"skills": ["Rust"], "experience": [{"job_title": "Rust Engineer"}]}
+    engine.add(3, replaced, previous=documents[3])
+    documents[3] = replaced
+
+    assert len(engine) == 10
+    assert engine.rank("rust") == [(3, pytest.approx(_bm25(documents, "rust")[3]))]
+    _assert_matches_formula(engine, documents, "python java engineer")
+
+
+def test_top_k_and_ties_prefer_newest():
+    engine = ResumeRankingEngine()
+    for resume_id in range(1, 6):
+        engine.add(resume_id, {"skills": ["Python"]})
+
+    assert [resume_id for resume_id, _ in engine.rank("python", top_k=2)] == [5, 4]
+
+
+def test_unknown_terms_and_empty_index():
+    engine = ResumeRankingEngine()
+
+    assert engine.rank("python") == []
+    engine.add(1, {"skills": ["Python"]})
+    assert engine.rank("the and of") == []
+    assert engine.rank("cobol") == []
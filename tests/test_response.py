@@ -0,0 +1,46 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.api.base_components import Response
+from app.api.resume_scanner.models import JobStatus, ParsedResume, ParseJob
+
+UTC_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def encode():
+    def encode(fast: bool, body) -> dict:
+        Response.fast_encoding = fast
+        return json.loads(Response(message="OK", body=body).body)
+
+    yield encode
+    Response.fast_encoding = True
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        None,
+        {"access_token": "tøken", "expires_in": timedelta(minutes=30)},
+        [{"count": 1.5}, {"naive": datetime(2024, 1, 1, 12, 30)}],
+        ParseJob(
+            id="job",
+            resume_id=1,
+            status=JobStatus.SUCCEEDED,
+            queued_at=UTC_TIME,
+            result=ParsedResume(full_name="Jane Doe", skills=["Python"]),
+        ),
+        {"results": [ParsedResume(full_name="Jane Doe")]},
+    ],
+)
+def test_fast_and_standard_encoding_agree(encode, body):
+    assert encode(True, body) == encode(False, body)
+
+
+def test_utc_datetimes_in_plain_bodies_use_z(encode):
+    assert encode(True, {"at": UTC_TIME})["body"] == {"at": "2024-01-01T00:00:00Z"}
+    assert encode(False, {"at": UTC_TIME})["body"] == {
+        "at": "2024-01-01T00:00:00+00:00"
+    }
@@ -0,0 +1,84 @@
+import pytest
+
+from app.utils.rule_extractor import AhoCorasick, RuleBasedExtractor, find_name
+
+
+def _matches(automaton: AhoCorasick, text: str) -> list[tuple[str, str]]:
+    return [
+        (text[start:end], automaton.patterns[index])
+        for start, end, index in automaton.search(text)
+    ]
+
+
+def test_aho_corasick_finds_overlapping_patterns_case_insensitively():
+    automaton = AhoCorasick(["Machine Learning", "Learning", "SQL", "NoSQL"])
+
+    assert _matches(automaton, "machine learning, NoSQL and sql") == [
+        ("machine learning", "Machine Learning"),
+        ("learning", "Learning"),
+        ("NoSQL", "NoSQL"),
+        ("sql", "SQL"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Java", ["Java"]),
+        ("JavaScript", ["JavaScript"]),
+        ("Java/Go", ["Java"]),
+        ("Javanese", []),
+        ("C++ and C#", ["C++", "C#"]),
+        ("", []),
+    ],
+)
+def test_aho_corasick_reports_whole_words_only(text, expected):
+    automaton = AhoCorasick(["Java", "JavaScript", "C++", "C#"])
+
+    assert [pattern for _, pattern in _matches(automaton, text)] == expected
+
+
+def test_aho_corasick_follows_failure_links():
+    automaton = AhoCorasick(["he", "she", "hers"])
+
+    assert _matches(automaton, "ushers he") == [("he", "he")]
+
+
+@pytest.mark.parametrize(
+    "lines, expected",
+    [
+        (["Jane Doe", "jane@example.com"], "Jane Doe"),
+        (["Curriculum Vitae", "Jane Doe"], "Jane Doe"),
+        (["RESUME", "Jane Mary Doe"], "Jane Mary Doe"),
+        (["Curriculum Vitae"], None),
+        (["Professional Summary", "Skills"], None),
+        (["jane@example.com", "Jane Doe"], None),
+        (["Senior Software Engineer", "Jane Doe"], None),
+        (["Data Scientist"], None),
+        (["Jane Doe Smith Brown Jones"], None),
+    ],
+)
+def test_find_name(lines, expected):
+    assert find_name(lines) == expected
+
+
+def test_missing_sections_stay_below_the_fast_path_threshold():
+    result = RuleBasedExtractor().extract(
+        "Curriculum Vitae\nJane Doe\njane@example.com\n\nSkills: Python, Docker"
+    )
+
+    assert result.fields["full_name"] == "Jane Doe"
+    assert result.fields["skills"] == ["Python", "Docker"]
+    assert result.fields["work_experience"] == []
+    assert "work_experience" not in result.confident_fields(0.9)
+
+
+def test_skills_stay_below_the_fast_path_threshold():
+    result = RuleBasedExtractor().extract(
+        "Jane Doe\nSkills: Python, Java, Go, SQL, Docker, Kubernetes, AWS, Git, "
+        "Linux, React, Redis, Kafka"
+    )
+
+    assert len(result.fields["skills"]) >= 8
+    assert "skills" not in result.confident_fields(0.9)
+    assert "full_name" in result.confident_fields(0.9)
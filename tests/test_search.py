@@ -0,0 +1,95 @@
+import pytest
+
+from app.api.resume_scanner.search import QueryError, ResumeSearchIndex, index_terms
+
+RESUMES = {
+    1: {
+        "skills": ["Python", "Machine Learning"],
+        "work_experience": [{"job_title": "Data Scientist", "company": "Tech Corp"}],
+        "education": [{"institution": "State University"}],
+    },
+    2: {
+        "skills": ["Java", "Kubernetes"],
+        "experience": [{"job_title": "Backend Engineer", "company": "Acme"}],
+        "certifications": [{"name": "CKA"}],
+    },
+    3: {
+        "skills": ["Python", "Kubeflow", "C++"],
+        "experience": [{"job_title": "ML Engineer", "company": "Tech Corp"}],
+    },
+}
+
+
+@pytest.fixture
+def index() -> ResumeSearchIndex:
+    index = ResumeSearchIndex()
+    for resume_id, parsed in RESUMES.items():
+        index.add(resume_id, parsed)
+    return index
+
+
+def _ids(index: ResumeSearchIndex, query: str) -> list[int]:
+    return [resume_id for resume_id, _ in index.search(query).hits]
+
+
+def test_index_terms_include_whole_values_and_words():
+    terms = index_terms(RESUMES[1])
+
+    assert ("skills", "machine learning") in terms
+    assert ("skills", "learning") in terms
+    assert ("company", "tech corp") in terms
+    assert ("institution", "state university") in terms
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("python", [3, 1]),
+        ("python AND kubeflow", [3]),
+        ("python kubeflow", [3]),
+        ("python -kubeflow", [1]),
+        ("python NOT kubeflow", [1]),
+        ("NOT python", [2]),
+        ("kube*", [3, 2]),
+        ('"machine learning"', [1]),
+        ('company:"tech corp"', [3, 1]),
+        ("skills:engineer", []),
+        ("title:engineer", [3, 2]),
+        ("cert:cka OR school:state", [2, 1]),
+        ("(java OR c++) AND engineer", [3, 2]),
+        ("rust", []),
+    ],
+)
+def test_search(index, query, expected):
+    assert _ids(index, query) == expected
+
+
+def test_or_ranks_by_number_of_matching_terms(index):
+    page = index.search("python OR kubeflow OR java")
+
+    assert page.total == 3
+    assert page.hits == [(3, 2), (2, 1), (1, 1)]
+
+
+def test_pagination(index):
+    page = index.search("python OR java", offset=1, limit=1)
+
+    assert page.total == 3
+    assert len(page.hits) == 1
+    assert index.search("python", offset=5).hits == []
+
+
+def test_reindexing_replaces_previous_terms(index):
+    index.add(1, {"skills": ["Go"]}, previous=RESUMES[1])
+
+    assert _ids(index, "python") == [3]
+    assert _ids(index, "go") == [1]
+    assert len(index) == 3
+
+
+@pytest.mark.parametrize(
+    "query", ["", "   ", "python AND", "(python", "python)", "OR java", '""']
+)
+def test_malformed_queries(index, query):
+    with pytest.raises(QueryError):
+        index.search(query)
@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from app.db.database import DuplicateKeyError
+from app.db.sqlite_database import SQLiteDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    # A single connection makes any second checkout from the pool block
+    db = SQLiteDatabase(
+        str(tmp_path / "app.db"),
+        unique_indexes={"users": ["email"]},
+        pool_size=1,
+        busy_timeout_seconds=1.0,
+    )
+    yield db
+    db.close()
+
+
+def _run_with_timeout(func, timeout=5.0):
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = func()
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "database call did not return"
+    return outcome
+
+
+def test_duplicate_add_raises_with_single_connection(db):
+    db.add("users", {"email": "a@example.com"})
+
+    outcome = _run_with_timeout(lambda: db.add("users", {"email": "a@example.com"}))
+
+    error = outcome.get("error")
+    assert isinstance(error, DuplicateKeyError)
+    assert error.field == "email"
+    assert error.value == "a@example.com"
+    assert db.count("users") == 1
+
+
+def test_duplicate_within_batch_rolls_back_whole_batch(db):
+    records = [{"email": "b@example.com"}, {"email": "b@example.com"}]
+
+    outcome = _run_with_timeout(lambda: db.add_many("users", records))
+
+    assert isinstance(outcome.get("error"), DuplicateKeyError)
+    assert db.count("users") == 0
+    # The connection went back to the pool and still works
+    assert db.add("users", {"email": "c@example.com"})["id"] == 1